@@ -0,0 +1,155 @@
+"""
+Admission Control Module
+Concurrency limits for the expensive AI endpoints (LLM answers, Whisper
+transcription, voice commands). Each endpoint has a gate with a fixed
+number of slots and a bounded wait queue. A request that cannot get a
+slot within its deadline, or that arrives when the queue is full, is
+refused straight away with Overloaded. The endpoint then answers from its
+cheap fallback or returns 503 instead of letting work pile up behind the
+model. Checkout and trolley control never pass through a gate, so they
+stay fast under AI load.
+
+Fairness: each cart (or client) may hold only a few slots and queue
+places at once, so one noisy trolley cannot fill the queue for everyone.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, gate, reason, retry_after=1):
+        super().__init__(f"{gate} overloaded: {reason}")
+        self.gate = gate
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    def __init__(self, name, limit=2, queue_size=8, max_wait=2.0, per_key=2):
+        """
+        Args:
+            name (str): Endpoint name used in stats and errors
+            limit (int): Requests allowed to run at once
+            queue_size (int): Requests allowed to wait for a slot
+            max_wait (float): Seconds a request may wait before it is shed
+            per_key (int): Running plus waiting requests allowed per cart/client
+        """
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.per_key = per_key
+        self.active = 0
+        self.waiters = deque()  # asyncio futures, oldest first
+        self.by_key = {}  # key -> running + waiting requests
+        self.counters = {"admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_timeout": 0, "shed_per_key": 0}
+        self.wait_times = deque(maxlen=200)  # seconds, admitted requests that had to queue
+        self._lock = threading.Lock()  # waiters may belong to different event loops (tests)
+
+    def _leave(self, key):
+        # Caller holds _lock
+        if key is not None:
+            count = self.by_key.get(key, 0) - 1
+            if count > 0:
+                self.by_key[key] = count
+            else:
+                self.by_key.pop(key, None)
+
+    def _shed(self, key, reason, counter):
+        # Caller holds _lock
+        self._leave(key)
+        self.counters[counter] += 1
+        return Overloaded(self.name, reason, retry_after=max(1, round(self.max_wait)))
+
+    def _release(self, key=None):
+        with self._lock:
+            self._leave(key)
+            while self.waiters:
+                waiter = self.waiters.popleft()
+                if not waiter.done():
+                    # Hand the slot straight to the oldest waiter; active stays the same
+                    waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+                    return
+            self.active -= 1
+
+    def _grant(self, waiter):
+        if waiter.done():
+            self._release()  # it timed out in the meantime: pass the slot on
+        else:
+            waiter.set_result(True)
+
+    async def _acquire(self, key, max_wait):
+        with self._lock:
+            if key is not None:
+                if self.by_key.get(key, 0) >= self.per_key:
+                    self.counters["shed_per_key"] += 1
+                    raise Overloaded(self.name, "too many requests from this cart", retry_after=1)
+                self.by_key[key] = self.by_key.get(key, 0) + 1
+            if self.active < self.limit and not self.waiters:
+                self.active += 1
+                self.counters["admitted"] += 1
+                return
+            if len(self.waiters) >= self.queue_size:
+                raise self._shed(key, "queue full", "shed_queue_full")
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            self.counters["queued"] += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, max_wait)
+        except asyncio.TimeoutError:
+            with self._lock:
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass  # already popped; _grant passes the slot on
+                raise self._shed(key, f"no slot within {max_wait}s", "shed_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(key)  # granted just as the client went away
+            else:
+                with self._lock:
+                    if waiter in self.waiters:
+                        self.waiters.remove(waiter)
+                    self._leave(key)
+            raise
+        with self._lock:
+            self.counters["admitted"] += 1
+            self.wait_times.append(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def admit(self, key=None, max_wait=None):
+        """
+        Hold a slot for the duration of the block
+
+        Args:
+            key (str): Cart or client identity for fairness (None to skip the per-key cap)
+            max_wait (float): Overrides the gate's queue deadline
+
+        Raises:
+            Overloaded: If the request was shed
+        """
+        await self._acquire(key, self.max_wait if max_wait is None else max_wait)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self.wait_times)
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "waiting": len(self.waiters),
+                "queue_size": self.queue_size,
+                "max_wait": self.max_wait,
+                **self.counters,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else None
+            }
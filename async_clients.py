@@ -0,0 +1,141 @@
+"""
+Async Clients Module
+Calls the remote AI services (Hugging Face inference, googletrans, the
+translate package, OpenAI) from async endpoints without blocking the event
+loop. Native async clients are awaited directly. Blocking clients run on
+worker threads. Each backend gets a concurrency limit, so slow LLM calls
+cannot use up every worker thread or outbound connection, and each call has
+a timeout. Results feed the health monitor's circuit breakers just as the
+synchronous call paths do.
+"""
+
+import asyncio
+import inspect
+import time
+import weakref
+from functools import partial
+
+import anyio
+
+from health_monitor import BackendUnavailable
+from tracing import span
+
+
+class AsyncBackends:
+    def __init__(self, health=None, limits=None, default_limit=4, timeout=30.0):
+        """
+        Args:
+            health (HealthMonitor): Breakers to consult and update (optional)
+            limits (dict): {backend name: max concurrent calls}
+            default_limit (int): Limit for backends not listed in limits
+            timeout (float): Seconds before a call is abandoned
+        """
+        self.health = health
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.timeout = timeout
+        self.counters = {}
+        # Limiters belong to one event loop; tests and scripts may run several
+        self._limiters = weakref.WeakKeyDictionary()
+
+    def limiter(self, name):
+        loop_limiters = self._limiters.setdefault(_current_loop(), {})
+        limiter = loop_limiters.get(name)
+        if limiter is None:
+            limiter = loop_limiters[name] = anyio.CapacityLimiter(self.limits.get(name, self.default_limit))
+        return limiter
+
+    def _count(self, name, key, delta=1):
+        counters = self.counters.setdefault(name, {"calls": 0, "errors": 0, "timeouts": 0, "in_flight": 0})
+        counters[key] += delta
+
+    async def call(self, name, fn, *args, timeout=None, **kwargs):
+        """
+        Call a backend without blocking the event loop
+
+        Args:
+            name (str): Backend name (breaker and concurrency limit)
+            fn (callable): Coroutine function, or a blocking function run on a worker thread
+            timeout (float): Overrides the default timeout
+
+        Returns:
+            The backend's result
+
+        Raises:
+            BackendUnavailable: If the backend's breaker is open
+            TimeoutError: If the call took longer than the timeout
+        """
+        if self.health is not None and not self.health.available(name):
+            raise BackendUnavailable(name)
+        limiter = self.limiter(name)
+        self._count(name, "calls")
+        self._count(name, "in_flight")
+        start = time.perf_counter()
+        try:
+            with span(f"backend.{name}"), anyio.fail_after(timeout or self.timeout):
+                if inspect.iscoroutinefunction(fn):
+                    async with limiter:
+                        result = await fn(*args, **kwargs)
+                else:
+                    # A thread that outlives the timeout still holds its slot until it returns
+                    result = await anyio.to_thread.run_sync(partial(fn, *args, **kwargs), limiter=limiter)
+                    if inspect.isawaitable(result):
+                        async with limiter:
+                            result = await result
+        except TimeoutError:
+            self._count(name, "timeouts")
+            self._record(name, False, error=f"timed out after {timeout or self.timeout}s")
+            raise
+        except Exception as e:
+            self._count(name, "errors")
+            self._record(name, False, error=e)
+            raise
+        finally:
+            self._count(name, "in_flight", -1)
+        self._record(name, True, time.perf_counter() - start)
+        return result
+
+    def _record(self, name, ok, latency=0.0, error=None):
+        if self.health is not None:
+            self.health.record(name, ok, latency, error)
+
+    def stats(self):
+        return {name: {**counters, "limit": self.limits.get(name, self.default_limit)}
+                for name, counters in self.counters.items()}
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return anyio  # not on asyncio (e.g. trio): one shared set of limiters
+
+
+def async_openai_chat(api_key=None, max_connections=20):
+    """
+    Async chat completion function for the installed openai package
+
+    openai>=1.0 provides AsyncOpenAI, which keeps one pooled HTTP client;
+    older releases provide ChatCompletion.acreate instead.
+
+    Returns:
+        callable: async fn(**request) -> reply text
+    """
+    import openai
+    if hasattr(openai, "AsyncOpenAI"):
+        import httpx
+        clients = []  # created on first use: AsyncOpenAI refuses to start without a key
+
+        async def create(**request):
+            if not clients:
+                clients.append(openai.AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=max_connections))
+                ))
+            response = await clients[0].chat.completions.create(**request)
+            return response.choices[0].message.content
+    else:
+        async def create(**request):
+            response = await openai.ChatCompletion.acreate(**request)
+            return response['choices'][0]['message']['content']
+    return create
@@ -9,10 +9,21 @@ import os, tempfile
 from typing import List, Optional
 import openai
 from fastapi.staticfiles import StaticFiles
+from cart_channels import CartChannelHub
+from async_clients import AsyncBackends, async_openai_chat
+from barcode_index import BarcodeIndex, normalize_gtin
+from catalog import get_catalog, on_catalog_reload, start_catalog_watcher
+from pricing import PricingEngine
+from promotions import PromotionEngine, default_promotions_path
+from product_search import ProductSearchIndex
 
 
 
 openai.api_key = os.environ.get("OPENAI_API_KEY")  # Securely
+# Chat completions are awaited on a pooled client, so slow replies never block the event loop
+openai_chat = async_openai_chat(openai.api_key)
+async_backends = AsyncBackends(limits={"openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))},
+                               timeout=float(os.getenv("OPENAI_TIMEOUT", "60")))
 
 class AIRequest(BaseModel):
     query: str
@@ -31,10 +42,11 @@ class PairRequest(BaseModel):
 
 class AskRequest(BaseModel):
     query: str
+    cart_id: Optional[int] = None  # Paired trolley, for live guidance events
 
 class Item(BaseModel):
     name: str
-    price: float
+    price: Optional[float] = None  # Ignored at checkout; prices come from the catalog
     qty: int
 
 class AIAssistRequest(BaseModel):
@@ -44,6 +56,16 @@ class AIAssistRequest(BaseModel):
 
 class CheckoutRequest(BaseModel):
     cart: List[Item]
+    cartId: Optional[int] = None
+
+class BarcodeBatchRequest(BaseModel):
+    codes: List[str]
+    cart_id: Optional[int] = None
+
+class GuidanceRequest(BaseModel):
+    message: str
+    type: str = "route_update"
+
 @app.post("/api/ai-assist")
 async def ai_assist(req: AIRequest):
     """
@@ -56,41 +78,64 @@ async def ai_assist(req: AIRequest):
         f"Give step-by-step guidance or suggestions for shopping in a supermarket."
     )
     try:
-        response = openai.ChatCompletion.create(
+        answer = await async_backends.call(
+            "openai", openai_chat,
             model="gpt-4",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7
         )
-        answer = response['choices'][0]['message']['content']
         return {"response": answer}
     except Exception as e:
         return {"response": f"Error: {str(e)}"}
 
 # ==== Barcode → Product Mapping ====
-barcode_products = {
-    "8901001": "milk",
-    "8901002": "fruits",
-    "8901003": "juice",
-    "8901004": "maggi",
-    "8901005": "shampoo",
-    "8901006": "ice cream",
-    "8901007": "snacks",
-    "8901008": "bakery",
-    "8901009": "skin and topical care",
-    "8902519012159": "Notepad",
-}
-
-product_brands = {
-    "milk": ["Amul", "Mother Dairy", "Nestlé", "Heritage", "Aavin"],
-    "fruits": ["Apple (Shimla)", "Banana (Yelakki)", "Mango (Alphonso)"],
-    "juice": ["Tropicana", "Real", "Minute Maid"],
-    "maggi": ["Maggi 2-Minute", "Top Ramen", "Yippee"],
-    "shampoo": ["Dove", "Pantene", "Head & Shoulders"],
-    "ice cream": ["Amul", "Kwality Walls", "Baskin Robbins"],
-    "snacks": ["Lays", "Kurkure", "Bingo"],
-    "bakery": ["Britannia Bread", "Modern Bakery", "Local Fresh Cakes"],
-    "skin and topical care": ["Nivea", "Vaseline", "Himalaya Herbal"],
-}
+# Products, brands, prices and barcodes come from the shared store catalog,
+# which is hot-reloaded when catalog.json changes
+catalog = get_catalog()
+
+# Catalog codes plus an optional bulk catalog: a CSV (barcode,product columns)
+# or a prebuilt .idx file that is memory-mapped instead of parsed
+catalog_index = None
+BARCODE_CATALOG = os.getenv("BARCODE_CATALOG")
+if BARCODE_CATALOG:
+    try:
+        if BARCODE_CATALOG.endswith(".idx"):
+            catalog_index = BarcodeIndex.load(BARCODE_CATALOG)
+        else:
+            catalog_index = BarcodeIndex.load_csv(BARCODE_CATALOG)
+        print(f"Loaded {len(catalog_index)} barcodes from {BARCODE_CATALOG} ({catalog_index.rejected} rejected)")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Barcode catalog {BARCODE_CATALOG} not loaded: {e}")
+
+def lookup_barcode(code):
+    product = get_catalog().lookup_barcode(code)
+    if product is None and catalog_index is not None:
+        product = catalog_index.lookup(code)
+    return product
+
+MAX_BARCODE_BATCH = int(os.getenv("MAX_BARCODE_BATCH", "500"))
+
+# Typo-tolerant search over scanned product names, brands and categories
+def build_product_search(catalog):
+    index = ProductSearchIndex()
+    for name in dict.fromkeys(catalog.barcodes.products):
+        product = catalog.get(name)
+        if product is None:
+            index.add(name, name)
+        else:
+            index.add(name, name, product.brands, product.category, price=product.price, stock=product.stock)
+    return index
+
+product_search = build_product_search(catalog)
+
+def describe_product(product):
+    record = get_catalog().get(product)
+    return {
+        "product": product,
+        "brands": list(record.brands) if record else [],
+        "price": record.price if record else None,
+        "stock": record.stock if record else None
+    }
 
 # ==== API Endpoints ====
 @app.post("/api/pair")
@@ -99,36 +144,126 @@ def pair_cart(req: PairRequest):
         return {"success": True, "cartId": 1234, "battery": 94}
     return {"success": False, "error": "Invalid code"}
 
+pricing = PricingEngine(categories=catalog.categories())
+promotions = PromotionEngine.load(default_promotions_path(), catalog.categories())
+
+@on_catalog_reload
+def apply_catalog(new_catalog):
+    search = build_product_search(new_catalog)
+    categories = {name.lower(): category for name, category in new_catalog.categories().items()}
+
+    def install():
+        global product_search
+        pricing.categories = categories
+        promotions.categories = categories
+        product_search = search
+    return install
+
+catalog_watcher = start_catalog_watcher()
+
 @app.post("/api/ask")
 def ask_ai(req: AskRequest):
-    return {"response": f"🤖 Suggestion: Try Store Brand to save 10% on {req.query}"}
+    offer = promotions.suggest(req.query)
+    if offer:
+        return {"response": f"🤖 Suggestion: {offer}"}
+    return {"response": f"🤖 No offers on {req.query} right now, but our store brand is usually the best value."}
+
+def catalog_priced(lines):
+    """
+    Price cart lines from the live catalog, whatever price the client sent
+
+    Returns:
+        tuple: ([Item] priced from the catalog, [names the catalog does not sell])
+    """
+    current = get_catalog()
+    items, unknown = [], []
+    for line in lines:
+        product = current.get(line.name)
+        if product is None or product.price is None:
+            unknown.append(line.name)
+        else:
+            items.append(Item(name=line.name, price=product.price, qty=line.qty))
+    return items, unknown
 
 @app.post("/api/checkout")
 def checkout(req: CheckoutRequest):
-    total = sum(item.price * item.qty for item in req.cart)
-    return {"success": True, "message": "Payment successful", "total": total}
+    # The client's list only supplies names and quantities; totals are in integer paise
+    if any(item.qty <= 0 for item in req.cart):
+        return {"success": False, "error": "Quantity must be positive"}
+    items, unknown = catalog_priced(req.cart)
+    if unknown:
+        return {"success": False, "error": "Unknown product", "unknown": unknown}
+    promo = promotions.evaluate(items)
+    priced = pricing.price(items, promo.line_discounts, promo.order_discount)
+    total = priced.total / 100
+    if req.cartId is not None:
+        cart_channels.publish(req.cartId, "checkout_ready", f"Payment successful. Total: Rs. {total:.2f}", total=total)
+    return {"success": True, "message": "Payment successful", "total": total,
+            "pricing": priced.summary(), "promotions": promo.applied}
 
 @app.post("/api/barcode")
 def scan_barcode(req: AskRequest):
-    code = req.query.strip()
-    if code in barcode_products:
-        product = barcode_products[code]
+    product = lookup_barcode(req.query)
+    if product is not None:
+        if req.cart_id is not None:
+            cart_channels.publish(req.cart_id, "item_scanned", f"Scanned {product}", product=product)
         return {
             "success": True,
             "product": product,
-            "brands": product_brands.get(product, [])
+            "brands": describe_product(product)["brands"]
         }
     return {"success": False, "error": "Unknown barcode"}
 
+@app.post("/api/barcode/batch")
+def scan_barcode_batch(req: BarcodeBatchRequest):
+    """
+    Resolve a whole basket of scanned codes in one request.
+    Results follow the request order; codes that normalize to the same GTIN
+    are looked up once, and unknown codes are reported inline.
+    """
+    if len(req.codes) > MAX_BARCODE_BATCH:
+        return {"success": False, "error": f"At most {MAX_BARCODE_BATCH} codes per batch"}
+
+    resolved = {}
+    results = []
+    for code in req.codes:
+        key = normalize_gtin(code) or code.strip()
+        if key not in resolved:
+            product = lookup_barcode(code)
+            resolved[key] = describe_product(product) if product is not None else None
+        found = resolved[key]
+        if found is None:
+            results.append({"code": code, "success": False, "error": "Unknown barcode"})
+        else:
+            results.append({"code": code, "success": True, **found})
+
+    found_products = [r["product"] for r in results if r["success"]]
+    if req.cart_id is not None and found_products:
+        cart_channels.publish(req.cart_id, "items_scanned", f"Scanned {len(found_products)} items", products=found_products)
+    return {
+        "success": True,
+        "results": results,
+        "found": len(found_products),
+        "unknown": len(results) - len(found_products),
+        "unique": len(resolved)
+    }
+
+@app.get("/api/products/search")
+def search_products(q: str, limit: int = 10):
+    return {"query": q, "results": product_search.search(q, limit=max(1, min(limit, 50)))}
+
 # ==== WebSocket for Live Guidance ====
+cart_channels = CartChannelHub()
+
 @app.websocket("/ws/cart/{cart_id}")
 async def cart_ws(websocket: WebSocket, cart_id: int):
     await websocket.accept()
-    await websocket.send_text(f"Connected to cart {cart_id}")
-    await websocket.send_text("Head to Aisle 3 for Bread")
-    await websocket.send_text("Proceed to Aisle 7 for Milk")
-    await websocket.send_text("Checkout lane ready")
-    await websocket.close()
+    await cart_channels.serve(websocket, cart_id)
+
+@app.post("/api/cart/{cart_id}/guidance")
+async def push_cart_guidance(cart_id: int, req: GuidanceRequest):
+    cart_channels.publish(cart_id, req.type, req.message)
+    return {"success": True, "channel": cart_channels.stats()}
 
 # ==== Routes for Frontend ====
 @app.get("/", response_class=HTMLResponse)
@@ -3,10 +3,16 @@ Smart Trolley with voice feedback
 Listen to voice commands and speak answers.
 """
 
+import os
 import stripe
 import speech_recognition as sr
 import pyttsx3
-from collections import deque
+from persistence import Persistence
+from catalog import get_catalog
+from store_routing import StoreGraph
+from route_planner import plan_route
+from inventory import StockLedger, normalize_sku
+from pricing import PricingEngine, to_paise
 
 # ------------ Text-to-Speech ------------
 tts = pyttsx3.init()
@@ -17,71 +23,83 @@ def speak(msg):
     tts.runAndWait()
 
 # ------------ Store Layout & Products ------------
-rows, cols = 4, 3
-products = {
-    "milk": {"loc": (1, 1), "price": 50, "stock": 60, "barcode": "8901001"},
-    "fruits": {"loc": (0, 1), "price": 60, "stock": 50, "barcode": "8901002"},
-    "juice": {"loc": (0, 2), "price": 80, "stock": 30, "barcode": "8901003"},
-    "maggi": {"loc": (1, 0), "price": 25, "stock": 40, "barcode": "8901004"},
-    "shampoo": {"loc": (1, 2), "price": 120, "stock": 20, "barcode": "8901005"},
-    "ice cream": {"loc": (2, 0), "price": 70, "stock": 25, "barcode": "8901006"},
-    "snacks": {"loc": (2, 1), "price": 40, "stock": 80, "barcode": "8901007"},
-    "bakery": {"loc": (2, 2), "price": 90, "stock": 30, "barcode": "8901008"},
-    "skin and topical care": {"loc": (3, 1), "price": 150, "stock": 15, "barcode": "8901009"},
-}
-
-moves = [(0, 1, "right"), (0, -1, "left"), (1, 0, "down"), (-1, 0, "up")]
-
-def bfs(start, goal):
-    """Shortest path between grid cells."""
-    queue = deque([(start, [])])
-    visited = {start}
-    while queue:
-        (x, y), path = queue.popleft()
-        if (x, y) == goal:
-            return path
-        for dx, dy, d in moves:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < rows and 0 <= ny < cols and (nx, ny) not in visited:
-                queue.append(((nx, ny), path + [d]))
-                visited.add((nx, ny))
-    return []
+catalog = get_catalog()
+rows, cols = catalog.rows, catalog.cols
+products = {product.name: product for product in catalog.kiosk_products()}
+barcode_index = catalog.barcodes
+
+# Stock is reserved atomically per cart and only decremented when payment starts
+inventory = StockLedger(catalog.stock_levels())
+
+# Routing tables for every shelf are built once; each query just walks them
+store_graph = StoreGraph(rows, cols, locations=catalog.shelf_locations())
 
 # ------------ Cart Management ------------
-cart = []
-total_amount = 0
+cart = []  # (name, qty, line price in paise)
+total_amount = 0  # paise
 current_position = (0, 0)  # entrance
 
+# Cart lines and orders survive a restart of the kiosk. The kiosk keeps its own
+# database so the web app (main.py, trolley.db) never restores the kiosk's cart.
+KIOSK_CART_ID = "kiosk"
+persistence = Persistence(os.getenv("KIOSK_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "kiosk.db")))
+
+def restore_cart():
+    """Reload the unfinished cart from the last run and re-reserve its stock."""
+    global total_amount
+    for name, unit_price, qty in persistence.load_carts().get(KIOSK_CART_ID, []):
+        if name in products:
+            inventory.reserve(KIOSK_CART_ID, name, qty)
+            price = unit_price * qty
+            total_amount += price
+            cart.append((name, qty, price))
+    if cart:
+        speak(f"Restored {len(cart)} items from your previous session.")
+
 def add_to_cart(product_name, quantity):
     global current_position, total_amount
-    name = product_name.lower()
+    name = normalize_sku(product_name)
     if name not in products:
         speak("Product not found.")
         return
-    if quantity > products[name]["stock"]:
+    if not inventory.reserve(KIOSK_CART_ID, name, quantity):
         speak("Not enough stock.")
         return
 
-    goal = products[name]["loc"]
-    path = bfs(current_position, goal)
+    goal = products[name].cell
+    path = store_graph.route(current_position, name) or []
     current_position = goal
 
-    products[name]["stock"] -= quantity
-    price = products[name]["price"] * quantity
+    unit_price = to_paise(products[name].price)
+    price = unit_price * quantity
     total_amount += price
     cart.append((name, quantity, price))
+    inventory.touch(KIOSK_CART_ID, [item for item, _, _ in cart])  # the shopper is active: keep every hold
+    line_qty = sum(q for item, q, _ in cart if item == name)
+    persistence.save_line(KIOSK_CART_ID, name, unit_price, line_qty)
 
     speak(f"Added {quantity} {name}. "
           f"Navigate {' → '.join(path)}. "
-          f"Subtotal rupees {price}. "
-          f"Current total rupees {total_amount}.")
+          f"Subtotal rupees {price / 100:g}. "
+          f"Current total rupees {total_amount / 100:g}.")
+
+def plan_shopping_list():
+    """Read a whole list and speak the shortest visiting order from here."""
+    items = [i.strip() for i in input("Shopping list (comma separated): ").split(",") if i.strip()]
+    store_graph.add_location("current position", current_position)
+    plan = plan_route(store_graph, "current position", items)
+    for leg in plan["legs"]:
+        speak(f"{leg['item']}: {' → '.join(leg['path']) or 'same shelf'}")
+    if plan["unknown"]:
+        speak(f"Not found: {', '.join(plan['unknown'])}")
+    speak(f"Total walk {plan['steps']} steps.")
 
 # ------------ Input Modes ------------
 def scan_barcode():
     code = input("Scan/enter barcode: ").strip()
-    for name, data in products.items():
-        if data["barcode"] == code:
-            return name
+    name = barcode_index.lookup(code)
+    if name is not None:
+        return name
     speak("Barcode not recognized.")
     return None
 
@@ -115,10 +133,14 @@ def process_payment(amount_rupees):
 
 # ------------ Main Loop ------------
 speak("Welcome to the Smart Trolley.")
+restore_cart()
 while True:
-    mode = input("\nMode: (b)arcode, (v)oice, (m)anual, (done): ").lower()
+    mode = input("\nMode: (b)arcode, (v)oice, (m)anual, (l)ist route, (done): ").lower()
     if mode == "done":
         break
+    if mode == "l":
+        plan_shopping_list()
+        continue
     if mode == "b":
         product = scan_barcode()
     elif mode == "v":
@@ -131,19 +153,37 @@ while True:
         if qty.isdigit():
             add_to_cart(product, int(qty))
 
+# The bill comes from the pricing engine, not the running total
+priced = PricingEngine().price([{"name": item, "price": amt / q / 100, "qty": q} for item, q, amt in cart])
+bill_total = priced.total / 100
+
 speak("Here is your bill.")
 print("\n------ BILL ------")
-for item, q, amt in cart:
-    line = f"{item.title():20s} {q} pcs  ₹{amt}"
+for line_item in priced.lines():
+    line = f"{line_item['name'].title():20s} {line_item['qty']} pcs  ₹{line_item['total']:g}"
     print(line)
     speak(line)
-print(f"TOTAL: ₹{total_amount}")
-speak(f"Total is rupees {total_amount}")
+print(f"GST included: ₹{priced.tax_total / 100:g}")
+print(f"TOTAL: ₹{bill_total:g}")
+speak(f"Total is rupees {bill_total:g}")
 
 if input("Proceed to payment? (y/n): ").lower() == "y":
-    process_payment(total_amount)
-    speak("Payment process started. Thank you for shopping!")
+    held = {}
+    for item, q, _ in cart:
+        held[item] = held.get(item, 0) + q
+    shortages = inventory.commit(KIOSK_CART_ID, held)
+    if shortages:
+        # A hold expired and the stock went to another cart: don't take payment
+        inventory.release(KIOSK_CART_ID)
+        speak(f"Sorry, not enough stock for {', '.join(shortages)}. Payment cancelled.")
+    else:
+        process_payment(bill_total)
+        persistence.record_order(KIOSK_CART_ID, priced.total, "card", None, priced.lines())
+        speak("Payment process started. Thank you for shopping!")
 else:
+    inventory.release(KIOSK_CART_ID)
     speak("Payment cancelled. Thank you for shopping!")
+persistence.clear_cart(KIOSK_CART_ID)
+persistence.close()
 
 
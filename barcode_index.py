@@ -0,0 +1,168 @@
+"""
+Barcode Index Module
+Compact barcode -> product index for large catalogs.
+EAN-8, UPC-A, EAN-13 and GTIN-14 codes are normalized to GTIN-14 and
+check-digit validated, then kept as a sorted array of 64-bit keys with a
+parallel array of product ids (binary search lookups). Indexes can be saved
+to a flat file and memory-mapped back, so startup cost and resident memory
+stay small even with millions of codes. Store-internal codes that are not
+GTINs are few, so the file keeps them as a small JSON section.
+"""
+
+import bisect
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+GTIN_LENGTHS = (8, 12, 13, 14)
+FILE_MAGIC = b"GTIX0002"
+HEADER = struct.Struct("<8sQQQ")  # magic, code count, product table size, internal codes size in bytes
+
+
+def gtin_check_digit(digits):
+    """GS1 mod-10 check digit for the digits preceding it"""
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        total += int(digit) * (3 if position % 2 == 0 else 1)
+    return (10 - total % 10) % 10
+
+
+def normalize_gtin(code):
+    """
+    Normalize an EAN-8/UPC-A/EAN-13/GTIN-14 code to GTIN-14
+
+    Args:
+        code (str): Scanned code (spaces and dashes are ignored)
+
+    Returns:
+        str: 14-digit GTIN, or None if the code is malformed or its check digit is wrong
+    """
+    digits = code.strip().replace(" ", "").replace("-", "")
+    if not digits.isdigit() or len(digits) not in GTIN_LENGTHS:
+        return None
+    if gtin_check_digit(digits[:-1]) != int(digits[-1]):
+        return None
+    return digits.zfill(14)
+
+
+class BarcodeIndex:
+    def __init__(self, keys=None, product_ids=None, products=None):
+        """
+        Args:
+            keys: Sorted GTIN-14 values (array('Q') or memoryview)
+            product_ids: Product id per key (array('I') or memoryview)
+            products (list): Product names, indexed by product id
+        """
+        self.keys = keys if keys is not None else array("Q")
+        self.product_ids = product_ids if product_ids is not None else array("I")
+        self.products = products if products is not None else []
+        self.internal = {}  # store-internal codes that are not valid GTINs
+        self.rejected = 0
+        self._mmap = None
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Build an index from (code, product) pairs
+
+        Codes that are not valid GTINs are kept in a small exact-match table
+        so store-internal labels keep working.
+        """
+        index = cls()
+        product_ids = {}
+        entries = {}
+        for code, product in pairs:
+            product = sys.intern(product)
+            pid = product_ids.get(product)
+            if pid is None:
+                pid = product_ids[product] = len(index.products)
+                index.products.append(product)
+            gtin = normalize_gtin(code)
+            if gtin is None:
+                if code.strip().isdigit():
+                    index.internal[code.strip()] = pid
+                else:
+                    index.rejected += 1
+                continue
+            entries[int(gtin)] = pid
+        for key in sorted(entries):
+            index.keys.append(key)
+            index.product_ids.append(entries[key])
+        return index
+
+    @classmethod
+    def load_csv(cls, path, code_column="barcode", product_column="product"):
+        """
+        Build an index from a CSV file with barcode and product columns
+
+        Returns:
+            BarcodeIndex: Index; invalid rows are counted in .rejected
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            return cls.from_pairs((row[code_column], row[product_column]) for row in reader)
+
+    def save(self, path):
+        """Write the index to a flat binary file loadable with load()"""
+        table = "\n".join(self.products).encode("utf-8")
+        internal = json.dumps(self.internal, separators=(",", ":")).encode("utf-8") if self.internal else b""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(FILE_MAGIC, len(self.keys), len(table), len(internal)))
+            f.write(array("Q", self.keys).tobytes())
+            f.write(array("I", self.product_ids).tobytes())
+            f.write(table)
+            f.write(internal)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map an index written by save(); the key arrays are not copied
+
+        Returns:
+            BarcodeIndex: Index backed by the mapped file
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(FILE_MAGIC)] != FILE_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a barcode index file (or was written by an older version; rebuild it)")
+        _, count, table_size, internal_size = HEADER.unpack_from(mapped, 0)
+        view = memoryview(mapped)
+        keys_start = HEADER.size
+        ids_start = keys_start + count * 8
+        table_start = ids_start + count * 4
+        keys = view[keys_start:ids_start].cast("Q")
+        product_ids = view[ids_start:table_start].cast("I")
+        products = [sys.intern(p) for p in bytes(view[table_start:table_start + table_size]).decode("utf-8").split("\n")]
+        index = cls(keys, product_ids, products if table_size else [])
+        if internal_size:
+            internal_start = table_start + table_size
+            index.internal = json.loads(bytes(view[internal_start:internal_start + internal_size]).decode("utf-8"))
+        index._mmap = mapped
+        return index
+
+    def lookup(self, code):
+        """
+        Resolve a scanned code to its product
+
+        Args:
+            code (str): Scanned barcode in any supported format
+
+        Returns:
+            str: Product name, or None if unknown or invalid
+        """
+        gtin = normalize_gtin(code)
+        if gtin is None:
+            pid = self.internal.get(code.strip())
+            return None if pid is None else self.products[pid]
+        key = int(gtin)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.products[self.product_ids[position]]
+        return None
+
+    def __len__(self):
+        return len(self.keys) + len(self.internal)
@@ -0,0 +1,635 @@
+"""
+In-process benchmarks for the trolley backend subsystems.
+
+Usage:
+    python benchmarks.py              # run everything
+    python benchmarks.py trolley      # run one benchmark by name
+"""
+
+import asyncio
+import itertools
+import threading
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from barcode_index import BarcodeIndex, gtin_check_digit
+from store_routing import StoreGraph
+from route_planner import plan_route
+from inventory import StockLedger
+from pricing import GST_RATES_BPS, PricingEngine
+from promotions import PromotionEngine
+from product_search import ProductSearchIndex
+from catalog import Catalog, get_catalog, swap_catalog
+from health_monitor import HealthMonitor
+from llm_router import LLMRouter
+from single_flight import SingleFlight, flight_key
+from metrics import MetricsRegistry
+from concurrent.futures import ThreadPoolExecutor
+from trolley_control import LatencyHistogram, TrolleyControlHub, encode_frame
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+# ===== Trolley control channel =====
+async def _simulated_trolley(hub, trolley_id, bursts, burst_size, rng, stop_latencies):
+    inbox = asyncio.Queue()
+    acks = {}
+    stop_sent = {}
+
+    async def send(frame):
+        fields = frame[1:-1].split(",", 2)
+        seq = int(fields[0])
+        if seq in stop_sent:
+            stop_latencies.append(time.perf_counter() - stop_sent.pop(seq))
+        acks[seq] = fields[1]
+
+    async def drive(trolley_id, intent):
+        # Simulated motor controller write
+        await asyncio.sleep(0.002)
+
+    controller = hub.controller(trolley_id)
+    controller.on_command = drive
+    server = asyncio.create_task(controller.serve(inbox.get, send))
+    seq = 0
+    for _ in range(bursts):
+        for _ in range(burst_size):
+            seq += 1
+            await inbox.put(encode_frame(seq, "m", rng.choice("fblr")))
+        if rng.random() < 0.3:
+            seq += 1
+            stop_sent[seq] = time.perf_counter()
+            await inbox.put(encode_frame(seq, "s"))
+        await asyncio.sleep(rng.uniform(0.05, 0.2))
+    await asyncio.sleep(0.05)
+    server.cancel()
+    return seq, acks
+
+
+async def _bench_trolley(trolleys, bursts, burst_size):
+    hub = TrolleyControlHub()
+    rng = random.Random(42)
+    stop_latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        _simulated_trolley(hub, trolley_id, bursts, burst_size, rng, stop_latencies)
+        for trolley_id in range(trolleys)
+    ])
+    elapsed = time.perf_counter() - start
+
+    sent = sum(seq for seq, _ in results)
+    unanswered = sum(seq - len(acks) for seq, acks in results)
+    merged = LatencyHistogram()
+    for state in hub.trolleys.values():
+        for index, count in enumerate(state.histogram.counts):
+            merged.counts[index] += count
+        merged.count += state.histogram.count
+        merged.total_us += state.histogram.total_us
+        merged.max_us = max(merged.max_us, state.histogram.max_us)
+    applied = sum(t.applied for t in hub.trolleys.values())
+    coalesced = sum(t.coalesced for t in hub.trolleys.values())
+
+    print(f"trolleys={trolleys} frames={sent} in {elapsed:.2f}s ({sent / elapsed:.0f} frames/s)")
+    print(f"  applied={applied} coalesced={coalesced} unanswered={unanswered}")
+    print(f"  apply latency p50<={merged.percentile(50)}us p99<={merged.percentile(99)}us max={merged.max_us}us")
+    print(f"  stop ack latency p50={percentile(stop_latencies, 50) * 1e3:.2f}ms "
+          f"p99={percentile(stop_latencies, 99) * 1e3:.2f}ms")
+
+
+def bench_trolley(trolleys=500, bursts=20, burst_size=5):
+    """Hundreds of simulated trolleys sending movement bursts with interleaved stops"""
+    asyncio.run(_bench_trolley(trolleys, bursts, burst_size))
+
+
+# ===== Barcode index =====
+def _random_ean13(rng):
+    body = "890" + "".join(rng.choice("0123456789") for _ in range(9))
+    return body + str(gtin_check_digit(body))
+
+
+def bench_barcode(codes=1_000_000, lookups=200_000):
+    """Build, save and memory-map a million-code index, then time lookups"""
+    rng = random.Random(7)
+    pairs = [(_random_ean13(rng), f"product-{i % 5000}") for i in range(codes)]
+
+    start = time.perf_counter()
+    index = BarcodeIndex.from_pairs(pairs)
+    build = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), "barcodes.idx")
+    index.save(path)
+    start = time.perf_counter()
+    mapped = BarcodeIndex.load(path)
+    load = time.perf_counter() - start
+
+    probes = [rng.choice(pairs)[0] for _ in range(lookups // 2)] + [_random_ean13(rng) for _ in range(lookups // 2)]
+    start = time.perf_counter()
+    hits = sum(1 for code in probes if mapped.lookup(code) is not None)
+    elapsed = time.perf_counter() - start
+
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"codes={len(index)} build={build:.2f}s file={size_mb:.1f}MB mmap load={load * 1e3:.2f}ms")
+    print(f"  lookups={lookups} hits={hits} {elapsed / lookups * 1e6:.2f}us/lookup")
+    os.remove(path)
+
+
+# ===== Store routing =====
+def _aisle_floorplan(rows, cols):
+    # Shelving runs every third column, with cross aisles every tenth row
+    lines = []
+    for r in range(rows):
+        lines.append("".join("#" if c % 3 == 1 and r % 10 not in (0, 9) else "." for c in range(cols)))
+    return "\n".join(lines)
+
+
+def bench_routing(rows=120, cols=120, shelves=400, queries=20000):
+    """Precompute routing tables for a large aisle floorplan and time route queries"""
+    rng = random.Random(11)
+    text = _aisle_floorplan(rows, cols)
+    walkable = [(r, c) for r, line in enumerate(text.split("\n")) for c, ch in enumerate(line) if ch == "."]
+    locations = {f"shelf-{i}": loc for i, loc in enumerate(rng.sample(walkable, shelves))}
+
+    start = time.perf_counter()
+    graph = StoreGraph.from_floorplan(text, locations)
+    build = time.perf_counter() - start
+
+    names = list(locations)
+    probes = [(rng.choice(walkable), rng.choice(names)) for _ in range(queries)]
+    start = time.perf_counter()
+    total_steps = sum(len(graph.route(loc, name)) for loc, name in probes)
+    elapsed = time.perf_counter() - start
+
+    stats = graph.stats()
+    print(f"floor={rows}x{cols} walkable={stats['walkable']} shelves={shelves} "
+          f"build={build:.2f}s tables={stats['table_bytes'] / 1e6:.1f}MB")
+    print(f"  queries={queries} avg path={total_steps / queries:.1f} steps "
+          f"{elapsed / queries * 1e6:.1f}us/route")
+
+
+# ===== Shopping list route planning =====
+def bench_planner(lists=30, sizes=(5, 10, 20, 40)):
+    """Planned visit order vs. list order on a synthetic aisle floorplan"""
+    rng = random.Random(5)
+    text = _aisle_floorplan(60, 60)
+    walkable = [(r, c) for r, line in enumerate(text.split("\n")) for c, ch in enumerate(line) if ch == "."]
+    locations = {f"shelf-{i}": loc for i, loc in enumerate(rng.sample(walkable, 200))}
+    locations["entrance"] = (0, 0)
+    locations["checkout"] = (59, 59)
+    graph = StoreGraph.from_floorplan(text, locations)
+    shelves = [name for name in locations if name.startswith("shelf-")]
+
+    for size in sizes:
+        naive = planned = 0
+        times = []
+        method = ""
+        for _ in range(lists):
+            stops = rng.sample(shelves, size)
+            position, walk = "entrance", 0
+            for stop in stops + ["checkout"]:
+                walk += graph.steps(position, stop)
+                position = stop
+            plan = plan_route(graph, "entrance", stops, end="checkout")
+            naive += walk
+            planned += plan["steps"]
+            times.append(plan["elapsed_ms"])
+            method = plan["method"]
+        print(f"items={size:3d} method={method:9s} list-order={naive / lists:7.1f} planned={planned / lists:7.1f} "
+              f"steps ({100 * (1 - planned / naive):.0f}% shorter) p50={percentile(times, 50):.2f}ms "
+              f"p99={percentile(times, 99):.2f}ms")
+
+
+# ===== Inventory contention =====
+def _shopper(ledger, cart_id, skus, rng, rounds, counts):
+    basket = {}
+    for _ in range(rounds):
+        sku = rng.choice(skus)
+        qty = rng.randint(1, 3)
+        if ledger.reserve(cart_id, sku, qty):
+            basket[sku] = basket.get(sku, 0) + qty
+            counts["reserved"] += 1
+        else:
+            counts["rejected"] += 1
+    if rng.random() < 0.7:
+        if not ledger.commit(cart_id, basket):
+            counts["sold"] += sum(basket.values())
+    else:
+        for sku in basket:
+            ledger.release(cart_id, sku)
+
+
+def bench_inventory(skus=50, stock=400, threads=32, carts=2000, tasks=2000, rounds=10):
+    """Threads and async tasks racing to reserve and commit the same hot SKUs"""
+    for stripes in (1, 64):
+        ledger = StockLedger({f"sku-{i}": stock for i in range(skus)}, stripes=stripes)
+        names = list(ledger.skus)
+        counts = {"reserved": 0, "rejected": 0, "sold": 0}
+        lock = threading.Lock()
+
+        def run(cart_id):
+            local = {"reserved": 0, "rejected": 0, "sold": 0}
+            _shopper(ledger, cart_id, names, random.Random(cart_id), rounds, local)
+            with lock:
+                for key in counts:
+                    counts[key] += local[key]
+
+        async def run_tasks():
+            async def shopper(cart_id):
+                await asyncio.sleep(0)
+                run(cart_id)
+            await asyncio.gather(*[shopper(carts + i) for i in range(tasks)])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            pending = pool.map(run, range(carts))
+            asyncio.run(run_tasks())
+            list(pending)
+        elapsed = time.perf_counter() - start
+
+        operations = (carts + tasks) * (rounds + 1)
+        remaining = sum(s.on_hand for s in ledger.skus.values())
+        held = sum(s.reserved for s in ledger.skus.values())
+        oversold = remaining < 0 or counts["sold"] + remaining != skus * stock
+        print(f"stripes={stripes:2d} threads={threads} tasks={tasks} ops={operations} in {elapsed:.2f}s "
+              f"({operations / elapsed:.0f} ops/s)")
+        print(f"  reserved={counts['reserved']} rejected={counts['rejected']} sold={counts['sold']} "
+              f"left={remaining} still-held={held} oversold={oversold}")
+
+
+# ===== Pricing =====
+def bench_pricing(lines=1_000_000, carts=50_000):
+    """End-of-day re-pricing of a million cart lines, vectorized vs. a Python loop"""
+    import numpy as np
+
+    rng = np.random.default_rng(3)
+    engine = PricingEngine()
+    cart_ids = np.sort(rng.integers(0, carts, lines))
+    unit = rng.integers(500, 50_000, lines)
+    qty = rng.integers(1, 12, lines)
+    rate = rng.choice(np.array(sorted(set(GST_RATES_BPS.values()))), lines)
+    discount = (unit * qty * rng.integers(0, 20, lines)) // 100
+
+    start = time.perf_counter()
+    totals, gst = engine.reprice(cart_ids, unit, qty, rate, discount)
+    vectorized = time.perf_counter() - start
+
+    sample = 100_000
+    start = time.perf_counter()
+    loop_totals = {}
+    for i in range(sample):
+        net = int(unit[i]) * int(qty[i]) - int(discount[i])
+        loop_totals[int(cart_ids[i])] = loop_totals.get(int(cart_ids[i]), 0) + net
+    loop = (time.perf_counter() - start) * lines / sample
+
+    print(f"lines={lines} carts={carts} vectorized={vectorized * 1e3:.1f}ms "
+          f"python loop~{loop * 1e3:.0f}ms (extrapolated) speedup~{loop / vectorized:.0f}x")
+    print(f"  revenue=Rs.{int(totals.sum()) / 100:,.2f} gst=Rs.{int(gst.sum()) / 100:,.2f}")
+
+    start = time.perf_counter()
+    items = [{"name": f"item-{i}", "price": i % 300 + 0.99, "qty": 1 + i % 4} for i in range(40)]
+    for _ in range(1000):
+        engine.price(items, order_discount=5000)
+    print(f"  checkout pricing (40 lines): {(time.perf_counter() - start) * 1e3 / 1000:.3f}ms/cart")
+
+
+# ===== Promotions =====
+def bench_promotions(rules=5000, skus=20000, categories=200, cart_sizes=(10, 50, 200), carts=300):
+    """Cart evaluation time with thousands of active rules indexed by SKU and category"""
+    rng = random.Random(9)
+    sku_names = [f"sku-{i}" for i in range(skus)]
+    category_of = {sku: f"cat-{rng.randrange(categories)}" for sku in sku_names}
+    rule_list = []
+    for i in range(rules):
+        kind = rng.choice(("bogo", "category_percent", "bundle", "threshold"))
+        rule = {"id": f"rule-{i}", "type": kind}
+        if kind == "bogo":
+            rule.update(sku=rng.choice(sku_names), buy=rng.randint(1, 3), free=1)
+        elif kind == "category_percent":
+            rule.update(category=f"cat-{rng.randrange(categories)}", percent=rng.choice((5, 10, 15)))
+        elif kind == "bundle":
+            rule.update(skus=rng.sample(sku_names, rng.randint(2, 3)), price=rng.randint(50, 300))
+        else:
+            rule.update(min_total=rng.randint(200, 5000), discount=rng.randint(10, 200))
+        rule_list.append(rule)
+
+    start = time.perf_counter()
+    engine = PromotionEngine(rule_list, category_of)
+    build = time.perf_counter() - start
+    print(f"rules={rules} index build={build * 1e3:.1f}ms {engine.stats()}")
+
+    for size in cart_sizes:
+        baskets = [[{"name": rng.choice(sku_names), "price": rng.randint(10, 500), "qty": rng.randint(1, 6)}
+                    for _ in range(size)] for _ in range(carts)]
+        times = []
+        for basket in baskets:
+            start = time.perf_counter()
+            engine.evaluate(basket)
+            times.append(time.perf_counter() - start)
+        print(f"  cart={size:4d} items p50={percentile(times, 50) * 1e3:.3f}ms p99={percentile(times, 99) * 1e3:.3f}ms "
+              f"({percentile(times, 50) / size * 1e6:.1f}us/item)")
+
+
+# ===== Product search =====
+_SEARCH_WORDS = ("organic", "fresh", "whole", "wheat", "bread", "milk", "almond", "greek", "yogurt", "olive",
+                 "oil", "extra", "virgin", "brown", "rice", "basmati", "green", "tea", "coffee", "beans",
+                 "dark", "chocolate", "peanut", "butter", "tomato", "sauce", "pasta", "noodles", "masala",
+                 "chips", "salted", "spicy", "paneer", "ghee", "curd", "atta", "dal", "toor", "moong",
+                 "shampoo", "soap", "toothpaste", "herbal", "coconut", "water", "juice", "mango", "apple")
+_SEARCH_BRANDS = ("Amul", "Nestle", "Britannia", "Tata", "Haldiram", "Dabur", "Patanjali", "Himalaya",
+                  "Parle", "Aashirvaad", "Fortune", "MTR", "Everest", "Colgate", "Dove", "Real")
+
+
+def _typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + rng.choice("aeiourst") + word[i + 1:]
+
+
+def bench_search(products=100_000, queries=2000):
+    """Build a word/trigram index over 100k+ synthetic SKUs and time typo-laden queries"""
+    rng = random.Random(13)
+    syllables = ("ka", "ri", "mo", "sa", "ne", "tu", "la", "po", "vi", "de", "go", "ma", "shi", "ran", "tel")
+    # Common grocery words plus a long tail of product-line names, as in real catalogs
+    vocabulary = list(_SEARCH_WORDS) + list({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                                             for _ in range(8000)})
+    cum_weights = list(itertools.accumulate([20] * len(_SEARCH_WORDS) + [1] * (len(vocabulary) - len(_SEARCH_WORDS))))
+    index = ProductSearchIndex()
+    names = []
+    start = time.perf_counter()
+    for i in range(products):
+        words = list(dict.fromkeys(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(2, 4))))
+        name = " ".join(words) + f" {rng.choice((100, 200, 500, 1000))}g"
+        names.append(name)
+        index.add(f"sku-{i}", name, [rng.choice(_SEARCH_BRANDS)], f"aisle {rng.randint(1, 40)}")
+    build = time.perf_counter() - start
+
+    times = []
+    found = 0
+    for _ in range(queries):
+        target = rng.choice(names).split()
+        query = " ".join(_typo(word, rng) for word in target[:rng.randint(1, 3)])
+        start = time.perf_counter()
+        results = index.search(query, limit=10)
+        times.append(time.perf_counter() - start)
+        found += bool(results)
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.add(f"sku-{i}", names[i] + " new", [rng.choice(_SEARCH_BRANDS)], "aisle 1")
+    update = (time.perf_counter() - start) / 1000
+
+    print(f"products={products} build={build:.1f}s {index.stats()} update={update * 1e6:.0f}us/product")
+    print(f"  queries={queries} with hits={found} p50={percentile(times, 50) * 1e3:.2f}ms "
+          f"p99={percentile(times, 99) * 1e3:.2f}ms")
+
+
+# ===== Catalog =====
+def bench_catalog(products=100_000, lookups=200_000):
+    """Load a large catalog into slotted records and compare against per-product dicts"""
+    rng = random.Random(17)
+    brands = [f"brand {i}" for i in range(500)]
+    entries = [{
+        "name": f"product {i}", "label": f"${rng.randint(1, 50)}.99", "brand": rng.choice(brands),
+        "location": f"Aisle {rng.randint(1, 40)}, Shelf {rng.choice('ABCDEF')}",
+        "barcode": _random_ean13(rng), "price": rng.randint(10, 500), "stock": rng.randint(0, 100),
+        "category": rng.choice(list(GST_RATES_BPS))
+    } for i in range(products)]
+    data = {"products": entries, "sections": {"entrance": "Aisle 1"}}
+
+    start = time.perf_counter()
+    catalog = Catalog(data)
+    load = time.perf_counter() - start
+
+    tracemalloc.start()
+    held = Catalog(data)
+    records = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+
+    tracemalloc.start()
+    # The previous layout: one dict per product, rebuilt for each consumer
+    copies = [{e["name"]: dict(e) for e in entries} for _ in range(4)]
+    dicts = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copies
+
+    start = time.perf_counter()
+    catalog.prompt_context()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(1000):
+        catalog.prompt_context()
+    cached = (time.perf_counter() - start) / 1000
+
+    names = [rng.choice(entries)["name"] for _ in range(lookups)]
+    codes = [rng.choice(entries)["barcode"] for _ in range(lookups)]
+    start = time.perf_counter()
+    for name in names:
+        catalog.get(name)
+    by_name = (time.perf_counter() - start) / lookups
+    start = time.perf_counter()
+    for code in codes:
+        catalog.lookup_barcode(code)
+    by_code = (time.perf_counter() - start) / lookups
+
+    # Hot reloads: readers keep serving while new snapshots are built and swapped in
+    live = get_catalog()
+    reads = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            start = time.perf_counter()
+            snapshot = get_catalog()
+            snapshot.get(rng.choice(names))
+            snapshot.prompt_context()
+            reads.append(time.perf_counter() - start)
+            time.sleep(0.0005)  # a steady request rate rather than a busy loop
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    for _ in range(3):
+        swap_catalog(Catalog(data))
+    reload = (time.perf_counter() - start) / 3
+    done.set()
+    for thread in threads:
+        thread.join()
+    swap_catalog(Catalog.load())  # back to the store catalog
+
+    print(f"products={products} load={load:.2f}s records={records / 1e6:.0f}MB vs 4 dict copies={dicts / 1e6:.0f}MB")
+    print(f"  prompt build={first * 1e3:.1f}ms cached={cached * 1e6:.2f}us "
+          f"name lookup={by_name * 1e6:.2f}us barcode lookup={by_code * 1e6:.2f}us {catalog.stats()}")
+    print(f"  hot reload={reload:.2f}s/snapshot, {len(reads)} reads during reloads "
+          f"p99={percentile(reads, 99) * 1e6:.1f}us (generation {live.generation} -> {get_catalog().generation})")
+
+
+# ===== Backend health =====
+def bench_breakers(calls=300, timeout=0.05, outage=(100, 200)):
+    """Request-path cost of a backend that times out, with and without a circuit breaker"""
+    def backend(i):
+        if outage[0] <= i < outage[1]:
+            time.sleep(timeout)  # a dead backend costs a full timeout
+            raise TimeoutError("backend timed out")
+        time.sleep(0.001)
+        return "ok"
+
+    def run(monitor):
+        times = []
+        for i in range(calls):
+            start = time.perf_counter()
+            try:
+                if monitor is None:
+                    backend(i)
+                elif monitor.available("llm"):
+                    with monitor.track("llm"):
+                        backend(i)
+            except TimeoutError:
+                pass
+            times.append(time.perf_counter() - start)
+            if monitor is not None and i == outage[1]:
+                monitor.probe("llm")  # the background probe notices the recovery
+        return times
+
+    plain = run(None)
+    monitor = HealthMonitor()
+    monitor.register("llm", lambda: True, reset_timeout=60.0)
+    guarded = run(monitor)
+    during = slice(*outage)
+    print(f"requests={calls} outage={outage[1] - outage[0]} timeout={timeout * 1e3:.0f}ms")
+    print(f"  no breaker: outage cost={sum(plain[during]):.2f}s p99={percentile(plain, 99) * 1e3:.1f}ms")
+    print(f"  breaker:    outage cost={sum(guarded[during]):.2f}s p99={percentile(guarded, 99) * 1e3:.1f}ms "
+          f"{monitor.status()['llm']['state']} rejected={monitor.breaker('llm').rejected}")
+
+
+# ===== LLM routing =====
+def _llm_backend(rng, median, tail_chance, tail):
+    # Lognormal service time with occasional stalls (model swaps, GC, cold caches)
+    def generate(prompt, cancel):
+        delay = median * rng.lognormvariate(0, 0.3)
+        if rng.random() < tail_chance:
+            delay += tail
+        if cancel.wait(delay):
+            return None
+        return f"answer to {prompt}"
+    return generate
+
+
+def bench_llm_router(prompts=300, scale=0.01):
+    """Sequential fallback vs. the latency-aware router with hedging, on simulated backends"""
+    rng = random.Random(19)
+    specs = {"ollama": (1.0, 0.08, 20.0), "llama_local": (2.5, 0.02, 10.0), "huggingface": (1.5, 0.05, 15.0)}
+    backends = {name: _llm_backend(rng, median * scale, chance, tail * scale)
+                for name, (median, chance, tail) in specs.items()}
+
+    sequential = []
+    for i in range(prompts):
+        start = time.perf_counter()
+        backends["ollama"](i, threading.Event())  # the old order always waits for Ollama
+        sequential.append(time.perf_counter() - start)
+
+    router = LLMRouter(HealthMonitor(), hedge_delay=2.0 * scale, min_hedge_delay=0.0)
+    for name, fn in backends.items():
+        router.add(name, fn, cancellable=True)
+    routed = []
+    for i in range(prompts):
+        start = time.perf_counter()
+        router.generate(i)
+        routed.append(time.perf_counter() - start)
+
+    stats = router.stats()
+    for label, times in (("sequential", sequential), ("router", routed)):
+        print(f"{label:>10}: p50={percentile(times, 50) / scale:.2f}s p95={percentile(times, 95) / scale:.2f}s "
+              f"p99={percentile(times, 99) / scale:.2f}s (simulated seconds)")
+    wins = {name: b["wins"] for name, b in stats["backends"].items()}
+    print(f"  hedges={stats['hedges']} hedge win rate={stats['hedge_win_rate']} wins={wins}")
+
+
+# ===== Request coalescing =====
+def bench_single_flight(shoppers=50, distinct=5, latency=0.2):
+    """A burst of shoppers asking a few questions at once, with and without coalescing"""
+    questions = [f"Where is the sale item {i}?" for i in range(distinct)]
+    burst = [questions[i % distinct].upper() if i % 2 else questions[i % distinct] for i in range(shoppers)]
+    backend_calls = []
+
+    def llm(query):
+        backend_calls.append(query)
+        time.sleep(latency)
+        return f"answer: {query.lower()}"
+
+    for label, coalesce in (("direct", False), ("single-flight", True)):
+        backend_calls.clear()
+        flights = SingleFlight()
+        ask = (lambda q: flights.do(flight_key("generate", "en", q), llm, q)) if coalesce else llm
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=shoppers) as pool:
+            list(pool.map(ask, burst))
+        elapsed = time.perf_counter() - start
+        print(f"{label:>14}: {len(backend_calls)} backend calls for {shoppers} requests in {elapsed:.2f}s")
+    print(f"  coalesced: {flights.stats()['operations']['generate']}")
+
+
+# ===== Metrics =====
+def bench_metrics(observations=1_000_000, routes=40, stages=6):
+    """Hot-path cost of histogram updates and the cost of a /metrics scrape"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency", ("route", "stage"))
+    requests_total = registry.counter("requests_total", "Requests", ("route", "status"))
+    labels = [(f"/api/route{r}", f"stage{s}") for r in range(routes) for s in range(stages)]
+    rng = random.Random(5)
+    values = [rng.lognormvariate(-4, 1.5) for _ in range(1000)]
+
+    start = time.perf_counter()
+    for i in range(observations):
+        latency.observe(values[i % 1000], *labels[i % len(labels)])
+    observe_ns = (time.perf_counter() - start) / observations * 1e9
+
+    start = time.perf_counter()
+    for i in range(observations // 10):
+        with latency.time(*labels[i % len(labels)]):
+            pass
+    timer_ns = (time.perf_counter() - start) / (observations // 10) * 1e9
+
+    start = time.perf_counter()
+    for i in range(observations):
+        requests_total.inc(labels[i % len(labels)][0], "200")
+    inc_ns = (time.perf_counter() - start) / observations * 1e9
+
+    start = time.perf_counter()
+    text = registry.render()
+    scrape_ms = (time.perf_counter() - start) * 1000
+    print(f"observe: {observe_ns:.0f}ns  timed block: {timer_ns:.0f}ns  counter inc: {inc_ns:.0f}ns")
+    print(f"scrape: {len(labels)} series, {len(text.splitlines())} lines, {len(text) / 1024:.0f}KB in {scrape_ms:.1f}ms")
+
+
+BENCHMARKS = {
+    "trolley": bench_trolley,
+    "barcode": bench_barcode,
+    "routing": bench_routing,
+    "planner": bench_planner,
+    "inventory": bench_inventory,
+    "pricing": bench_pricing,
+    "promotions": bench_promotions,
+    "search": bench_search,
+    "catalog": bench_catalog,
+    "breakers": bench_breakers,
+    "llm_router": bench_llm_router,
+    "single_flight": bench_single_flight,
+    "metrics": bench_metrics,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"=== {name} ===")
+        BENCHMARKS[name]()
@@ -0,0 +1,160 @@
+"""
+Cart Channels Module
+Per-cart pub/sub hub for live guidance over /ws/cart/{cart_id}.
+Server-side events fan out to every socket subscribed to a cart through
+bounded per-connection queues; slow consumers are dropped, idle sockets get
+heartbeat pings.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+
+class CartSubscription:
+    def __init__(self, cart_id, max_queue):
+        self.cart_id = cart_id
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+        self.sent = 0
+
+
+class CartChannelHub:
+    def __init__(self, max_queue=32, heartbeat_interval=15.0):
+        """
+        Args:
+            max_queue (int): Pending events allowed per connection before it is dropped
+            heartbeat_interval (float): Seconds of silence before a ping is sent
+        """
+        self.max_queue = max_queue
+        self.heartbeat_interval = heartbeat_interval
+        self.channels = {}  # cart_id -> set of subscriptions
+        self.published = 0
+        self.dropped_consumers = 0
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, cart_id):
+        """Register a connection for a cart (call from the event loop)"""
+        self._loop = asyncio.get_running_loop()
+        subscription = CartSubscription(cart_id, self.max_queue)
+        with self._lock:
+            self.channels.setdefault(cart_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self.channels.get(subscription.cart_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.channels[subscription.cart_id]
+
+    def publish(self, cart_id, event_type, message, **data):
+        """
+        Push an event to every socket subscribed to a cart
+
+        Safe to call from sync endpoints running in the threadpool.
+
+        Args:
+            cart_id: Cart identifier
+            event_type (str): e.g. "item_scanned", "route_update", "checkout_ready"
+            message (str): Human readable guidance text
+        """
+        event = {"type": event_type, "cart_id": cart_id, "message": message, "ts": time.time(), **data}
+        loop = self._loop
+        if loop is None or cart_id not in self.channels:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(cart_id, event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, cart_id, event)
+
+    def _deliver(self, cart_id, event):
+        self.published += 1
+        with self._lock:
+            subscribers = list(self.channels.get(cart_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription):
+        # Slow consumer: discard its backlog and tell its pump to close the socket
+        subscription.dropped = True
+        self.dropped_consumers += 1
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    async def pump(self, subscription, send_text):
+        """
+        Forward queued events to one socket until it is dropped
+
+        Args:
+            subscription (CartSubscription): Subscription from subscribe()
+            send_text (coroutine function): Sends a text frame
+        """
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                event = {"type": "ping", "ts": time.time()}
+            if event is None:
+                return
+            try:
+                await send_text(json.dumps(event, ensure_ascii=False))
+            except Exception:
+                # The socket is gone or broken: stop queueing events for it
+                self.unsubscribe(subscription)
+                return
+            subscription.sent += 1
+
+    async def serve(self, websocket, cart_id):
+        """
+        Run a cart guidance connection until the client leaves or is dropped
+
+        Args:
+            websocket (WebSocket): Accepted FastAPI WebSocket
+            cart_id: Cart identifier
+        """
+        subscription = self.subscribe(cart_id)
+        await websocket.send_text(json.dumps({"type": "connected", "cart_id": cart_id, "message": f"Connected to cart {cart_id}"}))
+        pump = asyncio.create_task(self.pump(subscription, websocket.send_text))
+        reader = asyncio.create_task(self._read_until_closed(websocket))
+        try:
+            await asyncio.wait({pump, reader}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            pump.cancel()
+            reader.cancel()
+            self.unsubscribe(subscription)
+        if subscription.dropped:
+            # 1013: try again later
+            await websocket.close(code=1013)
+
+    @staticmethod
+    async def _read_until_closed(websocket):
+        # Client frames (pongs etc.) are ignored; this just notices disconnects
+        try:
+            while True:
+                await websocket.receive_text()
+        except Exception:
+            return
+
+    def stats(self):
+        with self._lock:
+            connections = sum(len(s) for s in self.channels.values())
+            carts = len(self.channels)
+        return {
+            "carts": carts,
+            "connections": connections,
+            "published": self.published,
+            "dropped_consumers": self.dropped_consumers
+        }
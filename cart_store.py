@@ -0,0 +1,246 @@
+"""
+Cart Store Module
+Server-side carts keyed by cart/session ID.
+Line items are compact __slots__ records with prices in integer paise, totals
+are maintained incrementally, and abandoned carts expire after a TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from pricing import to_paise
+
+
+class CartLine:
+    __slots__ = ("name", "unit_price", "qty")
+
+    def __init__(self, name, unit_price, qty):
+        self.name = name
+        self.unit_price = unit_price  # paise
+        self.qty = qty
+
+    @property
+    def total(self):
+        return self.unit_price * self.qty
+
+    def to_dict(self):
+        return {"name": self.name, "price": self.unit_price / 100, "qty": self.qty}
+
+
+class Cart:
+    __slots__ = ("cart_id", "lines", "subtotal", "item_count", "updated_at", "lock")
+
+    def __init__(self, cart_id):
+        self.cart_id = cart_id
+        self.lines = {}  # name -> CartLine, insertion ordered
+        self.subtotal = 0  # paise
+        self.item_count = 0
+        self.updated_at = time.monotonic()
+        self.lock = threading.RLock()
+
+    def add(self, name, price, qty=1):
+        """Add qty of an item at price (rupees); re-adding updates the unit price"""
+        unit_price = to_paise(price)
+        line = self.lines.get(name)
+        if line is None:
+            line = self.lines[name] = CartLine(name, unit_price, 0)
+        else:
+            self.subtotal += (unit_price - line.unit_price) * line.qty
+            line.unit_price = unit_price
+        line.qty += qty
+        self.subtotal += unit_price * qty
+        self.item_count += qty
+        return line
+
+    def set_qty(self, name, qty):
+        """Set the quantity of an existing item; zero or less removes it"""
+        line = self.lines.get(name)
+        if line is None:
+            return None
+        if qty <= 0:
+            self.remove(name)
+            return None
+        delta = qty - line.qty
+        line.qty = qty
+        self.subtotal += line.unit_price * delta
+        self.item_count += delta
+        return line
+
+    def remove(self, name):
+        line = self.lines.pop(name, None)
+        if line is not None:
+            self.subtotal -= line.total
+            self.item_count -= line.qty
+        return line
+
+    def clear(self):
+        self.lines.clear()
+        self.subtotal = 0
+        self.item_count = 0
+
+    def snapshot(self):
+        return {
+            "cartId": self.cart_id,
+            "items": [line.to_dict() for line in self.lines.values()],
+            "itemCount": self.item_count,
+            "total": self.subtotal / 100
+        }
+
+
+class CartStore:
+    def __init__(self, ttl_seconds=1800, journal=None):
+        """
+        Args:
+            ttl_seconds (float): Idle time after which a cart is considered abandoned
+            journal (Persistence): Optional durable log of cart mutations
+        """
+        self.ttl_seconds = ttl_seconds
+        self.journal = journal
+        self.carts = OrderedDict()  # cart_id -> Cart, least recently touched first
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def _touch(self, cart_id, create):
+        """Look up a cart, refresh its TTL and evict expired carts (store lock held briefly)"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            cart = self.carts.get(cart_id)
+            if cart is None:
+                if not create:
+                    return None
+                cart = self.carts[cart_id] = Cart(cart_id)
+            else:
+                self.carts.move_to_end(cart_id)
+            cart.updated_at = now
+            return cart
+
+    def _evict_expired(self, now):
+        # Carts are ordered by last touch, so only the expired prefix is visited
+        while self.carts:
+            cart_id, cart = next(iter(self.carts.items()))
+            if now - cart.updated_at < self.ttl_seconds:
+                break
+            del self.carts[cart_id]
+            self.evicted += 1
+            if self.journal:
+                self.journal.clear_cart(cart_id)
+
+    def get(self, cart_id):
+        """Snapshot of a cart, or None if it doesn't exist"""
+        cart = self._touch(str(cart_id), create=False)
+        if cart is None:
+            return None
+        with cart.lock:
+            return cart.snapshot()
+
+    def add_item(self, cart_id, name, price, qty=1, reserve=None):
+        """
+        Add qty of an item to a cart, creating the cart if needed
+
+        Args:
+            reserve (callable): Optional hook run under the cart lock before the
+                line changes (e.g. holding stock), so it can't interleave with a
+                checkout of the same cart; a truthy result leaves the cart as it
+                was and is returned under "problems"
+
+        Returns:
+            dict: Cart snapshot
+        """
+        cart = self._touch(str(cart_id), create=True)
+        with cart.lock:
+            problems = reserve() if reserve is not None else None
+            if problems:
+                return {**cart.snapshot(), "problems": problems}
+            line = cart.add(name, price, qty)
+            self._journal_line(cart, line)
+            return cart.snapshot()
+
+    def update_item(self, cart_id, name, qty, reserve=None):
+        """Set an item's quantity; reserve works as in add_item and only runs for items in the cart"""
+        cart = self._touch(str(cart_id), create=False)
+        if cart is None:
+            return None
+        with cart.lock:
+            if name in cart.lines:
+                problems = reserve() if reserve is not None else None
+                if problems:
+                    return {**cart.snapshot(), "problems": problems}
+                cart.set_qty(name, qty)
+                self._journal_line(cart, cart.lines.get(name), name)
+            return cart.snapshot()
+
+    def remove_item(self, cart_id, name):
+        cart = self._touch(str(cart_id), create=False)
+        if cart is None:
+            return None
+        with cart.lock:
+            if cart.remove(name) is not None:
+                self._journal_line(cart, None, name)
+            return cart.snapshot()
+
+    def checkout(self, cart_id, validate=None):
+        """
+        Take the cart's contents for payment and empty it
+
+        Args:
+            cart_id: Cart identifier
+            validate (callable): Optional check run on the snapshot under the cart
+                lock (e.g. committing stock); a truthy result aborts the checkout,
+                leaves the cart intact and is returned under "problems"
+
+        Returns:
+            dict: Snapshot taken under the cart lock, or None if the cart is unknown or empty
+        """
+        cart = self._touch(str(cart_id), create=False)
+        if cart is None:
+            return None
+        with cart.lock:
+            if not cart.lines:
+                return None
+            snapshot = cart.snapshot()
+            if validate is not None:
+                problems = validate(snapshot)
+                if problems:
+                    snapshot["problems"] = problems
+                    return snapshot
+            # Cleared rather than removed, so a concurrent add can't land in an orphaned cart
+            cart.clear()
+            if self.journal:
+                self.journal.clear_cart(cart.cart_id)
+        return snapshot
+
+    def _journal_line(self, cart, line, name=None):
+        # Called under the cart lock so the journal sees mutations in order
+        if not self.journal:
+            return
+        if line is None:
+            self.journal.save_line(cart.cart_id, name, 0, 0)
+        else:
+            self.journal.save_line(cart.cart_id, line.name, line.unit_price, line.qty)
+
+    def restore(self, carts):
+        """
+        Rebuild carts from persisted lines at startup
+
+        Args:
+            carts (dict): {cart_id: [(name, unit_price in paise, qty), ...]}
+
+        Returns:
+            int: Number of carts restored
+        """
+        now = time.monotonic()
+        with self._lock:
+            for cart_id, lines in carts.items():
+                cart = self.carts[str(cart_id)] = Cart(str(cart_id))
+                for name, unit_price, qty in lines:
+                    cart.lines[name] = CartLine(name, unit_price, qty)
+                    cart.subtotal += unit_price * qty
+                    cart.item_count += qty
+                cart.updated_at = now
+        return len(carts)
+
+    def stats(self):
+        with self._lock:
+            return {"carts": len(self.carts), "evicted": self.evicted, "ttl_seconds": self.ttl_seconds}
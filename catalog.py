@@ -0,0 +1,399 @@
+"""
+Catalog Module
+The single store catalog shared by the assistant prompt, the voice
+processor, the barcode API and the kiosk. Products are loaded once from
+catalog.json into slotted records with interned strings. Lookups by name,
+aisle, brand and barcode go through indexes built at load time, and the
+LLM prompt text is generated from the records once and then cached.
+
+The catalog can be replaced while the server runs, from an admin upload or
+when catalog.json changes on disk. A new snapshot is fully built and warmed
+before a single reference swap publishes it, so readers never wait or see a
+half-built index. Derived data hangs off the snapshot (or is keyed by its
+generation), so a swap invalidates it.
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+
+from barcode_index import BarcodeIndex
+
+_AISLE = re.compile(r"aisle\s*(\d+)", re.IGNORECASE)
+
+
+def _intern(value):
+    return sys.intern(value) if value else ""
+
+
+class Product:
+    __slots__ = ("name", "label", "brand", "notes", "details", "location", "aisle",
+                 "barcode", "price", "stock", "cell", "brands", "category")
+
+    def __init__(self, data):
+        self.name = _intern(data["name"].lower())
+        self.label = _intern(data.get("label", ""))  # shelf price as the assistant quotes it
+        self.brand = _intern(data.get("brand", ""))
+        self.notes = data.get("notes", "")
+        self.details = data.get("details", "")
+        self.location = _intern(data.get("location", ""))
+        aisle = _AISLE.search(self.location)
+        self.aisle = int(aisle.group(1)) if aisle else 0
+        self.barcode = data.get("barcode", "")
+        self.price = data.get("price")  # kiosk price in rupees
+        self.stock = int(data.get("stock", 0))
+        self.cell = tuple(data["cell"]) if data.get("cell") else None
+        self.brands = tuple(_intern(b) for b in data.get("brands", ()))
+        self.category = _intern(data.get("category", ""))
+
+    def prompt_line(self):
+        """One product line of the assistant prompt"""
+        line = f"- {self.name.title()}: {self.label}"
+        if self.details:
+            line += f" ({self.details})"
+        if self.brand:
+            line += f", Brand: {self.brand}"
+        if self.notes:
+            line += f", {self.notes}"
+        return f"{line}, Location: {self.location}"
+
+    def to_dict(self):
+        data = {"name": self.name}
+        for field in ("label", "brand", "location", "barcode", "price", "category"):
+            value = getattr(self, field)
+            if value not in ("", None):
+                data[field] = value
+        if self.brands:
+            data["brands"] = list(self.brands)
+        return data
+
+
+class Catalog:
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Parsed catalog.json (grid, sections, products, extra_barcodes)
+        """
+        self.version = data.get("version", 0)
+        self.generation = 0  # set when published; bumps on every reload
+        self.source_mtime = None
+        grid = data.get("grid", {})
+        self.rows = grid.get("rows", 1)
+        self.cols = grid.get("cols", 1)
+        self.entrance = tuple(grid.get("entrance", (0, 0)))
+        self.sections = {_intern(k): _intern(v) for k, v in data.get("sections", {}).items()}
+        self.products = {}
+        self.by_aisle = {}
+        self.by_brand = {}
+        self.by_category = {}
+        for entry in data.get("products", []):
+            product = Product(entry)
+            self.products[product.name] = product
+            if product.aisle:
+                self.by_aisle.setdefault(product.aisle, []).append(product)
+            for brand in (product.brand,) + product.brands:
+                if brand:
+                    self.by_brand.setdefault(brand.lower(), []).append(product)
+            if product.category:
+                self.by_category.setdefault(product.category, []).append(product)
+        pairs = [(p.barcode, p.name) for p in self.products.values() if p.barcode]
+        pairs += list(data.get("extra_barcodes", {}).items())
+        self.barcodes = BarcodeIndex.from_pairs(pairs)
+        self._cache = {}
+        self._lock = threading.RLock()  # cached builders call each other
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or default_catalog_path()
+        mtime = os.stat(path).st_mtime
+        with open(path, encoding="utf-8") as f:
+            catalog = cls(json.load(f))
+        catalog.source_mtime = mtime
+        return catalog
+
+    def get(self, name):
+        return self.products.get(name.lower()) if name else None
+
+    def lookup_barcode(self, code):
+        return self.barcodes.lookup(code)
+
+    def _cached(self, key, build):
+        value = self._cache.get(key)
+        if value is None:
+            with self._lock:
+                value = self._cache.get(key)
+                if value is None:
+                    value = self._cache[key] = build()
+        return value
+
+    def assistant_products(self):
+        """Products the assistant knows about (those with a shelf location)"""
+        return self._cached("assistant", lambda: [p for p in self.products.values() if p.location])
+
+    def kiosk_products(self):
+        """Products sold at the kiosk (those with a rupee price)"""
+        return self._cached("kiosk", lambda: [p for p in self.products.values() if p.price is not None])
+
+    def product_info(self):
+        """{name: {"price", "brand", "location"}} view used by the voice processor"""
+        def build():
+            info = {}
+            for p in self.assistant_products():
+                entry = {"price": p.label, "location": p.location}
+                if p.brand:
+                    entry["brand"] = p.brand
+                info[p.name] = entry
+            return info
+        return self._cached("info", build)
+
+    def shelf_locations(self):
+        """{name: (row, col)} for routing, including the entrance"""
+        def build():
+            locations = {"entrance": self.entrance}
+            locations.update((p.name, p.cell) for p in self.products.values() if p.cell)
+            return locations
+        return self._cached("shelves", build)
+
+    def stock_levels(self):
+        return self._cached("stock", lambda: {p.name: p.stock for p in self.kiosk_products()})
+
+    def categories(self):
+        return self._cached("categories", lambda: {p.name: p.category for p in self.products.values() if p.category})
+
+    def layout_text(self):
+        def build():
+            aisles = {}
+            for section, aisle in self.sections.items():
+                aisles.setdefault(aisle, []).append(section.title())
+            return "\n".join(f"- {aisle}: {', '.join(names)}" for aisle, names in aisles.items())
+        return self._cached("layout", build)
+
+    def prompt_context(self):
+        """Store layout and product list for the assistant prompt"""
+        return self._cached("prompt", lambda: (
+            "You are a smart shopping trolley assistant with built-in knowledge of a supermarket.\n"
+            f"Store layout:\n{self.layout_text()}\n\n"
+            "Product information:\n" + "\n".join(p.prompt_line() for p in self.assistant_products())
+        ))
+
+    def warm(self):
+        """Build every cached view now, so requests never build them"""
+        self.product_info()
+        self.shelf_locations()
+        self.stock_levels()
+        self.categories()
+        self.prompt_context()
+        self.kiosk_products()
+        return self
+
+    def stats(self):
+        return {
+            "products": len(self.products),
+            "aisles": len(self.by_aisle),
+            "brands": len(self.by_brand),
+            "barcodes": len(self.barcodes),
+            "version": self.version,
+            "generation": self.generation
+        }
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_generation = 0
+_listeners = []
+
+
+def default_catalog_path():
+    return os.getenv("CATALOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json"))
+
+
+def get_catalog():
+    """The current catalog snapshot, loaded on first use. Never blocks after that."""
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _publish(Catalog.load().warm())
+            catalog = _catalog
+    return catalog
+
+
+def on_catalog_reload(listener):
+    """
+    Register listener(new_catalog), called before each new snapshot is published
+
+    The listener builds whatever it derives from the catalog and returns a
+    callable that installs the result (plain assignments only), or None.
+    Installs run only after every listener has built successfully, just
+    before the snapshot itself is swapped in.
+    """
+    _listeners.append(listener)
+    return listener
+
+
+def _publish(catalog, commit=None):
+    # Caller holds _catalog_lock
+    global _catalog, _generation
+    generation = _generation + 1
+    catalog.generation = generation
+    installs = []
+    for listener in _listeners:
+        try:
+            installs.append(listener(catalog))
+        except Exception as e:
+            # Nothing has been installed yet: the old snapshot and its indexes stay live
+            raise ValueError(f"Catalog reload listener {getattr(listener, '__name__', listener)} failed: {e}") from e
+    if commit is not None:
+        commit()
+    for install in installs:
+        if install is not None:
+            install()
+    _generation = generation
+    _catalog = catalog
+
+
+def swap_catalog(catalog, commit=None):
+    """
+    Publish a fully built catalog; in-flight requests keep the snapshot they started with
+
+    Args:
+        catalog (Catalog): New snapshot
+        commit (callable): Optional step run after the listeners have built and
+            before anything is installed; if it raises, the publish is abandoned
+
+    Raises:
+        ValueError: If a reload listener failed; the old catalog stays live
+    """
+    catalog.warm()
+    with _catalog_lock:
+        _publish(catalog, commit)
+    print(f"Catalog generation {catalog.generation} live: {len(catalog.products)} products")
+    return catalog
+
+
+def reload_catalog(path=None):
+    return swap_catalog(Catalog.load(path))
+
+
+def save_catalog(data, path=None):
+    """
+    Validate an uploaded catalog, write it to disk and publish it
+
+    Args:
+        data (dict): Catalog in the catalog.json format
+        path (str): File to replace (defaults to the live catalog file)
+
+    Returns:
+        Catalog: The published snapshot
+
+    Raises:
+        ValueError: If the data is not a usable catalog
+    """
+    try:
+        catalog = Catalog(data)
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise ValueError(f"Invalid catalog: {e}")
+    if not catalog.products:
+        raise ValueError("Invalid catalog: no products")
+    path = path or default_catalog_path()
+    # Write beside the target and rename, so the watcher never reads a partial
+    # file. The rename happens only once every listener has built its indexes.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        catalog.source_mtime = os.stat(tmp).st_mtime  # a rename keeps the mtime
+        return swap_catalog(catalog, commit=lambda: os.replace(tmp, path))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class VersionedCache:
+    """Answer cache tied to a catalog generation; a newer generation empties it"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, generation):
+        value = self.entries.get(key) if generation == self.generation else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value, generation):
+        """Store a value computed from the given catalog generation"""
+        if generation < self.generation:
+            return value  # computed from a snapshot that has since been replaced
+        if generation > self.generation or len(self.entries) >= self.max_entries:
+            self.entries = {}
+            self.generation = generation
+        self.entries[key] = value
+        return value
+
+
+class CatalogWatcher:
+    def __init__(self, path=None, interval=2.0):
+        """
+        Poll the catalog file and reload it when it changes
+
+        Args:
+            path (str): Catalog file (defaults to the live catalog file)
+            interval (float): Seconds between checks
+        """
+        self.path = path or default_catalog_path()
+        self.interval = interval
+        self.reloads = 0
+        self.errors = 0
+        self._failed_mtime = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Reload if the file changed since the live snapshot was read"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False
+        if mtime == get_catalog().source_mtime or mtime == self._failed_mtime:
+            return False
+        try:
+            reload_catalog(self.path)
+            self.reloads += 1
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Keep serving the old snapshot; retry only after the next change
+            self.errors += 1
+            self._failed_mtime = mtime
+            print(f"Catalog reload from {self.path} failed: {e}")
+            return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def start_catalog_watcher():
+    """Start polling the catalog file unless CATALOG_WATCH_INTERVAL is 0"""
+    interval = float(os.getenv("CATALOG_WATCH_INTERVAL", "2"))
+    if interval <= 0:
+        return None
+    return CatalogWatcher(interval=interval).start()
@@ -0,0 +1,329 @@
+"""
+Command Lexicon Module
+Native-script and romanized trolley command phrases for the supported languages.
+Commands matched here are handled without a translation round trip.
+"""
+
+import unicodedata
+
+# Words a command may carry besides its phrase ("please", "ji", "jaldi") and still count as one
+MAX_EXTRA_WORDS = 2
+
+# Phrases per language and intent (native script first, then common romanized forms)
+COMMAND_LEXICONS = {
+    "hi": {
+        "movement.forward": ["आगे", "आगे चलो", "आगे बढ़ो", "सीधा चलो", "aage", "aage chalo", "aage badho", "seedha chalo", "sidha chalo"],
+        "movement.backward": ["पीछे", "पीछे चलो", "पीछे जाओ", "peeche", "piche", "peeche chalo", "piche jao"],
+        "movement.left": ["बाएं", "बाएँ", "बाएं मुड़ो", "बाईं ओर", "baaye", "baen", "bayen", "left mudo"],
+        "movement.right": ["दाएं", "दाएँ", "दाएं मुड़ो", "दाईं ओर", "daaye", "dayen", "right mudo"],
+        "movement.stop": ["रुको", "रुकिए", "रुक जाओ", "ठहरो", "बंद करो", "ruko", "rukiye", "ruk jao", "thehro", "band karo"],
+        "speed.increase": ["तेज़", "तेज", "तेज़ चलो", "जल्दी", "tez", "tej", "tez chalo", "jaldi"],
+        "speed.decrease": ["धीरे", "धीरे चलो", "धीमे", "dheere", "dhire", "dheere chalo", "dheeme"],
+        "cart": ["कार्ट", "कार्ट दिखाओ", "मेरा सामान", "cart dikhao", "mera saman", "mera samaan"],
+        "checkout": ["भुगतान", "भुगतान करो", "बिल", "पैसे दो", "bhugtan", "bill banao", "payment karo"],
+        "help": ["मदद", "सहायता", "madad", "sahayata"]
+    },
+    "ta": {
+        "movement.forward": ["முன்னே", "முன்னால்", "முன்னே போ", "நேராக போ", "munne", "munnadi", "munne po", "munnala po", "nera po"],
+        "movement.backward": ["பின்னே", "பின்னால்", "பின்னே போ", "pinne", "pinnadi", "pinne po", "pinnala po"],
+        "movement.left": ["இடது", "இடப்பக்கம்", "இடது பக்கம்", "idathu", "idadhu", "edathu", "idathu pakkam"],
+        "movement.right": ["வலது", "வலப்பக்கம்", "வலது பக்கம்", "valathu", "valadhu", "valathu pakkam"],
+        "movement.stop": ["நில்", "நில்லு", "நிறுத்து", "நிறுத்துங்கள்", "nil", "nillu", "niruthu", "nirutthu"],
+        "speed.increase": ["வேகமாக", "வேகம் கூட்டு", "vegama", "vegamaaga", "vegam kootu"],
+        "speed.decrease": ["மெதுவாக", "மெதுவா", "வேகம் குறை", "medhuva", "methuva", "mella", "vegam korai"],
+        "cart": ["வண்டி", "கூடை", "என் பொருட்கள்", "vandi", "koodai", "en porutkal"],
+        "checkout": ["பணம் செலுத்து", "பில்", "panam kattu", "panam seluthu"],
+        "help": ["உதவி", "udhavi", "uthavi"]
+    },
+    "te": {
+        "movement.forward": ["ముందుకు", "ముందుకి", "ముందుకు వెళ్ళు", "munduku", "munduki", "munduku vellu"],
+        "movement.backward": ["వెనక్కి", "వెనుకకు", "వెనక్కి వెళ్ళు", "venakki", "venukaku", "venakki vellu"],
+        "movement.left": ["ఎడమ", "ఎడమవైపు", "ఎడమకు తిరుగు", "edama", "edamaki", "edama vaipu"],
+        "movement.right": ["కుడి", "కుడివైపు", "కుడికి తిరుగు", "kudi", "kudiki", "kudi vaipu"],
+        "movement.stop": ["ఆగు", "ఆపు", "ఆగండి", "ఆపండి", "aagu", "aapu", "agu", "apu", "aagandi", "aapandi"],
+        "speed.increase": ["వేగంగా", "వేగం పెంచు", "vegamga", "vegam penchu"],
+        "speed.decrease": ["నెమ్మదిగా", "మెల్లగా", "వేగం తగ్గించు", "nemmadiga", "mellaga", "vegam thagginchu"],
+        "cart": ["బండి", "కార్ట్", "నా వస్తువులు", "bandi", "naa vasthuvulu", "cart chupinchu"],
+        "checkout": ["చెల్లించు", "చెల్లింపు", "బిల్లు", "chellinchu", "chellimpu", "billu"],
+        "help": ["సహాయం", "sahayam", "sahaayam"]
+    },
+    "ml": {
+        "movement.forward": ["മുന്നോട്ട്", "മുന്നോട്ട് പോകൂ", "munnottu", "munnott", "munnottu po"],
+        "movement.backward": ["പിന്നോട്ട്", "പുറകോട്ട്", "pinnottu", "pinnott", "purakottu"],
+        "movement.left": ["ഇടത്", "ഇടത്തോട്ട്", "ഇടത്തേക്ക്", "idath", "idathu", "idathottu", "idathekku"],
+        "movement.right": ["വലത്", "വലത്തോട്ട്", "വലത്തേക്ക്", "valath", "valathu", "valathottu", "valathekku"],
+        "movement.stop": ["നിർത്തൂ", "നിർത്ത്", "നിൽക്കൂ", "നിൽക്ക്", "nirthu", "nirthoo", "nilku", "nilkku"],
+        "speed.increase": ["വേഗം", "വേഗത്തിൽ", "വേഗം കൂട്ടൂ", "vegam", "vegathil", "vegam koottu"],
+        "speed.decrease": ["പതുക്കെ", "സാവധാനം", "വേഗം കുറയ്ക്കൂ", "pathukke", "savadhanam", "vegam kurakku"],
+        "cart": ["കാർട്ട്", "ട്രോളി", "എന്റെ സാധനങ്ങൾ", "cart kanikku", "ente sadhanangal"],
+        "checkout": ["പണം അടയ്ക്കുക", "ബിൽ", "panam adakkuka"],
+        "help": ["സഹായം", "sahayam"]
+    },
+    "kn": {
+        "movement.forward": ["ಮುಂದೆ", "ಮುಂದೆ ಹೋಗು", "munde", "munde hogu"],
+        "movement.backward": ["ಹಿಂದೆ", "ಹಿಂದೆ ಹೋಗು", "hinde", "hinde hogu"],
+        "movement.left": ["ಎಡ", "ಎಡಕ್ಕೆ", "ಎಡಕ್ಕೆ ತಿರುಗು", "eda", "edakke"],
+        "movement.right": ["ಬಲ", "ಬಲಕ್ಕೆ", "ಬಲಕ್ಕೆ ತಿರುಗು", "bala", "balakke"],
+        "movement.stop": ["ನಿಲ್ಲಿಸು", "ನಿಲ್ಲು", "ನಿಲ್ಲಿ", "nillisu", "nillu", "nilli"],
+        "speed.increase": ["ವೇಗವಾಗಿ", "ಬೇಗ", "ವೇಗ ಹೆಚ್ಚಿಸು", "vegavagi", "bega", "vega hechchisu"],
+        "speed.decrease": ["ನಿಧಾನವಾಗಿ", "ನಿಧಾನ", "ಮೆಲ್ಲಗೆ", "nidhanavagi", "nidhana", "mellage"],
+        "cart": ["ಕಾರ್ಟ್", "ಗಾಡಿ", "ನನ್ನ ವಸ್ತುಗಳು", "gaadi", "nanna vastugalu"],
+        "checkout": ["ಪಾವತಿ", "ಹಣ ಪಾವತಿಸು", "ಬಿಲ್", "paavati", "pavati"],
+        "help": ["ಸಹಾಯ", "sahaya"]
+    },
+    "bn": {
+        "movement.forward": ["সামনে", "সামনে যাও", "এগিয়ে যাও", "samne", "samne jao", "egiye jao"],
+        "movement.backward": ["পিছনে", "পেছনে", "পিছনে যাও", "pichone", "pechone", "pichone jao"],
+        "movement.left": ["বাঁদিকে", "বাঁয়ে", "বাম", "bamdike", "bam dike", "baye"],
+        "movement.right": ["ডানদিকে", "ডাইনে", "ডান", "dandike", "dan dike", "daine"],
+        "movement.stop": ["থামো", "থামুন", "থাম", "দাঁড়াও", "thamo", "thamun", "tham", "darao"],
+        "speed.increase": ["তাড়াতাড়ি", "জোরে", "দ্রুত", "taratari", "jore", "druto"],
+        "speed.decrease": ["আস্তে", "ধীরে", "aste", "dhire"],
+        "cart": ["কার্ট", "আমার জিনিস", "amar jinis", "cart dekhao"],
+        "checkout": ["বিল", "টাকা দাও", "পেমেন্ট", "taka dao"],
+        "help": ["সাহায্য", "sahajjo", "sahajya"]
+    },
+    "mr": {
+        "movement.forward": ["पुढे", "पुढे चला", "पुढे जा", "pudhe", "pudhe chala", "pudhe ja"],
+        "movement.backward": ["मागे", "मागे जा", "maage", "mage", "mage ja"],
+        "movement.left": ["डावीकडे", "डावे", "डावीकडे वळा", "davikade", "daavikade"],
+        "movement.right": ["उजवीकडे", "उजवे", "उजवीकडे वळा", "ujvikade", "ujavikade"],
+        "movement.stop": ["थांबा", "थांब", "थांबव", "thamba", "thamb", "thambav"],
+        "speed.increase": ["वेगाने", "जोरात", "लवकर", "vegane", "jorat", "lavkar"],
+        "speed.decrease": ["हळू", "हळू चला", "हळूहळू", "halu", "halu chala", "haluhalu"],
+        "cart": ["कार्ट", "माझे सामान", "majhe saman", "maze saman"],
+        "checkout": ["बिल", "पैसे द्या", "पेमेंट", "paise dya"],
+        "help": ["मदत", "madat"]
+    },
+    "gu": {
+        "movement.forward": ["આગળ", "આગળ જાઓ", "આગળ ચાલો", "aagal", "agal", "aagal jao", "aagal chalo"],
+        "movement.backward": ["પાછળ", "પાછળ જાઓ", "paachal", "pachal", "pachal jao"],
+        "movement.left": ["ડાબી", "ડાબે", "ડાબી બાજુ", "dabi", "dabe", "dabi baju"],
+        "movement.right": ["જમણી", "જમણે", "જમણી બાજુ", "jamni", "jamne", "jamni baju"],
+        "movement.stop": ["રોકો", "થોભો", "ઊભા રહો", "બંધ કરો", "roko", "thobho", "ubha raho", "bandh karo"],
+        "speed.increase": ["ઝડપથી", "ઝડપ વધારો", "જલ્દી", "jhadapthi", "zadapthi", "jaldi"],
+        "speed.decrease": ["ધીમે", "ધીમે ધીમે", "ધીમું", "dhime", "dhimu"],
+        "cart": ["કાર્ટ", "મારો સામાન", "maro saman", "cart batavo"],
+        "checkout": ["બિલ", "ચુકવણી", "પૈસા આપો", "chukavani", "paisa aapo"],
+        "help": ["મદદ", "madad"]
+    },
+    "pa": {
+        "movement.forward": ["ਅੱਗੇ", "ਅੱਗੇ ਚੱਲੋ", "ਅੱਗੇ ਜਾਓ", "agge", "agge chalo", "agge jao"],
+        "movement.backward": ["ਪਿੱਛੇ", "ਪਿੱਛੇ ਜਾਓ", "pichhe", "pichhe jao"],
+        "movement.left": ["ਖੱਬੇ", "ਖੱਬੇ ਮੁੜੋ", "khabbe", "khabbe mudo"],
+        "movement.right": ["ਸੱਜੇ", "ਸੱਜੇ ਮੁੜੋ", "sajje", "sajje mudo"],
+        "movement.stop": ["ਰੁਕੋ", "ਰੁਕ ਜਾਓ", "ਠਹਿਰੋ", "ruko", "ruk jao", "thehro"],
+        "speed.increase": ["ਤੇਜ਼", "ਤੇਜ਼ ਚੱਲੋ", "ਛੇਤੀ", "tez", "tez chalo", "chheti"],
+        "speed.decrease": ["ਹੌਲੀ", "ਹੌਲੀ ਚੱਲੋ", "hauli", "holi", "hauli chalo"],
+        "cart": ["ਕਾਰਟ", "ਮੇਰਾ ਸਮਾਨ", "mera saman"],
+        "checkout": ["ਬਿੱਲ", "ਭੁਗਤਾਨ", "ਪੈਸੇ ਦਿਓ", "bhugtan", "paise deo"],
+        "help": ["ਮਦਦ", "madad"]
+    }
+}
+
+# Localized confirmations, so matched commands need no translation on the way back either
+COMMAND_MESSAGES = {
+    "hi": {
+        "movement.forward": "आगे बढ़ रहे हैं",
+        "movement.backward": "पीछे जा रहे हैं",
+        "movement.left": "बाएं मुड़ रहे हैं",
+        "movement.right": "दाएं मुड़ रहे हैं",
+        "movement.stop": "रुक रहे हैं",
+        "speed.increase": "गति बढ़ा रहे हैं",
+        "speed.decrease": "गति कम कर रहे हैं",
+        "cart": "आपका कार्ट दिखा रहे हैं",
+        "checkout": "भुगतान के लिए आगे बढ़ रहे हैं"
+    },
+    "ta": {
+        "movement.forward": "முன்னே செல்கிறது",
+        "movement.backward": "பின்னே செல்கிறது",
+        "movement.left": "இடது பக்கம் திரும்புகிறது",
+        "movement.right": "வலது பக்கம் திரும்புகிறது",
+        "movement.stop": "நிறுத்தப்படுகிறது",
+        "speed.increase": "வேகம் அதிகரிக்கப்படுகிறது",
+        "speed.decrease": "வேகம் குறைக்கப்படுகிறது",
+        "cart": "உங்கள் வண்டியின் பொருட்கள்",
+        "checkout": "பணம் செலுத்த செல்கிறது"
+    },
+    "te": {
+        "movement.forward": "ముందుకు వెళ్తోంది",
+        "movement.backward": "వెనక్కి వెళ్తోంది",
+        "movement.left": "ఎడమకు తిరుగుతోంది",
+        "movement.right": "కుడికి తిరుగుతోంది",
+        "movement.stop": "ఆగుతోంది",
+        "speed.increase": "వేగం పెంచుతోంది",
+        "speed.decrease": "వేగం తగ్గిస్తోంది",
+        "cart": "మీ కార్ట్ చూపిస్తోంది",
+        "checkout": "చెల్లింపుకు వెళ్తోంది"
+    },
+    "ml": {
+        "movement.forward": "മുന്നോട്ട് നീങ്ങുന്നു",
+        "movement.backward": "പിന്നോട്ട് നീങ്ങുന്നു",
+        "movement.left": "ഇടത്തോട്ട് തിരിയുന്നു",
+        "movement.right": "വലത്തോട്ട് തിരിയുന്നു",
+        "movement.stop": "നിർത്തുന്നു",
+        "speed.increase": "വേഗം കൂട്ടുന്നു",
+        "speed.decrease": "വേഗം കുറയ്ക്കുന്നു",
+        "cart": "നിങ്ങളുടെ കാർട്ട് കാണിക്കുന്നു",
+        "checkout": "പണമടയ്ക്കലിലേക്ക് പോകുന്നു"
+    },
+    "kn": {
+        "movement.forward": "ಮುಂದೆ ಹೋಗುತ್ತಿದೆ",
+        "movement.backward": "ಹಿಂದೆ ಹೋಗುತ್ತಿದೆ",
+        "movement.left": "ಎಡಕ್ಕೆ ತಿರುಗುತ್ತಿದೆ",
+        "movement.right": "ಬಲಕ್ಕೆ ತಿರುಗುತ್ತಿದೆ",
+        "movement.stop": "ನಿಲ್ಲುತ್ತಿದೆ",
+        "speed.increase": "ವೇಗ ಹೆಚ್ಚಿಸುತ್ತಿದೆ",
+        "speed.decrease": "ವೇಗ ಕಡಿಮೆ ಮಾಡುತ್ತಿದೆ",
+        "cart": "ನಿಮ್ಮ ಕಾರ್ಟ್ ತೋರಿಸುತ್ತಿದೆ",
+        "checkout": "ಪಾವತಿಗೆ ಹೋಗುತ್ತಿದೆ"
+    },
+    "bn": {
+        "movement.forward": "সামনে যাচ্ছে",
+        "movement.backward": "পিছনে যাচ্ছে",
+        "movement.left": "বাঁদিকে ঘুরছে",
+        "movement.right": "ডানদিকে ঘুরছে",
+        "movement.stop": "থামছে",
+        "speed.increase": "গতি বাড়ানো হচ্ছে",
+        "speed.decrease": "গতি কমানো হচ্ছে",
+        "cart": "আপনার কার্ট দেখানো হচ্ছে",
+        "checkout": "পেমেন্টে যাচ্ছে"
+    },
+    "mr": {
+        "movement.forward": "पुढे जात आहे",
+        "movement.backward": "मागे जात आहे",
+        "movement.left": "डावीकडे वळत आहे",
+        "movement.right": "उजवीकडे वळत आहे",
+        "movement.stop": "थांबत आहे",
+        "speed.increase": "वेग वाढवत आहे",
+        "speed.decrease": "वेग कमी करत आहे",
+        "cart": "तुमचे कार्ट दाखवत आहे",
+        "checkout": "पेमेंटकडे जात आहे"
+    },
+    "gu": {
+        "movement.forward": "આગળ જઈ રહ્યું છે",
+        "movement.backward": "પાછળ જઈ રહ્યું છે",
+        "movement.left": "ડાબે વળી રહ્યું છે",
+        "movement.right": "જમણે વળી રહ્યું છે",
+        "movement.stop": "રોકાઈ રહ્યું છે",
+        "speed.increase": "ઝડપ વધારી રહ્યું છે",
+        "speed.decrease": "ઝડપ ઘટાડી રહ્યું છે",
+        "cart": "તમારું કાર્ટ બતાવી રહ્યું છે",
+        "checkout": "ચુકવણી તરફ જઈ રહ્યું છે"
+    },
+    "pa": {
+        "movement.forward": "ਅੱਗੇ ਜਾ ਰਹੇ ਹਾਂ",
+        "movement.backward": "ਪਿੱਛੇ ਜਾ ਰਹੇ ਹਾਂ",
+        "movement.left": "ਖੱਬੇ ਮੁੜ ਰਹੇ ਹਾਂ",
+        "movement.right": "ਸੱਜੇ ਮੁੜ ਰਹੇ ਹਾਂ",
+        "movement.stop": "ਰੁਕ ਰਹੇ ਹਾਂ",
+        "speed.increase": "ਰਫ਼ਤਾਰ ਵਧਾ ਰਹੇ ਹਾਂ",
+        "speed.decrease": "ਰਫ਼ਤਾਰ ਘਟਾ ਰਹੇ ਹਾਂ",
+        "cart": "ਤੁਹਾਡਾ ਕਾਰਟ ਦਿਖਾ ਰਹੇ ਹਾਂ",
+        "checkout": "ਭੁਗਤਾਨ ਵੱਲ ਜਾ ਰਹੇ ਹਾਂ"
+    }
+}
+
+def normalize_command(text):
+    """Lowercase, NFC-normalize and strip punctuation (including the danda)"""
+    text = unicodedata.normalize("NFC", text).lower()
+    # Category-based so Indic vowel signs and viramas (marks, not word characters) survive
+    text = "".join(" " if unicodedata.category(ch)[0] in "PS" and ch != "'" else ch for ch in text)
+    return " ".join(text.split())
+
+
+class CommandLexicon:
+    def __init__(self, lexicons=None, messages=None):
+        """
+        Build phrase tables for direct command matching
+
+        Args:
+            lexicons (dict): {language: {intent: [phrases]}}
+            messages (dict): {language: {intent: localized confirmation}}
+        """
+        self.messages = messages if messages is not None else COMMAND_MESSAGES
+        self.tables = {}
+        for language, intents in (lexicons if lexicons is not None else COMMAND_LEXICONS).items():
+            self.add_language(language, intents)
+
+    @classmethod
+    def from_patterns(cls, patterns, **kwargs):
+        """
+        Build the default lexicons plus an English table from COMMAND_PATTERNS
+
+        Args:
+            patterns (dict): Command patterns keyed by action
+
+        Returns:
+            CommandLexicon: Lexicon covering all supported languages
+        """
+        lexicon = cls(**kwargs)
+        english = {}
+        for action, entries in patterns.items():
+            if isinstance(entries, dict):
+                for detail, phrases in entries.items():
+                    english[f"{action}.{detail}"] = list(phrases)
+            else:
+                english[action] = list(entries)
+        lexicon.add_language("en", english)
+        return lexicon
+
+    def add_language(self, language, intents):
+        """
+        Register (or replace) the phrase table for a language
+
+        Entries are stored stop phrases first, then longest phrase first.
+        """
+        entries = []
+        for intent, phrases in intents.items():
+            for phrase in phrases:
+                normalized = normalize_command(phrase)
+                if normalized:
+                    entries.append((f" {normalized} ", intent, len(normalized.split())))
+        entries.sort(key=lambda e: (e[1] != "movement.stop", -len(e[0])))
+        self.tables[language] = entries
+
+    def match(self, text, language, fallback="en"):
+        """
+        Match a command directly in the user's language
+
+        A stop phrase anywhere in the utterance, native or English, wins over
+        everything else. Other commands must make up the utterance: the
+        phrase has to start or end it with at most MAX_EXTRA_WORDS other
+        words, so "aage chalo please" moves the trolley but a question such as
+        "where is the bill counter" falls through to translation and the
+        classifier. The native table is tried before the English fallback.
+
+        Args:
+            text (str): Raw command text
+            language (str): Language code
+            fallback (str): Language whose table is the fallback, or None
+
+        Returns:
+            str: Intent label, or None when nothing matched
+        """
+        normalized = normalize_command(text)
+        padded = f" {normalized} "
+        tables = [self.tables.get(language, ())]
+        if fallback and fallback != language:
+            tables.append(self.tables.get(fallback, ()))
+
+        for table in tables:
+            for phrase, intent, _ in table:
+                if intent != "movement.stop":
+                    break
+                if phrase in padded:
+                    return intent
+
+        word_count = len(normalized.split())
+        for table in tables:
+            for phrase, intent, phrase_words in table:
+                if intent == "movement.stop" or word_count - phrase_words > MAX_EXTRA_WORDS:
+                    continue
+                if padded.startswith(phrase) or padded.endswith(phrase):
+                    return intent
+        return None
+
+    def message(self, intent, language):
+        """Localized confirmation for an intent, or None if there isn't one"""
+        return self.messages.get(language, {}).get(intent)
@@ -0,0 +1,550 @@
+"""
+Generate product_aliases.json
+Offline build of the multilingual product alias table. Every alias is
+normalized the same way queries are, then stored against a SKU index, so
+the server only has to load the table and do dictionary lookups. The SKU
+list comes from catalog.json, and the build fails if any catalog product
+has no aliases in one of the languages.
+
+Usage:
+    python generate_product_aliases.py [output.json]
+"""
+
+import json
+import os
+import sys
+
+from catalog import Catalog
+from command_lexicon import normalize_command
+
+LANGUAGES = ("en", "hi", "ta", "te", "ml", "kn", "bn", "mr", "gu", "pa")
+
+# SKU -> language -> names shoppers use (native script first, then romanized)
+ALIAS_SOURCE = {
+    "milk": {
+        "en": ["milk"],
+        "hi": ["दूध", "doodh", "dudh"],
+        "ta": ["பால்", "paal", "pal"],
+        "te": ["పాలు", "paalu", "palu"],
+        "ml": ["പാൽ", "paal"],
+        "kn": ["ಹಾಲು", "haalu", "halu"],
+        "bn": ["দুধ", "dudh"],
+        "mr": ["दूध", "dudh"],
+        "gu": ["દૂધ", "dudh"],
+        "pa": ["ਦੁੱਧ", "dudh"],
+    },
+    "bread": {
+        "en": ["bread", "loaf"],
+        "hi": ["ब्रेड", "डबल रोटी", "double roti", "pav"],
+        "ta": ["ரொட்டி", "பிரெட்", "rotti"],
+        "te": ["బ్రెడ్", "రొట్టె", "rotte"],
+        "ml": ["ബ്രെഡ്", "റൊട്ടി", "rotti"],
+        "kn": ["ಬ್ರೆಡ್", "ರೊಟ್ಟಿ", "rotti"],
+        "bn": ["পাউরুটি", "pauruti"],
+        "mr": ["पाव", "ब्रेड", "pav"],
+        "gu": ["બ્રેડ", "પાઉં", "pau"],
+        "pa": ["ਬ੍ਰੈੱਡ", "ਡਬਲ ਰੋਟੀ", "double roti"],
+    },
+    "eggs": {
+        "en": ["eggs", "egg"],
+        "hi": ["अंडा", "अंडे", "anda", "ande"],
+        "ta": ["முட்டை", "muttai"],
+        "te": ["గుడ్లు", "గుడ్డు", "gudlu", "guddu"],
+        "ml": ["മുട്ട", "mutta"],
+        "kn": ["ಮೊಟ್ಟೆ", "motte"],
+        "bn": ["ডিম", "dim"],
+        "mr": ["अंडी", "andi"],
+        "gu": ["ઈંડા", "inda"],
+        "pa": ["ਆਂਡੇ", "aande"],
+    },
+    "apples": {
+        "en": ["apples", "apple"],
+        "hi": ["सेब", "seb"],
+        "ta": ["ஆப்பிள்", "apple pazham"],
+        "te": ["ఆపిల్", "apil"],
+        "ml": ["ആപ്പിൾ"],
+        "kn": ["ಸೇಬು", "sebu"],
+        "bn": ["আপেল", "apel"],
+        "mr": ["सफरचंद", "safarchand"],
+        "gu": ["સફરજન", "safarjan"],
+        "pa": ["ਸੇਬ", "seb"],
+    },
+    "organic bananas": {
+        "en": ["bananas", "banana"],
+        "hi": ["केला", "केले", "kela", "kele"],
+        "ta": ["வாழைப்பழம்", "vazhaipazham", "valaipalam"],
+        "te": ["అరటి పండు", "అరటిపండ్లు", "arati pandu"],
+        "ml": ["പഴം", "ഏത്തപ്പഴം", "pazham", "ethapazham"],
+        "kn": ["ಬಾಳೆಹಣ್ಣು", "baalehannu", "balehannu"],
+        "bn": ["কলা", "kola"],
+        "mr": ["केळी", "keli"],
+        "gu": ["કેળા", "kela"],
+        "pa": ["ਕੇਲਾ", "ਕੇਲੇ", "kela"],
+    },
+    "fruits": {
+        "en": ["fruits", "fruit"],
+        "hi": ["फल", "phal"],
+        "ta": ["பழங்கள்", "pazhangal"],
+        "te": ["పండ్లు", "pandlu"],
+        "ml": ["പഴങ്ങൾ", "pazhangal"],
+        "kn": ["ಹಣ್ಣುಗಳು", "ಹಣ್ಣು", "hannu"],
+        "bn": ["ফল", "phol"],
+        "mr": ["फळे", "फळ", "phal"],
+        "gu": ["ફળ", "phal"],
+        "pa": ["ਫਲ", "phal"],
+    },
+    "juice": {
+        "en": ["juice"],
+        "hi": ["जूस", "रस", "ras"],
+        "ta": ["ஜூஸ்", "சாறு", "saaru"],
+        "te": ["జ్యూస్", "రసం", "rasam"],
+        "ml": ["ജ്യൂസ്"],
+        "kn": ["ಜ್ಯೂಸ್", "ರಸ"],
+        "bn": ["জুস", "রস", "rosh"],
+        "mr": ["ज्यूस", "रस"],
+        "gu": ["જ્યૂસ", "રસ"],
+        "pa": ["ਜੂਸ", "ਰਸ"],
+    },
+    "cheese": {
+        "en": ["cheese"],
+        "hi": ["चीज़", "चीज"],
+        "ta": ["சீஸ்"],
+        "te": ["చీజ్"],
+        "ml": ["ചീസ്"],
+        "kn": ["ಚೀಸ್"],
+        "bn": ["চিজ"],
+        "mr": ["चीज"],
+        "gu": ["ચીઝ"],
+        "pa": ["ਚੀਜ਼"],
+    },
+    "chicken": {
+        "en": ["chicken"],
+        "hi": ["चिकन", "मुर्गा", "murga"],
+        "ta": ["கோழி", "சிக்கன்", "kozhi", "koli"],
+        "te": ["కోడి", "చికెన్", "kodi"],
+        "ml": ["കോഴി", "ചിക്കൻ", "kozhi"],
+        "kn": ["ಕೋಳಿ", "ಚಿಕನ್", "koli"],
+        "bn": ["মুরগি", "murgi"],
+        "mr": ["चिकन", "कोंबडी", "kombdi"],
+        "gu": ["ચિકન", "મરઘી", "marghi"],
+        "pa": ["ਚਿਕਨ", "ਮੁਰਗਾ", "murga"],
+    },
+    "ice cream": {
+        "en": ["ice cream", "icecream"],
+        "hi": ["आइसक्रीम", "आइस क्रीम"],
+        "ta": ["ஐஸ்கிரீம்"],
+        "te": ["ఐస్ క్రీమ్", "ఐస్‌క్రీమ్"],
+        "ml": ["ഐസ്ക്രീം"],
+        "kn": ["ಐಸ್ ಕ್ರೀಮ್"],
+        "bn": ["আইসক্রিম"],
+        "mr": ["आईस्क्रीम"],
+        "gu": ["આઈસ્ક્રીમ"],
+        "pa": ["ਆਈਸ ਕਰੀਮ"],
+    },
+    "shampoo": {
+        "en": ["shampoo"],
+        "hi": ["शैम्पू", "शैंपू"],
+        "ta": ["ஷாம்பு"],
+        "te": ["షాంపూ"],
+        "ml": ["ഷാംപൂ"],
+        "kn": ["ಶಾಂಪೂ"],
+        "bn": ["শ্যাম্পু"],
+        "mr": ["शॅम्पू", "शाम्पू"],
+        "gu": ["શેમ્પૂ"],
+        "pa": ["ਸ਼ੈਂਪੂ"],
+    },
+    "toothpaste": {
+        "en": ["toothpaste"],
+        "hi": ["टूथपेस्ट", "मंजन", "manjan"],
+        "ta": ["பற்பசை", "parpasai"],
+        "te": ["టూత్‌పేస్ట్", "టూత్ పేస్ట్"],
+        "ml": ["ടൂത്ത്പേസ്റ്റ്"],
+        "kn": ["ಟೂತ್‌ಪೇಸ್ಟ್", "ಟೂತ್ ಪೇಸ್ಟ್"],
+        "bn": ["টুথপেস্ট"],
+        "mr": ["टूथपेस्ट"],
+        "gu": ["ટૂથપેસ્ટ"],
+        "pa": ["ਟੂਥਪੇਸਟ"],
+    },
+    "organic brown rice": {
+        "en": ["rice", "brown rice"],
+        "hi": ["चावल", "chawal", "chaval"],
+        "ta": ["அரிசி", "arisi"],
+        "te": ["బియ్యం", "biyyam"],
+        "ml": ["അരി", "ari"],
+        "kn": ["ಅಕ್ಕಿ", "akki"],
+        "bn": ["চাল", "chal"],
+        "mr": ["तांदूळ", "tandul"],
+        "gu": ["ચોખા", "chokha"],
+        "pa": ["ਚੌਲ", "chaul"],
+    },
+    "extra virgin olive oil": {
+        "en": ["olive oil"],
+        "hi": ["जैतून का तेल", "जैतून तेल", "jaitun ka tel", "jaitoon tel"],
+        "ta": ["ஆலிவ் எண்ணெய்", "olive ennai"],
+        "te": ["ఆలివ్ నూనె", "olive nune"],
+        "ml": ["ഒലിവ് എണ്ണ", "olive enna"],
+        "kn": ["ಆಲಿವ್ ಎಣ್ಣೆ", "olive enne"],
+        "bn": ["জলপাই তেল", "অলিভ অয়েল", "jolpai tel"],
+        "mr": ["ऑलिव्ह तेल", "olive tel"],
+        "gu": ["ઓલિવ તેલ", "olive tel"],
+        "pa": ["ਜ਼ੈਤੂਨ ਦਾ ਤੇਲ", "olive tel"],
+    },
+    "organic green tea": {
+        "en": ["tea", "green tea"],
+        "hi": ["चाय", "chai", "chay"],
+        "ta": ["தேநீர்", "டீ", "theneer"],
+        "te": ["టీ", "tea"],
+        "ml": ["ചായ", "chaya"],
+        "kn": ["ಚಹಾ", "ಟೀ", "chaha"],
+        "bn": ["চা", "cha"],
+        "mr": ["चहा", "chaha"],
+        "gu": ["ચા", "cha"],
+        "pa": ["ਚਾਹ", "chah"],
+    },
+    "organic coffee beans": {
+        "en": ["coffee"],
+        "hi": ["कॉफी", "कॉफ़ी"],
+        "ta": ["காபி", "kaapi", "kapi"],
+        "te": ["కాఫీ", "kaafi"],
+        "ml": ["കാപ്പി", "kaappi"],
+        "kn": ["ಕಾಫಿ", "kaafi"],
+        "bn": ["কফি"],
+        "mr": ["कॉफी"],
+        "gu": ["કૉફી", "કોફી"],
+        "pa": ["ਕੌਫੀ"],
+    },
+    "himalayan pink salt": {
+        "en": ["salt"],
+        "hi": ["नमक", "namak"],
+        "ta": ["உப்பு", "uppu"],
+        "te": ["ఉప్పు", "uppu"],
+        "ml": ["ഉപ്പ്", "uppu"],
+        "kn": ["ಉಪ್ಪು", "uppu"],
+        "bn": ["লবণ", "নুন", "lobon", "nun"],
+        "mr": ["मीठ", "meeth"],
+        "gu": ["મીઠું", "mithu"],
+        "pa": ["ਲੂਣ", "loon"],
+    },
+    "greek yogurt": {
+        "en": ["yogurt", "yoghurt", "curd"],
+        "hi": ["दही", "dahi"],
+        "ta": ["தயிர்", "thayir", "tayir"],
+        "te": ["పెరుగు", "perugu"],
+        "ml": ["തൈര്", "thairu"],
+        "kn": ["ಮೊಸರು", "mosaru"],
+        "bn": ["দই", "doi"],
+        "mr": ["दही", "dahi"],
+        "gu": ["દહીં", "dahi"],
+        "pa": ["ਦਹੀਂ", "dahi"],
+    },
+    "organic spinach": {
+        "en": ["spinach"],
+        "hi": ["पालक", "palak"],
+        "ta": ["பசலைக்கீரை", "கீரை", "keerai"],
+        "te": ["పాలకూర", "palakura"],
+        "ml": ["ചീര", "cheera"],
+        "kn": ["ಪಾಲಕ್", "palak"],
+        "bn": ["পালং শাক", "palong shak"],
+        "mr": ["पालक", "palak"],
+        "gu": ["પાલક", "palak"],
+        "pa": ["ਪਾਲਕ", "palak"],
+    },
+    "dark chocolate": {
+        "en": ["chocolate"],
+        "hi": ["चॉकलेट"],
+        "ta": ["சாக்லேட்"],
+        "te": ["చాక్లెట్"],
+        "ml": ["ചോക്ലേറ്റ്"],
+        "kn": ["ಚಾಕೊಲೇಟ್"],
+        "bn": ["চকলেট"],
+        "mr": ["चॉकलेट"],
+        "gu": ["ચોકલેટ"],
+        "pa": ["ਚਾਕਲੇਟ"],
+    },
+    "coconut water": {
+        "en": ["coconut water"],
+        "hi": ["नारियल पानी", "nariyal pani"],
+        "ta": ["இளநீர்", "ilaneer", "elaneer"],
+        "te": ["కొబ్బరి నీళ్ళు", "kobbari neellu"],
+        "ml": ["ഇളനീർ", "ilaneer", "karikku"],
+        "kn": ["ಎಳನೀರು", "elaneeru"],
+        "bn": ["ডাবের জল", "daber jol"],
+        "mr": ["नारळ पाणी", "naral pani"],
+        "gu": ["નાળિયેર પાણી", "nariyel pani"],
+        "pa": ["ਨਾਰੀਅਲ ਪਾਣੀ", "nariyal pani"],
+    },
+    "maggi": {
+        "en": ["maggi", "noodles", "instant noodles"],
+        "hi": ["मैगी", "नूडल्स"],
+        "ta": ["மேகி", "நூடுல்ஸ்"],
+        "te": ["మ్యాగీ", "నూడుల్స్"],
+        "ml": ["മാഗി", "നൂഡിൽസ്"],
+        "kn": ["ಮ್ಯಾಗಿ", "ನೂಡಲ್ಸ್"],
+        "bn": ["ম্যাগি", "নুডলস"],
+        "mr": ["मॅगी", "नूडल्स"],
+        "gu": ["મેગી", "નૂડલ્સ"],
+        "pa": ["ਮੈਗੀ", "ਨੂਡਲਜ਼"],
+    },
+    "snacks": {
+        "en": ["snacks", "namkeen"],
+        "hi": ["नमकीन", "namkeen"],
+        "ta": ["தின்பண்டம்", "ஸ்நாக்ஸ்", "tinpandam"],
+        "te": ["చిరుతిళ్ళు", "స్నాక్స్", "chiruthindi"],
+        "ml": ["പലഹാരം", "palaharam"],
+        "kn": ["ತಿಂಡಿ", "tindi"],
+        "bn": ["জলখাবার", "jolkhabar"],
+        "mr": ["खाऊ", "नमकीन", "khau"],
+        "gu": ["નાસ્તો", "nasto"],
+        "pa": ["ਨਮਕੀਨ", "namkeen"],
+    },
+    "chips": {
+        "en": ["chips", "crisps"],
+        "hi": ["चिप्स"],
+        "ta": ["சிப்ஸ்"],
+        "te": ["చిప్స్"],
+        "ml": ["ചിപ്സ്"],
+        "kn": ["ಚಿಪ್ಸ್"],
+        "bn": ["চিপস"],
+        "mr": ["चिप्स"],
+        "gu": ["ચિપ્સ"],
+        "pa": ["ਚਿਪਸ"],
+    },
+    "pasta": {
+        "en": ["pasta", "macaroni"],
+        "hi": ["पास्ता", "मैकरोनी", "macroni"],
+        "ta": ["பாஸ்தா", "மக்ரோனி"],
+        "te": ["పాస్తా", "మాకరోనీ"],
+        "ml": ["പാസ്ത", "മക്രോണി"],
+        "kn": ["ಪಾಸ್ತಾ", "ಮ್ಯಾಕರೋನಿ"],
+        "bn": ["পাস্তা", "ম্যাকারনি"],
+        "mr": ["पास्ता", "मॅकरोनी"],
+        "gu": ["પાસ્તા", "મેકરોની"],
+        "pa": ["ਪਾਸਤਾ", "ਮੈਕਰੋਨੀ"],
+    },
+    "cereal": {
+        "en": ["cereal", "cornflakes", "corn flakes", "muesli"],
+        "hi": ["सीरियल", "कॉर्नफ्लेक्स", "cornflex"],
+        "ta": ["சீரியல்", "கார்ன் ஃப்ளேக்ஸ்"],
+        "te": ["సీరియల్", "కార్న్ ఫ్లేక్స్"],
+        "ml": ["സീരിയൽ", "കോൺ ഫ്ലേക്സ്"],
+        "kn": ["ಸೀರಿಯಲ್", "ಕಾರ್ನ್ ಫ್ಲೇಕ್ಸ್"],
+        "bn": ["সিরিয়াল", "কর্নফ্লেক্স"],
+        "mr": ["सीरियल", "कॉर्नफ्लेक्स"],
+        "gu": ["સીરિયલ", "કોર્નફ્લેક્સ"],
+        "pa": ["ਸੀਰੀਅਲ", "ਕੌਰਨਫਲੇਕਸ"],
+    },
+    "soda": {
+        "en": ["soda", "cold drink", "soft drink", "fizzy drink"],
+        "hi": ["सोडा", "कोल्ड ड्रिंक", "thanda"],
+        "ta": ["சோடா", "குளிர்பானம்", "kulirbanam"],
+        "te": ["సోడా", "కూల్ డ్రింక్"],
+        "ml": ["സോഡ", "ശീതളപാനീയം"],
+        "kn": ["ಸೋಡಾ", "ತಂಪು ಪಾನೀಯ", "tampu paniya"],
+        "bn": ["সোডা", "কোল্ড ড্রিংক"],
+        "mr": ["सोडा", "शीतपेय", "shitpey"],
+        "gu": ["સોડા", "ઠંડું પીણું", "thandu pinu"],
+        "pa": ["ਸੋਡਾ", "ਕੋਲਡ ਡਰਿੰਕ"],
+    },
+    "whole wheat bread": {
+        "en": ["wheat bread", "brown bread", "atta bread"],
+        "hi": ["आटा ब्रेड", "ब्राउन ब्रेड", "gehun bread"],
+        "ta": ["கோதுமை ரொட்டி", "கோதுமை பிரெட்", "gothumai rotti"],
+        "te": ["గోధుమ బ్రెడ్", "godhuma bread"],
+        "ml": ["ഗോതമ്പ് ബ്രെഡ്", "gothambu bread"],
+        "kn": ["ಗೋಧಿ ಬ್ರೆಡ್", "godhi bread"],
+        "bn": ["আটার পাউরুটি", "atar pauruti"],
+        "mr": ["गव्हाचा ब्रेड", "gavhacha bread"],
+        "gu": ["ઘઉંની બ્રેડ", "ghau bread"],
+        "pa": ["ਕਣਕ ਦੀ ਬ੍ਰੈੱਡ", "kanak bread"],
+    },
+    "farm fresh eggs": {
+        "en": ["farm eggs", "fresh eggs", "country eggs", "desi eggs"],
+        "hi": ["देसी अंडे", "देसी अंडा", "desi ande", "desi anda"],
+        "ta": ["நாட்டு முட்டை", "நாட்டுக்கோழி முட்டை", "nattu muttai"],
+        "te": ["నాటు కోడి గుడ్లు", "నాటు గుడ్లు", "natu gudlu"],
+        "ml": ["നാടൻ മുട്ട", "nadan mutta"],
+        "kn": ["ನಾಟಿ ಮೊಟ್ಟೆ", "nati motte"],
+        "bn": ["দেশি ডিম", "deshi dim"],
+        "mr": ["गावरान अंडी", "gavran andi"],
+        "gu": ["દેશી ઈંડા", "deshi inda"],
+        "pa": ["ਦੇਸੀ ਆਂਡੇ", "desi aande"],
+    },
+    "almond milk": {
+        "en": ["almond milk", "badam milk"],
+        "hi": ["बादाम दूध", "बादाम का दूध", "badam doodh", "badam dudh"],
+        "ta": ["பாதாம் பால்", "badam paal"],
+        "te": ["బాదం పాలు", "badam palu", "badam paalu"],
+        "ml": ["ബദാം പാൽ", "badam paal"],
+        "kn": ["ಬಾದಾಮಿ ಹಾಲು", "badami halu"],
+        "bn": ["কাঠবাদামের দুধ", "আমন্ড দুধ", "badam dudh"],
+        "mr": ["बदाम दूध", "badam dudh"],
+        "gu": ["બદામ દૂધ", "badam dudh"],
+        "pa": ["ਬਦਾਮ ਦੁੱਧ", "badam dudh"],
+    },
+    "grass-fed ground beef": {
+        "en": ["ground beef", "minced beef", "beef mince", "beef"],
+        "hi": ["बीफ़", "बीफ़ कीमा", "beef keema"],
+        "ta": ["மாட்டிறைச்சி", "maattirachi"],
+        "te": ["గొడ్డు మాంసం", "goddu mamsam"],
+        "ml": ["ബീഫ്", "പോത്തിറച്ചി", "pothirachi"],
+        "kn": ["ದನದ ಮಾಂಸ", "danada mamsa"],
+        "bn": ["গরুর মাংস", "gorur mangsho"],
+        "mr": ["बीफ", "बीफ खिमा", "beef kheema"],
+        "gu": ["બીફ", "બીફ કીમા"],
+        "pa": ["ਬੀਫ", "ਬੀਫ ਕੀਮਾ"],
+    },
+    "atlantic salmon fillet": {
+        "en": ["salmon", "salmon fillet"],
+        "hi": ["सैल्मन", "सैल्मन मछली", "salmon machli"],
+        "ta": ["சால்மன்", "சால்மன் மீன்", "salmon meen"],
+        "te": ["సాల్మన్", "సాల్మన్ చేప", "salmon chepa"],
+        "ml": ["സാൽമൺ", "സാൽമൺ മീൻ", "salmon meen"],
+        "kn": ["ಸಾಲ್ಮನ್", "ಸಾಲ್ಮನ್ ಮೀನು", "salmon meenu"],
+        "bn": ["স্যামন", "স্যামন মাছ", "salmon mach"],
+        "mr": ["सॅल्मन", "सॅल्मन मासा", "salmon masa"],
+        "gu": ["સૅલ્મોન", "સૅલ્મોન માછલી", "salmon machhli"],
+        "pa": ["ਸੈਲਮਨ", "ਸੈਲਮਨ ਮੱਛੀ", "salmon machhi"],
+    },
+    "organic quinoa": {
+        "en": ["quinoa"],
+        "hi": ["क्विनोआ", "kinwa"],
+        "ta": ["கினோவா", "kinova"],
+        "te": ["క్వినోవా", "kinova"],
+        "ml": ["ക്വിനോവ", "kinova"],
+        "kn": ["ಕ್ವಿನೋವಾ", "kinova"],
+        "bn": ["কিনোয়া", "kinoya"],
+        "mr": ["क्विनोआ", "kinwa"],
+        "gu": ["ક્વિનોઆ", "kinwa"],
+        "pa": ["ਕੀਨੂਆ", "kinwa"],
+    },
+    "protein powder": {
+        "en": ["protein powder", "protein", "whey"],
+        "hi": ["प्रोटीन पाउडर", "प्रोटीन"],
+        "ta": ["புரோட்டீன் பவுடர்", "புரதப் பொடி", "protein podi"],
+        "te": ["ప్రోటీన్ పౌడర్", "ప్రోటీన్"],
+        "ml": ["പ്രോട്ടീൻ പൗഡർ", "പ്രോട്ടീൻ"],
+        "kn": ["ಪ್ರೋಟೀನ್ ಪೌಡರ್", "ಪ್ರೋಟೀನ್ ಪುಡಿ", "protein pudi"],
+        "bn": ["প্রোটিন পাউডার", "প্রোটিন"],
+        "mr": ["प्रोटीन पावडर", "प्रोटीन"],
+        "gu": ["પ્રોટીન પાવડર", "પ્રોટીન"],
+        "pa": ["ਪ੍ਰੋਟੀਨ ਪਾਊਡਰ", "ਪ੍ਰੋਟੀਨ"],
+    },
+    "natural peanut butter": {
+        "en": ["peanut butter"],
+        "hi": ["पीनट बटर", "मूंगफली का मक्खन", "moongphali makhan"],
+        "ta": ["பீநட் பட்டர்", "வேர்க்கடலை வெண்ணெய்", "verkadalai vennai"],
+        "te": ["పీనట్ బటర్", "పల్లీ వెన్న", "palli venna"],
+        "ml": ["പീനട്ട് ബട്ടർ", "നിലക്കടല വെണ്ണ", "nilakadala venna"],
+        "kn": ["ಪೀನಟ್ ಬಟರ್", "ಕಡಲೆಕಾಯಿ ಬೆಣ್ಣೆ", "kadalekai benne"],
+        "bn": ["পিনাট বাটার", "চিনাবাদাম মাখন", "chinabadam makhon"],
+        "mr": ["पीनट बटर", "शेंगदाणा बटर", "shengdana butter"],
+        "gu": ["પીનટ બટર", "સીંગદાણા બટર", "singdana butter"],
+        "pa": ["ਪੀਨਟ ਬਟਰ", "ਮੂੰਗਫਲੀ ਮੱਖਣ", "moongphali makhan"],
+    },
+    "organic tomato sauce": {
+        "en": ["tomato sauce", "tomato ketchup", "ketchup"],
+        "hi": ["टमाटर सॉस", "केचप", "tamatar sauce"],
+        "ta": ["தக்காளி சாஸ்", "கெட்ச்அப்", "thakkali sauce"],
+        "te": ["టమాటా సాస్", "కెచప్", "tamata sauce"],
+        "ml": ["തക്കാളി സോസ്", "കെച്ചപ്പ്", "thakkali sauce"],
+        "kn": ["ಟೊಮೆಟೊ ಸಾಸ್", "ಕೆಚಪ್", "tomato saasu"],
+        "bn": ["টমেটো সস", "কেচাপ", "tometo sos"],
+        "mr": ["टोमॅटो सॉस", "केचप"],
+        "gu": ["ટમેટા સોસ", "કેચઅપ", "tameta sauce"],
+        "pa": ["ਟਮਾਟਰ ਸਾਸ", "ਕੈਚਅੱਪ", "tamatar sauce"],
+    },
+    "gluten-free pasta": {
+        "en": ["gluten free pasta"],
+        "hi": ["ग्लूटेन फ्री पास्ता"],
+        "ta": ["குளூட்டன் இல்லாத பாஸ்தா", "குளூட்டன் ஃப்ரீ பாஸ்தா"],
+        "te": ["గ్లూటెన్ ఫ్రీ పాస్తా"],
+        "ml": ["ഗ്ലൂട്ടൻ ഫ്രീ പാസ്ത"],
+        "kn": ["ಗ್ಲುಟನ್ ಫ್ರೀ ಪಾಸ್ತಾ"],
+        "bn": ["গ্লুটেন ফ্রি পাস্তা"],
+        "mr": ["ग्लूटेन फ्री पास्ता"],
+        "gu": ["ગ્લુટેન ફ્રી પાસ્તા"],
+        "pa": ["ਗਲੂਟਨ ਫ੍ਰੀ ਪਾਸਤਾ"],
+    },
+    "bakery": {
+        "en": ["bakery", "cake", "cakes", "pastry", "buns"],
+        "hi": ["बेकरी", "केक", "पेस्ट्री", "bekri"],
+        "ta": ["பேக்கரி", "கேக்"],
+        "te": ["బేకరీ", "కేక్"],
+        "ml": ["ബേക്കറി", "കേക്ക്"],
+        "kn": ["ಬೇಕರಿ", "ಕೇಕ್"],
+        "bn": ["বেকারি", "কেক"],
+        "mr": ["बेकरी", "केक"],
+        "gu": ["બેકરી", "કેક"],
+        "pa": ["ਬੇਕਰੀ", "ਕੇਕ"],
+    },
+    "skin and topical care": {
+        "en": ["skin care", "skincare", "face cream", "skin cream", "lotion", "moisturizer", "moisturiser", "sunscreen"],
+        "hi": ["स्किन केयर", "क्रीम", "लोशन", "skin cream"],
+        "ta": ["சரும பராமரிப்பு", "லோஷன்", "கிரீம்"],
+        "te": ["చర్మ సంరక్షణ", "లోషన్", "క్రీమ్"],
+        "ml": ["ചർമ്മ സംരക്ഷണം", "ലോഷൻ", "ക്രീം"],
+        "kn": ["ಚರ್ಮದ ಆರೈಕೆ", "ಲೋಷನ್", "ಕ್ರೀಮ್"],
+        "bn": ["ত্বকের যত্ন", "লোশন", "ক্রিম"],
+        "mr": ["त्वचा निगा", "लोशन", "क्रीम"],
+        "gu": ["ત્વચા સંભાળ", "લોશન", "ક્રીમ"],
+        "pa": ["ਚਮੜੀ ਦੀ ਦੇਖਭਾਲ", "ਲੋਸ਼ਨ", "ਕਰੀਮ"],
+    },
+}
+
+
+def catalog_skus(path=None):
+    """Every SKU in catalog.json; each one must get aliases"""
+    return sorted(Catalog.load(path).products)
+
+
+def build_table(source, skus=None):
+    """
+    Normalize every alias and group them per language
+
+    Args:
+        source (dict): SKU -> language -> alias phrases
+        skus (list): SKUs that must all be covered (defaults to the catalog's)
+
+    Returns:
+        dict: {"version", "skus": [...], "aliases": {lang: {alias: sku index}}}
+
+    Raises:
+        ValueError: If a SKU has no aliases in some language, or source names a SKU the catalog lacks
+    """
+    skus = sorted(catalog_skus() if skus is None else skus)
+    problems = []
+    for sku in skus:
+        missing = [lang for lang in LANGUAGES if lang != "en" and not source.get(sku, {}).get(lang)]
+        if missing:
+            problems.append(f"{sku}: no aliases for {', '.join(missing)}")
+    problems += [f"{sku}: not in the catalog" for sku in source if sku not in skus]
+    if problems:
+        raise ValueError("Alias table incomplete:\n  " + "\n  ".join(problems))
+    sku_index = {sku: i for i, sku in enumerate(skus)}
+    aliases = {lang: {} for lang in LANGUAGES}
+    for sku, names in source.items():
+        # The SKU name itself always resolves in English
+        for lang, phrases in [("en", [sku])] + list(names.items()):
+            for phrase in phrases:
+                key = normalize_command(phrase)
+                if not key:
+                    continue
+                existing = aliases[lang].get(key)
+                if existing is not None and existing != sku_index[sku]:
+                    print(f"warning: '{phrase}' ({lang}) maps to both {skus[existing]} and {sku}")
+                    continue
+                aliases[lang][key] = sku_index[sku]
+    return {"version": 1, "skus": skus, "aliases": aliases}
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "product_aliases.json")
+    try:
+        table = build_table(ALIAS_SOURCE)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    count = sum(len(a) for a in table["aliases"].values())
+    print(f"Wrote {count} aliases for {len(table['skus'])} products in {len(LANGUAGES)} languages to {output}")
@@ -0,0 +1,269 @@
+"""
+Health Monitor Module
+Circuit breakers for the remote backends the assistant depends on (Ollama,
+Hugging Face, translation services). Real requests and background probes
+feed the same breaker. After repeated failures (or calls slower than the
+backend's latency budget) the breaker opens and the request path skips that
+backend at zero cost. Once the reset timeout has passed, one trial request or
+probe is let through (half-open); success closes the breaker, failure opens
+it again with a longer timeout.
+
+Probes run on a background thread. Healthy backends are probed at the base
+interval, failing ones back off exponentially, and each probe is timed so a
+backend that answers but slowly is treated as unhealthy.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+DISABLED = "disabled"  # not configured; never called, never probed
+
+
+class BackendUnavailable(Exception):
+    """Raised when a call is refused because the backend's breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=300.0, slow_call=None):
+        """
+        Args:
+            name (str): Backend name
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds to stay open before a half-open trial
+            max_reset_timeout (float): Cap for the timeout as it doubles on repeated trips
+            slow_call (float): Calls slower than this many seconds count as failures
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.slow_call = slow_call
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = None
+        self.latencies = deque(maxlen=200)  # seconds, successful calls only
+        self.successes = 0
+        self.errors = 0
+        self.rejected = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """True if a call may go to the backend now (claims the half-open trial)"""
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial = False
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            if self.state == CLOSED:
+                return True
+            if self.state != DISABLED:
+                self.rejected += 1
+            return False
+
+    def ready(self):
+        """Like allow_request() but without claiming the half-open trial"""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return self.state == CLOSED or (self.state == HALF_OPEN and not self._trial)
+
+    def percentile(self, q):
+        """Rolling latency percentile in seconds over recent successful calls, or None"""
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+
+    def record_success(self, latency):
+        if self.state == DISABLED:
+            return
+        if self.slow_call is not None and latency > self.slow_call:
+            self.record_failure(f"slow response ({latency:.1f}s)")
+            return
+        with self._lock:
+            self.latencies.append(latency)
+            self.successes += 1
+            self.failures = 0
+            self.state = CLOSED
+            self.reset_timeout = self.base_reset_timeout
+            self._trial = False
+
+    def record_failure(self, error=None):
+        if self.state == DISABLED:
+            return
+        with self._lock:
+            self.errors += 1
+            self.failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self.state == HALF_OPEN:
+                # The trial failed: back off harder before the next one
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+            self._trial = False
+
+    def disable(self, reason):
+        """Take a backend out of service for good (e.g. no API key configured)"""
+        with self._lock:
+            self.state = DISABLED
+            self.last_error = reason
+        print(f"Backend {self.name} disabled: {reason}")
+
+    def trip(self, reason):
+        """Open the breaker immediately (e.g. the backend failed a startup check)"""
+        with self._lock:
+            self.last_error = reason
+            self._open()
+
+    def _open(self):
+        if self.state != OPEN:
+            print(f"Circuit for {self.name} opened: {self.last_error}")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        p50, p95 = self.percentile(50), self.percentile(95)
+        status = {
+            "state": self.state,
+            "failures": self.failures,
+            "successes": self.successes,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
+        if self.state == OPEN:
+            status["retry_in"] = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+        return status
+
+
+class HealthMonitor:
+    def __init__(self, interval=15.0, max_interval=300.0):
+        """
+        Args:
+            interval (float): Seconds between probes of a healthy backend
+            max_interval (float): Longest back-off between probes of a failing backend
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        self.breakers = {}
+        self.probes = {}  # name -> [probe, next due time, consecutive probe failures]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name, probe=None, **breaker_options):
+        """
+        Add a backend
+
+        Args:
+            name (str): Backend name, e.g. "ollama"
+            probe (callable): Cheap health check returning True when healthy (may raise)
+            breaker_options: CircuitBreaker settings
+
+        Returns:
+            CircuitBreaker: The backend's breaker
+        """
+        breaker = self.breakers[name] = CircuitBreaker(name, **breaker_options)
+        if probe is not None:
+            self.probes[name] = [probe, 0.0, 0]
+        return breaker
+
+    def breaker(self, name):
+        return self.breakers.get(name)
+
+    def available(self, name):
+        """False while the backend's breaker is open; unknown backends are always available"""
+        breaker = self.breakers.get(name)
+        return breaker is None or breaker.allow_request()
+
+    def record(self, name, ok, latency=0.0, error=None):
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            return
+        if ok:
+            breaker.record_success(latency)
+        else:
+            breaker.record_failure(error)
+
+    @contextmanager
+    def track(self, name):
+        """Time a call made after available(); an exception marks the backend unhealthy"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, False, error=e)
+            raise
+        self.record(name, True, time.perf_counter() - start)
+
+    def call(self, name, fn, *args, **kwargs):
+        """Run fn through the backend's breaker; raises BackendUnavailable when open"""
+        if not self.available(name):
+            raise BackendUnavailable(name)
+        with self.track(name):
+            return fn(*args, **kwargs)
+
+    def probe(self, name):
+        """Run one probe now and feed the result to the breaker"""
+        entry = self.probes[name]
+        start = time.perf_counter()
+        try:
+            ok = bool(entry[0]())
+            error = None if ok else "probe failed"
+        except Exception as e:
+            ok, error = False, e
+        latency = time.perf_counter() - start
+        breaker = self.breakers[name]
+        if ok:
+            breaker.record_success(latency)
+        else:
+            breaker.record_failure(error)
+        healthy = breaker.state == CLOSED
+        entry[2] = 0 if healthy else entry[2] + 1
+        # Failing backends are probed less and less often
+        entry[1] = time.monotonic() + min(self.interval * (2 ** entry[2]), self.max_interval)
+        return healthy
+
+    def probe_due(self):
+        now = time.monotonic()
+        for name, entry in list(self.probes.items()):
+            if entry[1] <= now and self.breakers[name].state != DISABLED:
+                self.probe(name)
+
+    def _run(self):
+        while True:
+            self.probe_due()
+            if self._stop.wait(1.0):
+                return
+
+    def start(self):
+        if self._thread is None and self.probes:
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        now = time.monotonic()
+        status = {}
+        for name, breaker in self.breakers.items():
+            entry = breaker.snapshot()
+            if name in self.probes:
+                entry["next_probe_in"] = round(max(0.0, self.probes[name][1] - now), 1)
+            status[name] = entry
+        return status
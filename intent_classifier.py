@@ -0,0 +1,265 @@
+"""
+Intent Classifier Module
+Lightweight in-process classifier for trolley voice commands.
+TF-IDF features with a softmax linear model, trained from COMMAND_PATTERNS and
+previously logged commands, so common commands never need a remote LLM call.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+
+HELP_MESSAGE = "Available commands: move forward, turn left, turn right, stop, faster, slower, show cart, checkout, help"
+UNKNOWN_MESSAGE = "Sorry, I didn't understand that command. Say 'help' for available commands."
+
+MOVEMENT_MESSAGES = {
+    "forward": "Moving forward",
+    "backward": "Moving backward",
+    "left": "Turning left",
+    "right": "Turning right",
+    "stop": "Stopping"
+}
+
+# Generic shopping questions used as examples for the product_info intent,
+# so that questions are not forced into one of the command intents
+PRODUCT_QUERY_EXAMPLES = [
+    "where is the milk",
+    "where can i find bread",
+    "how much is the cheese",
+    "what is the price of eggs",
+    "do you have apples",
+    "tell me about olive oil",
+    "which aisle has rice",
+    "i am looking for shampoo",
+    "is there any coffee",
+    "show me the snacks"
+]
+
+TOKEN_RE = re.compile(r"[\w']+")
+
+
+def _features(text):
+    """Extract word, word-bigram and character-trigram features from text"""
+    tokens = TOKEN_RE.findall(text.lower())
+    counts = {}
+    for i, token in enumerate(tokens):
+        key = "w:" + token
+        counts[key] = counts.get(key, 0) + 1
+        if i:
+            key = "b:" + tokens[i - 1] + "_" + token
+            counts[key] = counts.get(key, 0) + 1
+        padded = " " + token + " "
+        for j in range(len(padded) - 2):
+            key = "c:" + padded[j:j + 3]
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def intent_from_response(response_data):
+    """
+    Derive the intent label from a command response dict
+
+    Args:
+        response_data (dict): Response produced by the command processor
+
+    Returns:
+        str: Intent label such as "movement.left" or "checkout"
+    """
+    action = response_data.get("action", "unknown")
+    if action == "movement":
+        return f"movement.{response_data.get('direction', 'forward')}"
+    if action == "speed":
+        return f"speed.{response_data.get('change', 'decrease')}"
+    return action
+
+
+def build_command_response(intent, text):
+    """
+    Build the command response dict for an intent label
+
+    Args:
+        intent (str): Intent label such as "movement.left" or "cart"
+        text (str): Processed command text
+
+    Returns:
+        dict: Response for the frontend
+    """
+    action, _, detail = intent.partition(".")
+    if action == "movement":
+        return {"action": "movement", "direction": detail, "message": MOVEMENT_MESSAGES.get(detail, f"Moving {detail}")}
+    if action == "speed":
+        return {"action": "speed", "change": detail, "message": f"{'Increasing' if detail == 'increase' else 'Decreasing'} speed"}
+    if action == "cart":
+        return {"action": "cart", "message": "Showing your cart contents"}
+    if action == "checkout":
+        return {"action": "checkout", "message": "Proceeding to checkout"}
+    if action == "help":
+        return {"action": "help", "message": HELP_MESSAGE}
+    if action == "product_info":
+        return {"action": "product_info", "product": text, "message": f"Getting information about {text}"}
+    return {"action": "unknown", "message": UNKNOWN_MESSAGE}
+
+
+class IntentClassifier:
+    def __init__(self, epochs=40, learning_rate=0.5, log_path=None):
+        """
+        Initialize an untrained classifier
+
+        Args:
+            epochs (int): Training passes over the samples
+            learning_rate (float): SGD step size
+            log_path (str): JSON-lines file of logged commands used as extra training data
+        """
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.log_path = log_path
+        self.labels = []
+        self.idf = {}
+        self.weights = {}  # feature -> {label index: weight}
+        self.bias = []
+        self._log_lock = threading.Lock()
+
+    @classmethod
+    def from_patterns(cls, patterns, log_path=None, **kwargs):
+        """
+        Train a classifier from a COMMAND_PATTERNS style dict and the command log
+
+        Args:
+            patterns (dict): Command patterns keyed by action
+            log_path (str): Optional JSON-lines command log
+
+        Returns:
+            IntentClassifier: Trained classifier
+        """
+        samples = []
+        for action, entries in patterns.items():
+            if isinstance(entries, dict):
+                for detail, phrases in entries.items():
+                    samples.extend((phrase, f"{action}.{detail}") for phrase in phrases)
+            else:
+                samples.extend((phrase, action) for phrase in entries)
+        samples.extend((phrase, "product_info") for phrase in PRODUCT_QUERY_EXAMPLES)
+
+        classifier = cls(log_path=log_path, **kwargs)
+        samples.extend(classifier.load_logged_commands())
+        classifier.train(samples)
+        return classifier
+
+    def load_logged_commands(self):
+        """Read (text, intent) samples from the command log"""
+        samples = []
+        if not self.log_path or not os.path.exists(self.log_path):
+            return samples
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        samples.append((entry["text"], entry["intent"]))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError as e:
+            print(f"Failed to read command log: {e}")
+        return samples
+
+    def log_command(self, text, intent):
+        """
+        Append a resolved command to the log so the next training run learns it
+
+        Args:
+            text (str): Processed command text
+            intent (str): Intent label it resolved to
+        """
+        if not self.log_path or not text or intent in ("unknown", "error"):
+            return
+        entry = json.dumps({"text": text, "intent": intent}, ensure_ascii=False)
+        with self._log_lock:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(entry + "\n")
+            except OSError as e:
+                print(f"Failed to log command: {e}")
+
+    def _vectorize(self, text):
+        """TF-IDF vector over known features, L2-normalized"""
+        vector = {}
+        for feature, count in _features(text).items():
+            idf = self.idf.get(feature)
+            if idf is not None:
+                vector[feature] = (1.0 + math.log(count)) * idf
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if norm:
+            for feature in vector:
+                vector[feature] /= norm
+        return vector
+
+    def _scores(self, vector):
+        scores = list(self.bias)
+        for feature, value in vector.items():
+            for index, weight in self.weights.get(feature, {}).items():
+                scores[index] += weight * value
+        return scores
+
+    @staticmethod
+    def _softmax(scores):
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def train(self, samples):
+        """
+        Fit the model with softmax regression (SGD)
+
+        Args:
+            samples (list): (text, intent) pairs
+        """
+        self.labels = sorted({intent for _, intent in samples})
+        label_index = {label: i for i, label in enumerate(self.labels)}
+
+        doc_freq = {}
+        for text, _ in samples:
+            for feature in _features(text):
+                doc_freq[feature] = doc_freq.get(feature, 0) + 1
+        n_docs = len(samples)
+        self.idf = {f: math.log((1 + n_docs) / (1 + df)) + 1.0 for f, df in doc_freq.items()}
+
+        self.weights = {}
+        self.bias = [0.0] * len(self.labels)
+        data = [(self._vectorize(text), label_index[intent]) for text, intent in samples]
+        rng = random.Random(0)
+        for epoch in range(self.epochs):
+            rng.shuffle(data)
+            rate = self.learning_rate / (1.0 + 0.1 * epoch)
+            for vector, target in data:
+                probs = self._softmax(self._scores(vector))
+                for index, prob in enumerate(probs):
+                    gradient = prob - (1.0 if index == target else 0.0)
+                    if abs(gradient) < 1e-6:
+                        continue
+                    self.bias[index] -= rate * gradient
+                    for feature, value in vector.items():
+                        row = self.weights.setdefault(feature, {})
+                        row[index] = row.get(index, 0.0) - rate * gradient * value
+
+    def predict(self, text):
+        """
+        Classify a command
+
+        Args:
+            text (str): Command text (English)
+
+        Returns:
+            tuple: (intent label, confidence between 0 and 1)
+        """
+        if not self.labels:
+            return "unknown", 0.0
+        vector = self._vectorize(text)
+        if not vector:
+            return "unknown", 0.0
+        probs = self._softmax(self._scores(vector))
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
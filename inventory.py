@@ -0,0 +1,225 @@
+"""
+Inventory Module
+Stock reservations shared by concurrent carts.
+Adding to a cart reserves stock with an atomic check-and-reserve under a
+per-SKU lock stripe; checkout commits the reservation into a real stock
+decrement. Holds from abandoned carts expire after a TTL and their stock
+becomes available again; activity on a cart pushes its holds' expiry back.
+SKU keys are normalized here, so callers may pass names in any casing.
+"""
+
+import threading
+import time
+import zlib
+
+
+def normalize_sku(name):
+    """The key a product name is stocked, held and carted under"""
+    return name.strip().lower()
+
+
+class SkuStock:
+    __slots__ = ("on_hand", "reserved", "holds")
+
+    def __init__(self, on_hand):
+        self.on_hand = on_hand
+        self.reserved = 0
+        self.holds = {}  # cart_id -> [qty, expires_at]
+
+    @property
+    def available(self):
+        return self.on_hand - self.reserved
+
+
+class StockLedger:
+    def __init__(self, stock=None, stripes=64, reservation_ttl=1800):
+        """
+        Args:
+            stock (dict): SKU -> units on hand
+            stripes (int): Number of lock stripes SKUs are spread over
+            reservation_ttl (float): Seconds an untouched hold lasts
+        """
+        self.reservation_ttl = reservation_ttl
+        self.skus = {normalize_sku(sku): SkuStock(qty) for sku, qty in (stock or {}).items()}
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self.expired = 0
+        self.rejected = 0
+        self.committed = 0
+
+    def _lock(self, sku):
+        # crc32 rather than hash() so the stripe is stable across processes
+        return self._locks[zlib.crc32(sku.encode("utf-8")) % len(self._locks)]
+
+    def tracks(self, sku):
+        return normalize_sku(sku) in self.skus
+
+    def _expire(self, stock, now):
+        # Called with the SKU's stripe held
+        for cart_id, (qty, expires_at) in list(stock.holds.items()):
+            if expires_at <= now:
+                del stock.holds[cart_id]
+                stock.reserved -= qty
+                self.expired += 1
+
+    def reserve(self, cart_id, sku, qty):
+        """
+        Atomically check availability and hold qty more units for a cart
+
+        Returns:
+            bool: True if reserved; False if the SKU is unknown or short
+        """
+        return self.set_reserved(cart_id, sku, qty, relative=True)
+
+    def set_reserved(self, cart_id, sku, qty, relative=False):
+        """
+        Set (or with relative=True, grow) a cart's hold on a SKU; zero releases it
+
+        Returns:
+            bool: True if the hold now matches the request
+        """
+        sku = normalize_sku(sku)
+        stock = self.skus.get(sku)
+        if stock is None:
+            return False
+        cart_id = str(cart_id)
+        now = time.monotonic()
+        with self._lock(sku):
+            self._expire(stock, now)
+            hold = stock.holds.get(cart_id)
+            current = hold[0] if hold else 0
+            target = current + qty if relative else qty
+            if target <= 0:
+                if hold:
+                    del stock.holds[cart_id]
+                    stock.reserved -= current
+                return True
+            if target - current > stock.available:
+                self.rejected += 1
+                return False
+            stock.reserved += target - current
+            stock.holds[cart_id] = [target, now + self.reservation_ttl]
+            return True
+
+    def release(self, cart_id, sku=None):
+        """Drop a cart's hold on one SKU, or on every SKU when sku is None"""
+        for name in ([normalize_sku(sku)] if sku is not None else list(self.skus)):
+            if name in self.skus:
+                self.set_reserved(cart_id, name, 0)
+
+    def touch(self, cart_id, skus):
+        """
+        Restart the TTL of a cart's holds, so an active cart keeps its stock
+
+        Args:
+            cart_id: Cart identifier
+            skus (iterable): SKUs in the cart
+
+        Returns:
+            int: Number of holds refreshed
+        """
+        cart_id = str(cart_id)
+        refreshed = 0
+        for sku in set(map(normalize_sku, skus)):
+            stock = self.skus.get(sku)
+            if stock is None:
+                continue
+            with self._lock(sku):
+                now = time.monotonic()
+                self._expire(stock, now)
+                hold = stock.holds.get(cart_id)
+                if hold:
+                    hold[1] = now + self.reservation_ttl
+                    refreshed += 1
+        return refreshed
+
+    def commit(self, cart_id, items):
+        """
+        Turn a cart's holds into stock decrements at checkout
+
+        All affected stripes are taken in a fixed order, so the commit is
+        all-or-nothing and can't deadlock with another checkout. Lines whose
+        hold expired are re-checked against available stock.
+
+        Args:
+            cart_id: Cart identifier
+            items (dict): SKU -> quantity being bought (untracked SKUs are ignored)
+
+        Returns:
+            dict: SKU -> units missing; empty when the commit succeeded
+        """
+        cart_id = str(cart_id)
+        tracked = {}
+        for sku, qty in items.items():
+            sku = normalize_sku(sku)
+            if sku in self.skus and qty > 0:
+                tracked[sku] = tracked.get(sku, 0) + qty
+        locks = sorted({id(self._lock(sku)): self._lock(sku) for sku in tracked}.items())
+        now = time.monotonic()
+        for _, lock in locks:
+            lock.acquire()
+        try:
+            shortages = {}
+            for sku, qty in tracked.items():
+                stock = self.skus[sku]
+                self._expire(stock, now)
+                hold = stock.holds.get(cart_id)
+                held = hold[0] if hold else 0
+                if qty > held + stock.available:
+                    shortages[sku] = qty - held - stock.available
+            if shortages:
+                self.rejected += 1
+                return shortages
+            for sku, qty in tracked.items():
+                stock = self.skus[sku]
+                hold = stock.holds.pop(cart_id, None)
+                if hold:
+                    stock.reserved -= hold[0]
+                stock.on_hand -= qty
+            self.committed += 1
+            return {}
+        finally:
+            for _, lock in reversed(locks):
+                lock.release()
+
+    def restock(self, sku, qty):
+        sku = normalize_sku(sku)
+        with self._lock(sku):
+            stock = self.skus.get(sku)
+            if stock is None:
+                stock = self.skus[sku] = SkuStock(0)
+            stock.on_hand += qty
+
+    def available(self, sku):
+        """Units not yet on hold, or None for untracked SKUs"""
+        sku = normalize_sku(sku)
+        stock = self.skus.get(sku)
+        if stock is None:
+            return None
+        with self._lock(sku):
+            self._expire(stock, time.monotonic())
+            return stock.available
+
+    def expire(self):
+        """Sweep every SKU for abandoned holds; returns how many were dropped"""
+        before = self.expired
+        now = time.monotonic()
+        for sku, stock in list(self.skus.items()):
+            with self._lock(sku):
+                self._expire(stock, now)
+        return self.expired - before
+
+    def snapshot(self):
+        return {
+            sku: {"onHand": stock.on_hand, "reserved": stock.reserved, "available": stock.available}
+            for sku, stock in self.skus.items()
+        }
+
+    def stats(self):
+        return {
+            "skus": len(self.skus),
+            "stripes": len(self._locks),
+            "holds": sum(len(stock.holds) for stock in self.skus.values()),
+            "committed": self.committed,
+            "rejected": self.rejected,
+            "expired": self.expired
+        }
@@ -0,0 +1,215 @@
+"""
+LLM Router Module
+Sends each prompt to the fastest healthy text-generation backend (Ollama,
+local LLaMA, Hugging Face) and hedges slow requests. Rolling p50/p95
+latencies come from the health monitor's circuit breakers. Backends are
+tried in p50 order. If the first one has not answered by its own p95, the
+same prompt also goes to the next backend. The first good answer wins, and
+the loser is cancelled (streaming backends stop reading, queued calls never
+start). A backend that fails outright hands over to the next one straight
+away, without waiting for the hedge delay.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from health_monitor import HealthMonitor
+from tracing import span, wrap_context
+
+
+class LLMRouter:
+    def __init__(self, health=None, hedge_delay=2.0, min_hedge_delay=0.05, max_hedge_delay=10.0,
+                 timeout=30.0, max_workers=8):
+        """
+        Args:
+            health (HealthMonitor): Breakers and latency history per backend
+            hedge_delay (float): Hedge delay (s) for a backend with no latency history yet
+            min_hedge_delay, max_hedge_delay (float): Bounds for the p95-based hedge delay
+            timeout (float): Overall time budget per prompt
+            max_workers (int): Threads for concurrent backend calls
+        """
+        self.health = health or HealthMonitor()
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.timeout = timeout
+        self.backends = {}  # name -> (fn, cancellable)
+        self.counters = {}
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.exhausted = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+
+    def add(self, name, fn, cancellable=False):
+        """
+        Register a backend
+
+        Args:
+            name (str): Backend name; shares the health monitor breaker of the same name
+            fn (callable): fn(prompt) -> text or None; fn(prompt, cancel) if cancellable
+            cancellable (bool): fn takes a threading.Event and stops early once it is set
+        """
+        self.backends[name] = (fn, cancellable)
+        self.counters.setdefault(name, {"calls": 0, "wins": 0, "errors": 0, "cancelled": 0})
+        if self.health.breaker(name) is None:
+            self.health.register(name)
+
+    def _count(self, name, key):
+        with self._lock:
+            self.counters[name][key] += 1
+
+    def remove(self, name):
+        self.backends.pop(name, None)
+
+    def _hedge_delay_for(self, name):
+        p95 = self.health.breaker(name).percentile(95)
+        if p95 is None:
+            return self.hedge_delay
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    def ranked(self):
+        """Healthy backends, fastest p50 first (no history counts as the default hedge delay)"""
+        ready = []
+        for name in self.backends:
+            breaker = self.health.breaker(name)
+            if breaker.ready():
+                p50 = breaker.percentile(50)
+                ready.append((p50 if p50 is not None else self.hedge_delay, name))
+        return [name for _, name in sorted(ready)]
+
+    def _call(self, name, prompt, cancel):
+        fn, cancellable = self.backends[name]
+        start = time.perf_counter()
+        try:
+            with span("llm.backend", backend=name) as backend_span:
+                text = fn(prompt, cancel) if cancellable else fn(prompt)
+                backend_span.set_attribute("cancelled", cancel.is_set())
+        except Exception as e:
+            if not cancel.is_set():
+                self.health.record(name, False, error=e)
+                self._count(name, "errors")
+            return None
+        if cancel.is_set():
+            return None  # lost the race; a partial answer says nothing about health
+        ok = bool(text) and "Error" not in text
+        self.health.record(name, ok, time.perf_counter() - start, None if ok else "empty response")
+        if not ok:
+            self._count(name, "errors")
+        return text.strip() if ok else None
+
+    def _launch(self, pending, running, prompt):
+        while pending:
+            name = pending.pop(0)
+            if not self.health.available(name):
+                continue
+            cancel = threading.Event()
+            # Backend calls run on pool threads but stay children of the request's span
+            running[self._executor.submit(wrap_context(self._call), name, prompt, cancel)] = (name, cancel)
+            self._count(name, "calls")
+            return name
+        return None
+
+    def generate(self, prompt, timeout=None):
+        """
+        Generate text from the fastest healthy backend, hedging slow calls
+
+        Args:
+            prompt (str): Full prompt
+            timeout (float): Overrides the router's time budget
+
+        Returns:
+            str: Generated text, or None if every backend failed or timed out
+        """
+        with span("llm.route") as route_span:
+            text, winner, hedged = self._generate(prompt, timeout)
+            route_span.set_attribute("winner", winner or "none")
+            route_span.set_attribute("hedged", hedged)
+            return text
+
+    def _generate(self, prompt, timeout):
+        deadline = time.monotonic() + (timeout or self.timeout)
+        pending = self.ranked()
+        running = {}
+        with self._lock:
+            self.requests += 1
+        primary = self._launch(pending, running, prompt)
+        if primary is None:
+            with self._lock:
+                self.exhausted += 1
+            return None, None, False
+        hedge_at = time.monotonic() + self._hedge_delay_for(primary)
+        hedged = False
+        winner = text = None
+
+        while running and winner is None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake = deadline if hedged or not pending else min(hedge_at, deadline)
+            done, _ = wait(list(running), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _ = running.pop(future)
+                result = future.result()
+                if result and winner is None:
+                    winner, text = name, result
+            if winner is not None:
+                break
+            if not running:
+                # Every call so far failed: fail over without waiting
+                started = self._launch(pending, running, prompt)
+                if started is None:
+                    break
+                with self._lock:
+                    self.failovers += 1
+                hedge_at = time.monotonic() + self._hedge_delay_for(started)
+            elif not hedged and pending and time.monotonic() >= hedge_at:
+                if self._launch(pending, running, prompt) is not None:
+                    hedged = True
+                    with self._lock:
+                        self.hedges += 1
+
+        # Cancel whatever is still running: queued calls never start, streaming ones stop
+        for future, (name, cancel) in running.items():
+            cancel.set()
+            future.cancel()
+            self._count(name, "cancelled")
+            if winner is None:
+                self.health.record(name, False, error="timed out")
+
+        if winner is None:
+            with self._lock:
+                self.exhausted += 1
+            return None, None, hedged
+        self._count(winner, "wins")
+        if hedged and winner != primary:
+            with self._lock:
+                self.hedge_wins += 1
+        return text, winner, hedged
+
+    def stats(self):
+        backends = {}
+        for name, counters in self.counters.items():
+            breaker = self.health.breaker(name)
+            p50, p95 = breaker.percentile(50), breaker.percentile(95)
+            backends[name] = {
+                **counters,
+                "state": breaker.state,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "hedge_delay_ms": round(self._hedge_delay_for(name) * 1000, 1),
+                "active": name in self.backends
+            }
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges, 3) if self.hedges else None,
+            "failovers": self.failovers,
+            "exhausted": self.exhausted,
+            "order": self.ranked(),
+            "backends": backends
+        }
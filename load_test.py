@@ -0,0 +1,364 @@
+"""
+Load Test
+Asyncio load generator for the trolley server. It sends a weighted mix of
+assistant questions, voice commands, checkouts, barcode scans and cart
+WebSocket pushes. Load is either a fixed arrival rate (open loop; new
+requests keep arriving even when the server slows down) or a fixed number
+of concurrent virtual shoppers (closed loop). It reports throughput and
+p50/p90/p99 latency per endpoint, saves them as JSON, and can compare a
+run against an earlier one.
+
+Examples:
+    python load_test.py --duration 30 --concurrency 20
+    python load_test.py --rate 50 --mix ask=2,checkout=1,barcode=4 --output after.json --compare before.json
+    python load_test.py --barcode-url http://127.0.0.1:8001   # barcode API served by backend.py
+
+comprehensive_test.py and test_multilingual.py remain the functional
+checks. This script measures performance.
+
+The checkout scenario fills a fresh server-side cart (reserving stock) and
+checks it out, as a shopper would. Start main.py with TEST_INVENTORY=1 so
+committed stock is put back; otherwise a few seconds of load empty the
+ledger, and the reported checkout latency would be that of the
+"Not enough stock" error path.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:
+    print("load_test.py needs httpx: pip install httpx")
+    sys.exit(1)
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+DEFAULT_MIX = "ask=4,voice=3,checkout=1,barcode=3,ws=1"
+
+ASK_QUERIES = [
+    ("Where is the milk?", "en"),
+    ("What is the price of bread?", "en"),
+    ("Do you have Amul butter?", "en"),
+    ("दूध कहाँ है?", "hi"),
+    ("பால் எங்கே?", "ta"),
+    ("పాల ఎక్కడ?", "te"),
+    ("ಹಾಲು ಎಲ್ಲಿದೆ?", "kn"),
+]
+
+VOICE_COMMANDS = [
+    ("move forward", "en"),
+    ("turn left", "en"),
+    ("stop", "en"),
+    ("go faster", "en"),
+    ("show cart", "en"),
+    ("checkout", "en"),
+    ("आगे बढ़ो", "hi"),
+    ("रुको", "hi"),
+]
+
+
+def load_catalog_samples():
+    """Barcodes and priced products from catalog.json, if it is next to this script"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            products = json.load(f)["products"]
+        barcodes = [p["barcode"] for p in products if p.get("barcode")]
+        items = [{"name": p["name"], "price": p["price"], "qty": 1} for p in products if p.get("price") is not None]
+        return barcodes or ["8901001"], items or [{"name": "milk", "price": 50, "qty": 1}]
+    except (OSError, ValueError, KeyError):
+        return ["8901001", "8901002"], [{"name": "milk", "price": 50, "qty": 1}]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}  # endpoint -> [latency seconds of successful requests]
+        self.outcomes = {}  # endpoint -> {"ok", "app_error", "shed", "http_error", "failed"}
+        self.dropped = 0  # open loop: arrivals skipped because the concurrency cap was reached
+        self.out_of_stock = 0  # checkouts abandoned because stock ran out
+        self.not_found = {}  # endpoint -> URL that answered 404 (route not served there)
+
+    def record(self, endpoint, latency, outcome="ok"):
+        outcomes = self.outcomes.setdefault(endpoint, {"ok": 0, "app_error": 0, "shed": 0, "http_error": 0, "failed": 0})
+        outcomes[outcome] += 1
+        if outcome in ("ok", "app_error"):
+            self.samples.setdefault(endpoint, []).append(latency)
+
+    def summary(self, elapsed):
+        endpoints = {}
+        all_latencies = []
+        for endpoint, outcomes in sorted(self.outcomes.items()):
+            latencies = sorted(self.samples.get(endpoint, []))
+            all_latencies.extend(latencies)
+            endpoints[endpoint] = summarize(latencies, outcomes, elapsed)
+        totals = {key: sum(o[key] for o in self.outcomes.values()) for key in ("ok", "app_error", "shed", "http_error", "failed")}
+        return {"endpoints": endpoints, "total": summarize(sorted(all_latencies), totals, elapsed),
+                "dropped": self.dropped, "out_of_stock": self.out_of_stock, "not_found": self.not_found}
+
+
+def summarize(latencies, outcomes, elapsed):
+    ms = lambda value: round(value * 1000, 2) if value is not None else None
+    requests = sum(outcomes.values())
+    return {
+        "requests": requests,
+        **outcomes,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(1 - outcomes["ok"] / requests, 4) if requests else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p90_ms": ms(percentile(latencies, 90)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None)
+    }
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.base_url = args.base_url.rstrip("/")
+        self.barcode_url = (args.barcode_url or args.base_url).rstrip("/")
+        self.ws_url = self.base_url.replace("http", "ws", 1)
+        self.rng = random.Random(args.seed)
+        self.barcodes, self.items = load_catalog_samples()
+        self.recorder = Recorder()
+        self.client = None
+        # Checkout carts get IDs of their own, distinct from --carts and from earlier runs
+        self.checkout_carts = 10 ** 6 * (int(time.time()) % 1000 + 1)
+        self.scenarios = {
+            "ask": self.ask,
+            "voice": self.voice_command,
+            "checkout": self.checkout,
+            "barcode": self.barcode,
+            "ws": self.websocket_push
+        }
+
+    def cart_id(self):
+        return self.rng.randrange(1, self.args.carts + 1)
+
+    async def post(self, endpoint, url, payload):
+        """POST and record latency and outcome under the endpoint name"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.post(url, json=payload)
+        except httpx.HTTPError:
+            self.recorder.record(endpoint, time.perf_counter() - start, "failed")
+            return None
+        latency = time.perf_counter() - start
+        if response.status_code == 503:
+            self.recorder.record(endpoint, latency, "shed")
+        elif response.status_code >= 400:
+            self.recorder.record(endpoint, latency, "http_error")
+            if response.status_code == 404:
+                self.recorder.not_found.setdefault(endpoint, url)
+        else:
+            data = response.json()
+            failed = isinstance(data, dict) and (data.get("success") is False or "error" in data)
+            self.recorder.record(endpoint, latency, "app_error" if failed else "ok")
+            return data
+        return None
+
+    async def ask(self):
+        query, language = self.rng.choice(ASK_QUERIES)
+        await self.post("ask", f"{self.base_url}/api/ask", {"query": query, "language": language, "cartId": self.cart_id()})
+
+    async def voice_command(self):
+        text, language = self.rng.choice(VOICE_COMMANDS)
+        await self.post("voice", f"{self.base_url}/api/voice-command", {"text": text, "language": language, "cartId": self.cart_id()})
+
+    async def checkout(self):
+        """Reserve a few products in a new server-side cart, then check it out"""
+        self.checkout_carts += 1
+        cart_id = self.checkout_carts
+        for item in self.rng.sample(self.items, min(3, len(self.items))):
+            data = await self.post("cart_add", f"{self.base_url}/api/cart/{cart_id}/items",
+                                   {"name": item["name"], "qty": self.rng.randint(1, 2)})
+            if data is None or data.get("success") is False:
+                if data and data.get("error") == "Not enough stock":
+                    self.recorder.out_of_stock += 1
+                return
+        data = await self.post("checkout", f"{self.base_url}/api/checkout",
+                               {"cartId": cart_id, "paymentMethod": self.rng.choice(["UPI", "Card", "QR"])})
+        if data and data.get("error") == "Not enough stock":
+            self.recorder.out_of_stock += 1
+
+    async def barcode(self):
+        await self.post("barcode", f"{self.barcode_url}/api/barcode", {"query": self.rng.choice(self.barcodes), "language": "en"})
+
+    async def websocket_push(self):
+        """Connect a cart socket, push guidance to it and time the delivery"""
+        cart_id = 100000 + self.cart_id()
+        start = time.perf_counter()
+        try:
+            async with websockets.connect(f"{self.ws_url}/ws/cart/{cart_id}", open_timeout=self.args.timeout) as ws:
+                await asyncio.wait_for(ws.recv(), self.args.timeout)  # "connected"
+                self.recorder.record("ws_connect", time.perf_counter() - start)
+                pushed = time.perf_counter()
+                await self.post("guidance", f"{self.base_url}/api/cart/{cart_id}/guidance",
+                                {"message": "Turn left at aisle 3", "type": "route_update"})
+                await asyncio.wait_for(ws.recv(), self.args.timeout)
+                self.recorder.record("ws_push", time.perf_counter() - pushed)
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+            self.recorder.record("ws_connect", time.perf_counter() - start, "failed")
+
+    def pick(self, names, weights):
+        return self.scenarios[self.rng.choices(names, weights)[0]]
+
+    async def run(self):
+        names, weights = parse_mix(self.args.mix)
+        if "ws" in names and not WEBSOCKETS_AVAILABLE:
+            print("websockets not installed: skipping the ws scenario (pip install websockets)")
+            index = names.index("ws")
+            del names[index], weights[index]
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as client:
+            self.client = client
+            if "checkout" in names:
+                await self.check_test_inventory()
+            deadline = time.perf_counter() + self.args.duration
+            start = time.perf_counter()
+            if self.args.rate:
+                await self.open_loop(names, weights, deadline)
+            else:
+                await asyncio.gather(*(self.shopper(names, weights, deadline) for _ in range(self.args.concurrency)))
+            return time.perf_counter() - start
+
+    async def check_test_inventory(self):
+        try:
+            response = await self.client.get(f"{self.base_url}/api/inventory")
+            test_inventory = response.json().get("testInventory")
+        except (httpx.HTTPError, ValueError):
+            return
+        if not test_inventory:
+            print("Warning: the server commits checkouts against real stock and will run out; "
+                  "start main.py with TEST_INVENTORY=1 for representative checkout latency")
+
+    async def shopper(self, names, weights, deadline):
+        # Closed loop: one virtual shopper, next request as soon as the last one answers
+        while time.perf_counter() < deadline:
+            await self.pick(names, weights)()
+            if self.args.think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / self.args.think_time))
+
+    async def open_loop(self, names, weights, deadline):
+        # Poisson arrivals at --rate per second, at most --concurrency in flight
+        in_flight = set()
+        next_at = time.perf_counter()
+        while True:
+            next_at += self.rng.expovariate(self.args.rate)
+            if next_at >= deadline:
+                break
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            if len(in_flight) >= self.args.concurrency:
+                self.recorder.dropped += 1
+                continue
+            task = asyncio.ensure_future(self.pick(names, weights)())
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+
+def parse_mix(text):
+    names, weights = [], []
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ("ask", "voice", "checkout", "barcode", "ws"):
+            raise SystemExit(f"Unknown scenario in --mix: {name}")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def print_report(result):
+    print(f"\n{'endpoint':<12}{'reqs':>7}{'ok':>7}{'shed':>6}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for name, s in rows:
+        errors = s["app_error"] + s["http_error"] + s["failed"]
+        print(f"{name:<12}{s['requests']:>7}{s['ok']:>7}{s['shed']:>6}{errors:>6}{s['throughput_rps']:>9}"
+              + "".join(f"{s[key] if s[key] is not None else '-':>10}" for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")))
+    for name, url in result["not_found"].items():
+        hint = " (the barcode API is served by backend.py: pass --barcode-url)" if name == "barcode" else ""
+        print(f"{name}: 404 from {url}{hint}")
+    if result["dropped"]:
+        print(f"{result['dropped']} arrivals dropped: --concurrency requests were already in flight")
+    if result.get("out_of_stock"):
+        print(f"{result['out_of_stock']} checkouts ran out of stock: checkout latency is not representative "
+              "(start main.py with TEST_INVENTORY=1)")
+
+
+def print_comparison(result, baseline):
+    """Throughput and latency change per endpoint against an earlier run"""
+    print(f"\nCompared with {baseline['config'].get('started', 'baseline')}:")
+    print(f"{'endpoint':<12}{'rps':>24}{'p50 ms':>26}{'p99 ms':>26}")
+    for name, s in list(result["endpoints"].items()) + [("TOTAL", result["total"])]:
+        before = baseline["total"] if name == "TOTAL" else baseline["endpoints"].get(name)
+        if not before:
+            continue
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p99_ms"):
+            old, new = before.get(key), s.get(key)
+            if old is None or new is None:
+                cells.append("-")
+            else:
+                change = f" ({(new - old) / old * 100:+.0f}%)" if old else ""
+                cells.append(f"{old}->{new}{change}")
+        print(f"{name:<12}{cells[0]:>24}{cells[1]:>26}{cells[2]:>26}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test for the trolley server")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--barcode-url", help="Server with /api/barcode (defaults to --base-url)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to generate load")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual shoppers, or the in-flight cap with --rate")
+    parser.add_argument("--rate", type=float, default=0, help="Requests per second (open loop); 0 = closed loop")
+    parser.add_argument("--think-time", type=float, default=0, help="Mean pause between a shopper's requests (s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights, e.g. ask=4,voice=3,checkout=1,barcode=3,ws=1")
+    parser.add_argument("--carts", type=int, default=50, help="Distinct cart IDs to spread requests over")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="load_test_results.json", help="Where to save the JSON results")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    mode = f"{args.rate}/s open loop (max {args.concurrency} in flight)" if args.rate else f"{args.concurrency} concurrent shoppers"
+    print(f"Load test against {args.base_url}: {mode} for {args.duration}s, mix {args.mix}")
+    test = LoadTest(args)
+    started = time.strftime("%Y-%m-%dT%H:%M:%S")
+    elapsed = asyncio.run(test.run())
+
+    result = test.recorder.summary(elapsed)
+    result["config"] = {**vars(args), "started": started, "elapsed": round(elapsed, 2)}
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\nResults saved to {args.output}")
+    if args.compare:
+        try:
+            with open(args.compare, encoding="utf-8") as f:
+                print_comparison(result, json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Could not compare with {args.compare}: {e}")
+
+
+if __name__ == "__main__":
+    main()
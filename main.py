@@ -18,8 +18,8 @@ except ImportError:
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-from fastapi import FastAPI, WebSocket, Request, UploadFile, File
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi import FastAPI, WebSocket, Request, UploadFile, File, Header
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import List, Optional
@@ -49,9 +49,16 @@ try:
     # Initialize Hugging Face Inference Client
     HF_API_KEY = os.getenv("HF_API_KEY", "your-huggingface-api-key-here")
     hf_client = InferenceClient(api_key=HF_API_KEY)
+    try:
+        # Async endpoints await this client instead of blocking the event loop
+        from huggingface_hub import AsyncInferenceClient
+        hf_async_client = AsyncInferenceClient(api_key=HF_API_KEY)
+    except ImportError:
+        hf_async_client = None
 except ImportError:
     HF_AVAILABLE = False
     hf_client = None
+    hf_async_client = None
 
 # Try to import voice processor
 try:
@@ -61,7 +68,98 @@ except ImportError:
     VOICE_PROCESSOR_AVAILABLE = False
     print("Voice processor not available")
 
-app = FastAPI()
+from intent_classifier import IntentClassifier, build_command_response, intent_from_response
+from command_lexicon import CommandLexicon
+from cart_channels import CartChannelHub
+from cart_store import CartStore
+from persistence import Persistence
+from inventory import StockLedger, normalize_sku
+from pricing import PricingEngine
+from promotions import PromotionEngine, default_promotions_path
+from product_search import ProductSearchIndex
+from product_aliases import ProductAliasIndex
+from catalog import (get_catalog, on_catalog_reload, reload_catalog, save_catalog,
+                     start_catalog_watcher, VersionedCache)
+from store_routing import StoreGraph
+from health_monitor import HealthMonitor, BackendUnavailable
+from llm_router import LLMRouter
+from async_clients import AsyncBackends
+from single_flight import SingleFlight, flight_key
+from admission import AdmissionGate, Overloaded
+from starlette.concurrency import run_in_threadpool
+from metrics import MetricsRegistry, MetricsMiddleware
+from tracing import TracingMiddleware, span
+from contextlib import asynccontextmanager, contextmanager
+import requests
+from route_planner import plan_route
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    # Normal shutdown: commit the writes still queued behind the request path
+    await run_in_threadpool(persistence.close)
+
+app = FastAPI(lifespan=lifespan)
+
+# Prometheus metrics served at /metrics: per-route and per-stage latency histograms,
+# plus live figures read from the components when scraped
+metrics = MetricsRegistry()
+http_requests = metrics.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+http_latency = metrics.histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+stage_latency = metrics.histogram("pipeline_stage_seconds", "Latency of each assistant pipeline stage", ("pipeline", "stage"))
+app.add_middleware(MetricsMiddleware, requests=http_requests, latency=http_latency)
+# Root span per request (TRACE_EXPORTER=console/file/otel); stages below are child spans
+app.add_middleware(TracingMiddleware)
+
+@contextmanager
+def stage(pipeline, name):
+    """Time a pipeline stage as a span and in the stage latency histogram"""
+    with span(f"{pipeline}.{name}"), stage_latency.time(pipeline, name):
+        yield
+
+# Live guidance channels for /ws/cart, one per cart
+cart_channels = CartChannelHub()
+
+# Durable carts and orders (SQLite WAL, written behind the request path)
+persistence = Persistence(os.getenv("TROLLEY_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "trolley.db")))
+
+# Server-side carts keyed by cart/session ID; idle carts expire
+cart_store = CartStore(ttl_seconds=int(os.getenv("CART_TTL_SECONDS", "1800")), journal=persistence)
+# Cart lines are keyed by normalized SKU, like stock holds (older rows may use other casing)
+restored_carts = {cart_id: [(normalize_sku(name), unit_price, qty) for name, unit_price, qty in lines]
+                  for cart_id, lines in persistence.load_carts().items()}
+print(f"Restored {cart_store.restore(restored_carts)} carts from {persistence.path}")
+
+# Store catalog shared with the voice processor, prompts and barcode lookups.
+# Request handlers call get_catalog() so a reload is visible immediately.
+catalog = get_catalog()
+
+# Stock on hand per product; carts hold reservations until checkout commits them
+INITIAL_STOCK = catalog.stock_levels()
+# Single source of cart totals, GST breakdown and discounts (integer paise)
+pricing = PricingEngine()
+promotions = PromotionEngine.load(default_promotions_path(), pricing.categories)
+
+inventory = StockLedger(INITIAL_STOCK, reservation_ttl=int(os.getenv("CART_TTL_SECONDS", "1800")))
+# TEST_INVENTORY=1 is for load tests: checkouts commit stock as usual and then put it
+# back, so a long run keeps measuring real checkouts instead of "Not enough stock"
+TEST_INVENTORY = os.getenv("TEST_INVENTORY") == "1"
+for restored_id, lines in restored_carts.items():
+    for name, _, qty in lines:
+        if inventory.tracks(name):
+            inventory.reserve(restored_id, name, qty)
+
+# Store floor: shelf cells from the catalog grid. STORE_FLOORPLAN may point
+# to a text floorplan ('#' = blocked) for real store layouts.
+STORE_FLOORPLAN = os.getenv("STORE_FLOORPLAN")
+
+def build_store_graph(catalog):
+    if STORE_FLOORPLAN and os.path.exists(STORE_FLOORPLAN):
+        with open(STORE_FLOORPLAN, encoding="utf-8") as f:
+            return StoreGraph.from_floorplan(f.read(), catalog.shelf_locations())
+    return StoreGraph(catalog.rows, catalog.cols, locations=catalog.shelf_locations())
+
+store_graph = build_store_graph(catalog)
 
 # Global voice processor instance
 voice_processor = None
@@ -89,6 +187,216 @@ def initialize_voice_processor():
 # Initialize on startup
 initialize_voice_processor()
 
+# ===== Backend health =====
+# Circuit breakers for remote backends, so a dead one costs nothing per request
+HF_PLACEHOLDER_KEY = "your-huggingface-api-key-here"
+health = HealthMonitor(interval=float(os.getenv("HEALTH_PROBE_INTERVAL", "15")))
+
+def probe_ollama():
+    return requests.get("http://localhost:11434/api/tags", timeout=2).status_code == 200
+
+def probe_huggingface():
+    response = requests.get("https://huggingface.co/api/whoami-v2",
+                            headers={"Authorization": f"Bearer {HF_API_KEY}"}, timeout=5)
+    return response.status_code == 200
+
+def probe_googletrans():
+    return bool(translator.translate("milk", src="en", dest="hi").text)
+
+def probe_translate():
+    from translate import Translator as TextTranslator
+    return bool(TextTranslator(from_lang="en", to_lang="hi").translate("milk"))
+
+def register_backends():
+    ollama = health.register("ollama", probe_ollama, slow_call=20.0)
+    if voice_processor is not None and not voice_processor.ollama_available:
+        ollama.trip("not reachable at startup")
+    huggingface = health.register("huggingface", probe_huggingface, slow_call=15.0)
+    if not HF_AVAILABLE or not hf_client:
+        huggingface.disable("huggingface_hub not installed")
+    elif HF_API_KEY == HF_PLACEHOLDER_KEY:
+        huggingface.disable("HF_API_KEY not set")
+    googletrans = health.register("googletrans", probe_googletrans, slow_call=5.0)
+    if not TRANSLATOR_AVAILABLE:
+        googletrans.disable("googletrans not installed")
+    health.register("translate", probe_translate, slow_call=5.0)
+
+# Text generation goes to the fastest healthy LLM backend, hedged after its p95
+llm_router = LLMRouter(health, hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "2")),
+                       timeout=float(os.getenv("LLM_TIMEOUT", "30")))
+
+def generate_with_huggingface(prompt):
+    # flan-t5 answers short questions, so send just the user's question
+    if "User:" in prompt:
+        prompt = prompt.split("User:")[-1].split("Assistant:")[0].strip()
+    return hf_client.text_generation(
+        f"Question: {prompt}\nAnswer:",
+        model="google/flan-t5-base",
+        max_new_tokens=100,
+        temperature=0.7
+    )
+
+def connect_llm_backends():
+    """Point the health monitor and router at the current voice processor's models"""
+    if HF_AVAILABLE and hf_client:
+        llm_router.add("huggingface", generate_with_huggingface)
+    if voice_processor is None:
+        return
+    voice_processor.health = health
+    voice_processor.router = llm_router
+    llm_router.add("ollama", voice_processor.generate_response_with_ollama, cancellable=True)
+    if voice_processor.llama_model:
+        llm_router.add("llama_local", voice_processor.generate_response_with_local_llama)
+    else:
+        llm_router.remove("llama_local")
+
+# Remote calls made from async endpoints: awaited or run on worker threads,
+# with a concurrency limit per backend so slow LLM calls never stall the event loop
+async_backends = AsyncBackends(health, limits={
+    "huggingface": int(os.getenv("HF_MAX_CONCURRENCY", "4")),
+    "googletrans": int(os.getenv("TRANSLATE_MAX_CONCURRENCY", "8")),
+    "translate": int(os.getenv("TRANSLATE_MAX_CONCURRENCY", "8"))
+}, timeout=float(os.getenv("LLM_TIMEOUT", "30")))
+
+# Identical translation, generation and lookup calls already in flight are shared
+flights = SingleFlight()
+
+def llm_model_key():
+    """Model part of generation keys: answers change with the model and the catalog"""
+    model = voice_processor.ollama_model if voice_processor is not None else "fallback"
+    return f"{model}@{get_catalog().generation}"
+
+async def hf_generate_async(prompt, max_new_tokens=100, temperature=0.7):
+    key = flight_key("huggingface", "en", prompt, f"flan-t5-base/{max_new_tokens}/{temperature}")
+    return await flights.do_async(key, _hf_generate_async, prompt, max_new_tokens, temperature)
+
+async def _hf_generate_async(prompt, max_new_tokens, temperature):
+    client = hf_async_client or hf_client
+    response = await async_backends.call("huggingface", client.text_generation, prompt,
+                                         model="google/flan-t5-base",
+                                         max_new_tokens=max_new_tokens, temperature=temperature)
+    return response.strip()
+
+async def translate_async(text, src, dest):
+    """Translate with googletrans, falling back to the translate package; None if both fail"""
+    return await flights.do_async(flight_key("translate", f"{src}>{dest}", text), _translate_async, text, src, dest)
+
+async def _translate_async(text, src, dest):
+    if TRANSLATOR_AVAILABLE and translator:
+        try:
+            translation = await async_backends.call("googletrans", translator.translate, text, src=src, dest=dest)
+            return translation.text
+        except BackendUnavailable:
+            pass
+        except Exception as e:
+            print(f"googletrans error: {e}")
+    try:
+        from translate import Translator as TextTranslator
+        text_translator = TextTranslator(from_lang=src, to_lang=dest)
+        return await async_backends.call("translate", text_translator.translate, text)
+    except BackendUnavailable:
+        pass
+    except Exception as e:
+        print(f"Translation error: {e}")
+    return None
+
+def translate_sync(text, src, dest):
+    """Translate with the translate package, sharing identical in-flight calls; None on failure"""
+    return flights.do(flight_key("translate", f"{src}>{dest}", text), _translate_sync, text, src, dest)
+
+def _translate_sync(text, src, dest):
+    if not health.available("translate"):
+        return None
+    try:
+        from translate import Translator as TextTranslator
+        text_translator = TextTranslator(from_lang=src, to_lang=dest)
+        with health.track("translate"):
+            return text_translator.translate(text)
+    except Exception as e:
+        print(f"Translation error: {e}")
+        return None
+
+# ===== Admission control =====
+# The AI endpoints get a few slots and a short, bounded queue each; overload is
+# answered from the cheap fallback or with a fast 503, never by queueing more work
+def gate_from_env(name, prefix, limit, queue_size, max_wait, per_key=2):
+    return AdmissionGate(name,
+                         limit=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(limit))),
+                         queue_size=int(os.getenv(f"{prefix}_QUEUE_SIZE", str(queue_size))),
+                         max_wait=float(os.getenv(f"{prefix}_MAX_WAIT", str(max_wait))),
+                         per_key=per_key)
+
+ask_gate = gate_from_env("ask", "ASK", limit=4, queue_size=16, max_wait=3.0)
+voice_command_gate = gate_from_env("voice-command", "VOICE_COMMAND", limit=4, queue_size=8, max_wait=1.0)
+local_voice_gate = gate_from_env("local-voice-process", "LOCAL_VOICE", limit=1, queue_size=2, max_wait=2.0, per_key=1)
+admission_gates = [ask_gate, voice_command_gate, local_voice_gate]
+
+def admission_key(request, cart_id=None):
+    """Fairness key: the cart when the client sends one, otherwise the client address"""
+    if cart_id is not None:
+        return f"cart:{cart_id}"
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+def overloaded_response(e):
+    return JSONResponse(status_code=503, headers={"Retry-After": str(e.retry_after)},
+                        content={"success": False, "error": "Assistant is busy, please try again", "reason": e.reason})
+
+register_backends()
+connect_llm_backends()
+if health.interval > 0:
+    health.start()
+
+# Typo-tolerant search over product names, brands and categories
+def build_product_search(catalog):
+    index = ProductSearchIndex()
+    for product in catalog.products.values():
+        index.add(product.name, product.name, [b for b in (product.brand,) + product.brands if b],
+                  product.category or product.location.split(",")[0],
+                  price=product.label or None, location=product.location)
+    return index
+
+product_search = build_product_search(catalog)
+
+# Native-script and romanized product names in all supported languages (generated offline)
+product_aliases = ProductAliasIndex.load()
+local_answers = VersionedCache()
+
+def describe_local_products(text, language):
+    """Price and location for products named in a query, without translating it"""
+    catalog = get_catalog()
+    key = (text, language)
+    answer = local_answers.get(key, catalog.generation)
+    if answer is None:
+        answers = []
+        for sku, alias in product_aliases.find_all(text, language):
+            product = catalog.get(sku)
+            if product is not None and product.location:
+                answers.append(f"{alias} ({sku}): {product.label}, {product.location}")
+        answer = local_answers.put(key, "; ".join(answers), catalog.generation)
+    return answer or None
+
+@on_catalog_reload
+def apply_catalog(new_catalog):
+    """Rebuild catalog-derived indexes off the request path; the returned step swaps them in"""
+    graph = build_store_graph(new_catalog)
+    search = build_product_search(new_catalog)
+    categories = {name.lower(): category for name, category in new_catalog.categories().items()}
+    # Stock on hand is live data: only products new to the catalog get their opening stock
+    new_stock = {name: qty for name, qty in new_catalog.stock_levels().items() if not inventory.tracks(name)}
+
+    def install():
+        global store_graph, product_search
+        for name, qty in new_stock.items():
+            inventory.restock(name, qty)
+        pricing.categories = categories
+        promotions.categories = categories
+        store_graph, product_search = graph, search
+    return install
+
+# Picks up edits to catalog.json without a restart (CATALOG_WATCH_INTERVAL=0 disables)
+catalog_watcher = start_catalog_watcher()
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
 # ===== Models =====
 class PairRequest(BaseModel):
     code: str
@@ -96,16 +404,18 @@ class PairRequest(BaseModel):
 class AskRequest(BaseModel):
     query: str
     language: str = "en"  # Added language field
+    cartId: Optional[int] = None  # fairness key for admission control
 
 class Item(BaseModel):
     name: str
-    price: float
+    price: Optional[float] = None  # Ignored: checkout prices every line from the catalog
     qty: int
 
 class CheckoutRequest(BaseModel):
-    cart: List[Item]
+    cart: List[Item] = []  # Ignored when the server holds the cart for cartId
     paymentMethod: Optional[str] = "Card"
     email: Optional[str] = None  # Add email field
+    cartId: Optional[int] = None  # Paired trolley / server-side cart
 
 class TranslationRequest(BaseModel):
     text: str
@@ -115,11 +425,30 @@ class TranslationRequest(BaseModel):
 class VoiceRequest(BaseModel):
     text: str
     language: str = "en"
+    cartId: Optional[int] = None
 
 class LlamaConfig(BaseModel):
     model_path: Optional[str] = None
     ollama_model: Optional[str] = None
 
+class GuidanceRequest(BaseModel):
+    message: str
+    type: str = "route_update"
+
+class CartItemRequest(BaseModel):
+    name: str
+    price: Optional[float] = None  # Ignored: the line is priced from the catalog
+    qty: int = 1
+
+class CartQtyRequest(BaseModel):
+    qty: int
+
+class RouteRequest(BaseModel):
+    stops: List[str]
+    start: str = "entrance"
+    optimize: bool = False  # Reorder stops to minimize walking
+    end: Optional[str] = None  # Optional finishing location when optimizing
+
 @app.post("/api/pair")
 def pair_cart(req: PairRequest):
     if req.code.upper() == "SC1234":
@@ -127,60 +456,54 @@ def pair_cart(req: PairRequest):
     return {"success": False, "error": "Invalid code"}
 
 @app.post("/api/ask")
-def ask_ai(req: AskRequest):
+async def ask_ai(req: AskRequest, request: Request):
+    # Only admitted requests take a worker thread; shed ones get the product table or a 503
+    try:
+        async with ask_gate.admit(admission_key(request, req.cartId)):
+            return await run_in_threadpool(answer_question, req)
+    except Overloaded as e:
+        local_answer = describe_local_products(req.query, req.language or "en")
+        if local_answer:
+            return {"response": local_answer, "language": req.language, "degraded": True}
+        return overloaded_response(e)
+
+def answer_question(req):
     # Detect language if not provided
     if not req.language:
-        try:
-            detected_lang = detect(req.query)
-            req.language = detected_lang
-        except:
-            req.language = "en"
+        with stage("ask", "detect"):
+            try:
+                detected_lang = detect(req.query)
+                req.language = detected_lang
+            except:
+                req.language = "en"
     
-    # Translate query to English if needed
+    # Product questions in any language are answered from the local alias table
+    if req.language != "en":
+        key = flight_key("local_answer", req.language, req.query, get_catalog().generation)
+        with stage("ask", "local_answer"):
+            local_answer = flights.do(key, describe_local_products, req.query, req.language)
+        if local_answer:
+            return {"response": local_answer, "language": req.language}
+
+    # Translate query to English if needed (original query if translation fails)
     translated_query = req.query
     if req.language != "en":
-        try:
-            # Try to decode if it's bytes
-            if isinstance(req.query, bytes):
-                req.query = req.query.decode('utf-8')
-            
-            # Use translate library with proper encoding
-            from translate import Translator as TextTranslator
-            text_translator = TextTranslator(from_lang=req.language, to_lang="en")
-            translated_query = text_translator.translate(req.query)
-        except Exception as e:
-            print(f"Translation error: {e}")
-            translated_query = req.query  # Use original query if translation fails
+        # Try to decode if it's bytes
+        if isinstance(req.query, bytes):
+            req.query = req.query.decode('utf-8')
+        with stage("ask", "translate_in"):
+            translated_query = translate_sync(req.query, req.language, "en") or req.query
     
-    # Use Hugging Face model to get AI response if available
-    if HF_AVAILABLE and hf_client:
-        try:
-            # Using a general question-answering model that's more widely supported
-            response = hf_client.text_generation(
-                f"Question: {translated_query}\nAnswer:",
-                model="google/flan-t5-base",  # Using a more widely supported model
-                max_new_tokens=100,
-                temperature=0.7
-            )
-            
-            response_text = response
-        except Exception as e:
-            # Fallback to voice processor if available
-            response_text = get_response_from_voice_processor(translated_query)
-    else:
-        # Fallback to voice processor if available
-        response_text = get_response_from_voice_processor(translated_query)
+    # The router races Hugging Face, Ollama and local LLaMA and falls back to canned answers.
+    # Shoppers asking the same question at the same time share one generation.
+    with stage("ask", "generate"):
+        response_text = flights.do(flight_key("generate", "en", translated_query, llm_model_key()),
+                                   generate_answer, translated_query)
     
-    # Translate response back to original language if needed
+    # Translate response back to original language (English if translation fails)
     if req.language != "en":
-        try:
-            # Use translate library with proper encoding
-            from translate import Translator as TextTranslator
-            text_translator = TextTranslator(from_lang="en", to_lang=req.language)
-            response_text = text_translator.translate(response_text)
-        except Exception as e:
-            print(f"Response translation error: {e}")
-            # Keep English response if translation fails
+        with stage("ask", "translate_out"):
+            response_text = translate_sync(response_text, "en", req.language) or response_text
     
     # Ensure proper encoding for response
     if isinstance(response_text, bytes):
@@ -188,6 +511,11 @@ def ask_ai(req: AskRequest):
     
     return {"response": response_text, "language": req.language}
 
+def generate_answer(query):
+    if VOICE_PROCESSOR_AVAILABLE and voice_processor:
+        return get_response_from_voice_processor(query)
+    return llm_router.generate(f"User: {query}\nAssistant:") or get_response_from_voice_processor(query)
+
 # Hugging Face powered multilingual endpoint
 @app.post("/api/ai-assist-multilingual")
 async def ai_assist_multilingual(req: AskRequest):
@@ -196,27 +524,18 @@ async def ai_assist_multilingual(req: AskRequest):
     """
     # Detect language if not provided
     if not req.language:
-        try:
-            detected_lang = detect(req.query)
-            req.language = detected_lang
-        except:
-            req.language = "en"
+        with stage("ai_assist_multilingual", "detect"):
+            try:
+                detected_lang = detect(req.query)
+                req.language = detected_lang
+            except:
+                req.language = "en"
     
-    # Translate query to English for processing
+    # Translate query to English for processing (original query if translation fails)
     translated_query = req.query
     if req.language != "en":
-        try:
-            if TRANSLATOR_AVAILABLE and translator:
-                translation = translator.translate(req.query, src=req.language, dest='en')
-                translated_query = translation.text
-            else:
-                # Fallback to simple approach
-                from translate import Translator as TextTranslator
-                text_translator = TextTranslator(from_lang=req.language, to_lang="en")
-                translated_query = text_translator.translate(req.query)
-        except Exception as e:
-            print(f"Translation error: {e}")
-            translated_query = req.query  # Use original query if translation fails
+        with stage("ai_assist_multilingual", "translate_in"):
+            translated_query = await translate_async(req.query, req.language, "en") or req.query
     
     if HF_AVAILABLE and hf_client:
         # Create prompt for Hugging Face model
@@ -224,14 +543,8 @@ async def ai_assist_multilingual(req: AskRequest):
         
         try:
             # Use Hugging Face model (using a more widely supported model)
-            response = hf_client.text_generation(
-                prompt,
-                model="google/flan-t5-base",
-                max_new_tokens=100,
-                temperature=0.7
-            )
-            
-            answer = response.strip()
+            with stage("ai_assist_multilingual", "generate"):
+                answer = await hf_generate_async(prompt)
         except Exception as e:
             # Fallback response in case of API error
             answer = "I'm here to help with your shopping! Please ask about specific products or shopping advice."
@@ -239,26 +552,82 @@ async def ai_assist_multilingual(req: AskRequest):
         # Fallback to simple response if Hugging Face is not available
         answer = "I'm here to help with your shopping! Please ask about specific products or shopping advice."
     
-    # Translate response back to original language if needed
+    # Translate response back to original language (English if translation fails)
     if req.language != "en":
-        try:
-            if TRANSLATOR_AVAILABLE and translator:
-                translation = translator.translate(answer, src='en', dest=req.language)
-                answer = translation.text
-            else:
-                # Fallback to simple approach
-                from translate import Translator as TextTranslator
-                text_translator = TextTranslator(from_lang="en", to_lang=req.language)
-                answer = text_translator.translate(answer)
-        except Exception as e:
-            print(f"Response translation error: {e}")
-            # Keep English response if translation fails
+        with stage("ai_assist_multilingual", "translate_out"):
+            answer = await translate_async(answer, "en", req.language) or answer
     
     return {"response": answer, "language": req.language}
 
+def commit_inventory(cart_id, quantities):
+    """Commit a checkout's stock; returns the shortages (empty on success)"""
+    shortages = inventory.commit(cart_id, quantities)
+    if TEST_INVENTORY and not shortages:
+        for sku, qty in quantities.items():
+            if inventory.tracks(sku) and qty > 0:
+                inventory.restock(sku, qty)
+    return shortages
+
+def catalog_priced(lines):
+    """
+    Price cart lines from the live catalog, whatever price the client sent
+
+    Args:
+        lines (list): Items or cart snapshot dicts with name and qty
+
+    Returns:
+        tuple: ([Item] priced from the catalog, [names the catalog does not sell])
+    """
+    current = get_catalog()
+    items, unknown = [], []
+    for line in lines:
+        name, qty = (line["name"], line["qty"]) if isinstance(line, dict) else (line.name, line.qty)
+        product = current.get(name)
+        if product is None or product.price is None:
+            unknown.append(name)
+        else:
+            items.append(Item(name=name, price=product.price, qty=qty))
+    return items, unknown
+
 @app.post("/api/checkout")
 def checkout(req: CheckoutRequest):
-    total = sum(item.price * item.qty for item in req.cart)
+    # Prefer the server-side cart; the client's list is only used for names and
+    # quantities when there is none. Prices always come from the catalog.
+    # Stock held by the cart is committed atomically before the cart is emptied
+    priced_cart = []
+
+    def commit_stock(snapshot):
+        items, unknown = catalog_priced(snapshot["items"])
+        if unknown:
+            return {"error": "Unknown product", "unknown": unknown}
+        shortages = commit_inventory(req.cartId, {line["name"]: line["qty"] for line in snapshot["items"]})
+        if shortages:
+            return {"error": "Not enough stock", "shortages": shortages}
+        priced_cart.extend(items)
+        return None
+
+    server_cart = None
+    if req.cartId is not None:
+        with stage("checkout", "commit_stock"):
+            server_cart = cart_store.checkout(req.cartId, validate=commit_stock)
+    if server_cart:
+        if server_cart.get("problems"):
+            return {"success": False, **server_cart["problems"]}
+        req.cart = priced_cart
+    else:
+        if any(item.qty <= 0 for item in req.cart):
+            return {"success": False, "error": "Quantity must be positive"}
+        req.cart, unknown = catalog_priced(req.cart)
+        if unknown:
+            return {"success": False, "error": "Unknown product", "unknown": unknown}
+        with stage("checkout", "commit_stock"):
+            shortages = commit_inventory(req.cartId, {item.name: item.qty for item in req.cart})
+        if shortages:
+            return {"success": False, "error": "Not enough stock", "shortages": shortages}
+    with stage("checkout", "pricing"):
+        promo = promotions.evaluate(req.cart)
+        priced = pricing.price(req.cart, promo.line_discounts, promo.order_discount)
+    total = priced.total / 100
     
     # Process payment based on method with more realistic processing
     payment_success = True
@@ -276,13 +645,15 @@ def checkout(req: CheckoutRequest):
     # Add some realistic processing time simulation
     import time
     import random
-    time.sleep(random.uniform(0.5, 1.5))  # Simulate processing time
+    with stage("checkout", "payment"):
+        time.sleep(random.uniform(0.5, 1.5))  # Simulate processing time
     
     # Send receipt email if email is provided
     email_status = "Payment successful"
     if req.email:
         try:
-            email_sent = send_receipt_email(req.email, req.cart, total, req.paymentMethod)
+            with stage("checkout", "email"):
+                email_sent = send_receipt_email(req.email, priced, req.paymentMethod)
             if email_sent:
                 email_status = "Receipt sent to your email"
             else:
@@ -291,18 +662,30 @@ def checkout(req: CheckoutRequest):
             print(f"Failed to send email: {e}")
             email_status = "Payment successful (email delivery failed)"
     
+    with stage("checkout", "record_order"):
+        persistence.record_order(req.cartId, priced.total, req.paymentMethod, req.email, priced.lines())
+    
+    if req.cartId is not None:
+        cart_channels.publish(req.cartId, "checkout_ready", f"{message}. Total: Rs. {total:.2f}", total=total)
+    
     return {
         "success": payment_success,
         "message": message,
         "total": total,
+        "pricing": priced.summary(),
+        "promotions": promo.applied,
         "paymentMethod": req.paymentMethod,
         "email_status": email_status
     }
 
-def send_receipt_email(email, cart, total, payment_method):
+def send_receipt_email(email, priced, payment_method):
     """
     Send receipt email to customer
+
+    Args:
+        priced (PricedCart): Priced cart; line and GST figures come from it
     """
+    total = priced.total / 100
     import random
     import time
     
@@ -353,8 +736,7 @@ def send_receipt_email(email, cart, total, payment_method):
               </tr>
         '''
         
-        for item in cart:
-            item_total = item.price * item.qty
+        for line in priced.lines():
             html += '''
               <tr>
                 <td>{}</td>
@@ -362,10 +744,17 @@ def send_receipt_email(email, cart, total, payment_method):
                 <td>Rs. {:.2f}</td>
                 <td>Rs. {:.2f}</td>
               </tr>
-            '''.format(item.name, item.qty, item.price, item_total)
+            '''.format(line["name"], line["qty"], line["price"], line["total"])
         
+        summary = priced.summary()
         html += '''
             </table>
+            <p>Includes GST: {}</p>
+        '''.format(", ".join(f"{rate}: Rs. {amount:.2f}" for rate, amount in summary["gstByRate"].items()) or "Rs. 0.00")
+        if summary["discount"]:
+            html += "<p>You saved: Rs. {:.2f}</p>".format(summary["discount"])
+        
+        html += '''
             <h3>Total: Rs. {:.2f}</h3>
             <p>Payment Method: {}</p>
             <p>Transaction ID: TXN{}</p>
@@ -399,6 +788,209 @@ def send_receipt_email(email, cart, total, payment_method):
         print(f"=====================")
         return False
 
+# ===== Server-side carts =====
+def touch_holds(cart_id, cart):
+    """Keep the stock held by an active cart for as long as the cart itself lives"""
+    if cart is not None:
+        inventory.touch(cart_id, [line["name"] for line in cart["items"]])
+    return cart
+
+@app.get("/api/cart/{cart_id}")
+def get_cart(cart_id: str):
+    cart = touch_holds(cart_id, cart_store.get(cart_id))
+    if cart is None:
+        return {"success": False, "error": "Unknown cart"}
+    return {"success": True, **cart}
+
+@app.post("/api/cart/{cart_id}/items")
+def add_cart_item(cart_id: str, req: CartItemRequest):
+    if req.qty <= 0:
+        return {"success": False, "error": "Quantity must be positive"}
+    product = get_catalog().get(req.name)
+    if product is None or product.price is None:
+        return {"success": False, "error": f"Unknown product: {req.name}"}
+    sku = normalize_sku(req.name)
+
+    def hold_stock():
+        # Runs under the cart lock, so a concurrent checkout can't commit around this hold
+        if inventory.tracks(sku) and not inventory.reserve(cart_id, sku, req.qty):
+            return {"error": "Not enough stock", "available": inventory.available(sku)}
+        return None
+
+    # The shelf price comes from the catalog; a price sent by the client is ignored
+    cart = cart_store.add_item(cart_id, sku, product.price, req.qty, reserve=hold_stock)
+    if cart.get("problems"):
+        return {"success": False, **cart["problems"]}
+    return {"success": True, **touch_holds(cart_id, cart)}
+
+@app.put("/api/cart/{cart_id}/items/{name}")
+def update_cart_item(cart_id: str, name: str, req: CartQtyRequest):
+    sku = normalize_sku(name)
+
+    def hold_stock():
+        if inventory.tracks(sku) and not inventory.set_reserved(cart_id, sku, max(req.qty, 0)):
+            return {"error": "Not enough stock", "available": inventory.available(sku)}
+        return None
+
+    cart = cart_store.update_item(cart_id, sku, req.qty, reserve=hold_stock)
+    if cart is not None and cart.get("problems"):
+        return {"success": False, **cart["problems"]}
+    if cart is None or not any(line["name"] == sku for line in cart["items"]):
+        inventory.release(cart_id, sku)
+    if cart is None:
+        return {"success": False, "error": "Unknown cart"}
+    return {"success": True, **touch_holds(cart_id, cart)}
+
+@app.delete("/api/cart/{cart_id}/items/{name}")
+def remove_cart_item(cart_id: str, name: str):
+    sku = normalize_sku(name)
+    inventory.release(cart_id, sku)
+    cart = cart_store.remove_item(cart_id, sku)
+    if cart is None:
+        return {"success": False, "error": "Unknown cart"}
+    return {"success": True, **touch_holds(cart_id, cart)}
+
+@app.get("/api/inventory")
+def inventory_levels():
+    inventory.expire()
+    return {"stock": inventory.snapshot(), "stats": inventory.stats(), "testInventory": TEST_INVENTORY}
+
+# ===== Store routing =====
+@app.post("/api/route")
+def store_route(req: RouteRequest):
+    """Directions from start through each stop, in list order or optimized"""
+    legs = []
+    graph = store_graph  # one snapshot for the whole request, even across a reload
+    position = req.start.lower()
+    if position not in graph.locations:
+        return JSONResponse(status_code=400, content={"success": False, "error": f"Unknown start location: {req.start}"})
+    if req.optimize:
+        end = req.end.lower() if req.end else None
+        try:
+            plan = plan_route(graph, position, req.stops, end=end)
+        except ValueError as e:
+            # Unknown or unreachable end: the request can't be planned as given
+            return JSONResponse(status_code=400, content={"success": False, "error": str(e)})
+        legs = [{"item": leg["item"], "found": True, "path": leg["path"]} for leg in plan["legs"]]
+        legs += [{"item": item, "found": False, "path": []} for item in plan["unknown"]]
+        return {"success": True, "legs": legs, "steps": plan["steps"], "order": plan["order"], "method": plan["method"]}
+    for stop in req.stops:
+        name = stop.lower()
+        path = graph.route(position, name)
+        legs.append({"item": stop, "found": path is not None, "path": path or []})
+        if path is not None:
+            position = name
+    return {"success": True, "legs": legs, "steps": sum(len(leg["path"]) for leg in legs)}
+
+@app.get("/api/products/search")
+def search_products(q: str, limit: int = 10, language: Optional[str] = None):
+    limit = max(1, min(limit, 50))
+    index = product_search
+    results = index.search(q, limit=limit)
+    # Names in other languages ("doodh", "பால்") resolve through the alias table
+    for sku, _ in reversed(product_aliases.find_all(q, language)):
+        if sku in index.documents:
+            display = index.documents[sku][0]
+            results = [{**display, "score": 1.0}] + [r for r in results if r["id"] != sku]
+    return {"query": q, "results": results[:limit]}
+
+# ===== Metrics =====
+def per_backend(key):
+    return lambda: {name: counters[key] for name, counters in llm_router.counters.items()}
+
+def per_gate(key):
+    return lambda: {gate.name: gate.stats()[key] for gate in admission_gates}
+
+metrics.counter_callback("llm_backend_calls_total", "LLM calls started per backend", per_backend("calls"), ("backend",))
+metrics.counter_callback("llm_backend_wins_total", "LLM answers served per backend", per_backend("wins"), ("backend",))
+metrics.counter_callback("llm_backend_errors_total", "Failed LLM calls per backend", per_backend("errors"), ("backend",))
+metrics.counter_callback("llm_hedges_total", "Hedged LLM requests", lambda: llm_router.hedges)
+metrics.counter_callback("llm_hedge_wins_total", "Hedged requests won by the hedge", lambda: llm_router.hedge_wins)
+metrics.counter_callback("llm_failovers_total", "LLM requests that failed over", lambda: llm_router.failovers)
+metrics.gauge_callback("backend_circuit_open", "1 while a backend's circuit breaker is not closed",
+                       lambda: {name: int(b.state != "closed") for name, b in health.breakers.items()}, ("backend",))
+metrics.gauge_callback("backend_latency_p95_seconds", "Rolling p95 latency per backend",
+                       lambda: {name: b.percentile(95) for name, b in health.breakers.items()}, ("backend",))
+metrics.counter_callback("single_flight_calls_total", "Coalescable calls per operation",
+                         lambda: {op: c["calls"] for op, c in flights.stats()["operations"].items()}, ("operation",))
+metrics.counter_callback("single_flight_coalesced_total", "Calls served by an identical in-flight call",
+                         lambda: {op: c["coalesced"] for op, c in flights.stats()["operations"].items()}, ("operation",))
+metrics.counter_callback("local_answer_cache_total", "Local product answer cache lookups",
+                         lambda: {"hit": local_answers.hits, "miss": local_answers.misses}, ("result",))
+metrics.gauge_callback("admission_active", "Requests running per AI endpoint", per_gate("active"), ("endpoint",))
+metrics.gauge_callback("admission_waiting", "Requests queued per AI endpoint", per_gate("waiting"), ("endpoint",))
+metrics.counter_callback("admission_shed_total", "Requests shed per AI endpoint and reason",
+                         lambda: {(gate.name, reason): gate.counters[f"shed_{reason}"] for gate in admission_gates
+                                  for reason in ("queue_full", "timeout", "per_key")}, ("endpoint", "reason"))
+metrics.gauge_callback("websocket_connections", "Open cart WebSocket connections", lambda: cart_channels.stats()["connections"])
+metrics.gauge_callback("persistence_pending_writes", "Writes queued for the database", lambda: persistence.stats()["pending"])
+metrics.gauge_callback("model_load_seconds", "Time taken to load each local model",
+                       lambda: dict(voice_processor.load_times) if voice_processor is not None else {}, ("model",))
+metrics.gauge_callback("catalog_generation", "Live catalog generation", lambda: get_catalog().generation)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/health/backends")
+def backend_health():
+    """Circuit breaker state, recent latency and next probe per remote backend"""
+    status = health.status()
+    for name, counters in async_backends.stats().items():
+        if name in status:
+            status[name]["async"] = counters
+    return status
+
+@app.get("/api/health/admission")
+def admission_stats():
+    """Slots in use, queue depth and shed counts per AI endpoint"""
+    return {gate.name: gate.stats() for gate in admission_gates}
+
+@app.get("/api/health/single-flight")
+def single_flight_stats():
+    """Calls executed vs. coalesced onto an identical in-flight call, per operation"""
+    return flights.stats()
+
+@app.get("/api/health/llm")
+def llm_routing_stats():
+    """Per-backend p50/p95, wins and cancellations, and how often hedged requests win"""
+    return llm_router.stats()
+
+# ===== Catalog administration =====
+@app.get("/api/admin/catalog")
+def catalog_status():
+    status = get_catalog().stats()
+    if catalog_watcher is not None:
+        status["watcher"] = {"interval": catalog_watcher.interval, "reloads": catalog_watcher.reloads,
+                             "errors": catalog_watcher.errors}
+    return status
+
+@app.post("/api/admin/catalog")
+def upload_catalog(data: dict, x_admin_token: Optional[str] = Header(None)):
+    """Replace the catalog with an uploaded catalog.json; served requests are never paused"""
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        return {"success": False, "error": "Admin token required"}
+    try:
+        new_catalog = save_catalog(data)
+    except (ValueError, OSError) as e:
+        return {"success": False, "error": str(e)}
+    return {"success": True, **new_catalog.stats()}
+
+@app.post("/api/admin/catalog/reload")
+def reload_catalog_file(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        return {"success": False, "error": "Admin token required"}
+    try:
+        new_catalog = reload_catalog()
+    except (ValueError, OSError, KeyError) as e:
+        return {"success": False, "error": str(e)}
+    return {"success": True, **new_catalog.stats()}
+
+@app.get("/api/orders")
+def list_orders(limit: int = 20):
+    return {"orders": persistence.recent_orders(min(limit, 100))}
+
 # Language detection endpoint
 @app.post("/api/detect-language")
 async def detect_language(req: TranslationRequest):
@@ -427,10 +1019,10 @@ async def translate_text(req: TranslationRequest):
         else:
             source_lang = req.source_lang
             
-        # Translate text
+        # Translate text on a worker thread
         from translate import Translator as TextTranslator
         text_translator = TextTranslator(from_lang=source_lang, to_lang=req.target_lang)
-        translated_text = text_translator.translate(req.text)
+        translated_text = await async_backends.call("translate", text_translator.translate, req.text)
         
         # Ensure proper encoding for response
         if isinstance(translated_text, bytes):
@@ -465,11 +1057,13 @@ def get_language_name(lang_code):
 @app.websocket("/ws/cart/{cart_id}")
 async def cart_ws(websocket: WebSocket, cart_id: int):
     await websocket.accept()
-    await websocket.send_text(f"Connected to cart {cart_id}")
-    await websocket.send_text("Head to Aisle 3 for Bread")
-    await websocket.send_text("Proceed to Aisle 7 for Milk")
-    await websocket.send_text("Checkout lane ready")
-    await websocket.close()
+    await cart_channels.serve(websocket, cart_id)
+
+# Push guidance (e.g. route updates from the navigation system) to a cart's sockets
+@app.post("/api/cart/{cart_id}/guidance")
+async def push_cart_guidance(cart_id: int, req: GuidanceRequest):
+    cart_channels.publish(cart_id, req.type, req.message)
+    return {"success": True, "channel": cart_channels.stats()}
 
 # ===== Voice Command Processing =====
 # Define command patterns for different actions
@@ -490,8 +1084,18 @@ COMMAND_PATTERNS = {
     "help": ["help", "assist", "support", "what can you do"]
 }
 
+# Local intent classifier; the LLM is only consulted below this confidence
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.5"))
+intent_classifier = IntentClassifier.from_patterns(
+    COMMAND_PATTERNS,
+    log_path=os.getenv("COMMAND_LOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "command_log.jsonl"))
+)
+
+# Per-language command phrases matched before any translation
+command_lexicon = CommandLexicon.from_patterns(COMMAND_PATTERNS)
+
 @app.post("/api/voice-command")
-async def process_voice_command(req: VoiceRequest):
+async def process_voice_command(req: VoiceRequest, request: Request):
     """
     Process voice commands using pattern matching with Hugging Face fallback
     """
@@ -499,17 +1103,27 @@ async def process_voice_command(req: VoiceRequest):
         # Normalize the text
         text = req.text.lower().strip()
         
-        # If language is not English, translate to English for processing
+        # Match native-language commands directly so they never wait on a translator
         processed_text = text
-        if req.language != "en":
-            try:
-                translator = TextTranslator(from_lang=req.language, to_lang="en")
-                processed_text = translator.translate(text).lower().strip()
-            except:
-                pass
+        lexicon_intent = command_lexicon.match(text, req.language) if req.language != "en" else None
+        
+        # If language is not English, translate to English for processing
+        if req.language != "en" and not lexicon_intent:
+            with stage("voice_command", "translate_in"):
+                translated = await translate_async(text, req.language, "en")
+            if translated:
+                processed_text = translated.lower().strip()
         
-        # Try to use Hugging Face for command classification if available
-        if HF_AVAILABLE and hf_client:
+        # Classify locally first; only fall back to the LLM for low-confidence commands
+        if lexicon_intent:
+            intent, confidence = lexicon_intent, 1.0
+        else:
+            with stage("voice_command", "classify"):
+                intent, confidence = intent_classifier.predict(processed_text)
+        if confidence >= INTENT_CONFIDENCE_THRESHOLD:
+            response_data = build_command_response(intent, processed_text)
+            response_data["confidence"] = round(confidence, 3)
+        elif HF_AVAILABLE and hf_client:
             try:
                 # Create a prompt for the Hugging Face model to determine the action
                 prompt = f"""
@@ -521,16 +1135,14 @@ async def process_voice_command(req: VoiceRequest):
                 Category:
                 """
                 
-                # Get response from Hugging Face model
-                response = hf_client.text_generation(
-                    prompt,
-                    model="google/flan-t5-base",
-                    max_new_tokens=20,
-                    temperature=0.3  # Low temperature for more deterministic responses
-                )
+                # Get response from Hugging Face model (low temperature for more deterministic responses)
+                # Overloaded falls through to pattern matching below
+                async with voice_command_gate.admit(admission_key(request, req.cartId)):
+                    with stage("voice_command", "llm_fallback"):
+                        response = await hf_generate_async(prompt, max_new_tokens=20, temperature=0.3)
                 
                 # Extract the category from the response
-                category = response.strip().lower()
+                category = response.lower()
                 
                 # Determine the appropriate response based on category
                 if "movement" in category:
@@ -561,6 +1173,9 @@ async def process_voice_command(req: VoiceRequest):
                     response_data = {"action": "product_info", "product": processed_text, "message": f"Getting information about {processed_text}"}
                 else:
                     response_data = {"action": "unknown", "message": "Sorry, I didn't understand that command. Say 'help' for available commands."}
+                
+                # Remember what the LLM decided so the local classifier learns it
+                intent_classifier.log_command(processed_text, intent_from_response(response_data))
                     
             except Exception as e:
                 # Fallback to pattern matching if Hugging Face fails
@@ -571,11 +1186,12 @@ async def process_voice_command(req: VoiceRequest):
         
         # Translate response back to original language if needed
         if req.language != "en":
-            try:
-                translator = TextTranslator(from_lang="en", to_lang=req.language)
-                response_data["message"] = translator.translate(response_data["message"])
-            except:
-                pass
+            localized = command_lexicon.message(intent_from_response(response_data), req.language)
+            if localized:
+                response_data["message"] = localized
+            else:
+                response_data["message"] = await translate_async(response_data["message"], "en", req.language) or \
+                    response_data["message"]
         
         return response_data
     except Exception as e:
@@ -613,10 +1229,18 @@ def process_command_with_patterns(text):
 
 # ===== Local LLM Voice Processing =====
 @app.post("/api/local-voice-process")
-async def local_voice_process(duration: int = 5):
+async def local_voice_process(request: Request, duration: int = 5, cart_id: Optional[int] = None):
     """
     Process voice using local Whisper, LLaMA, and Indic-TTS
     """
+    # Recording and Whisper are CPU-bound: one at a time, on a worker thread
+    try:
+        async with local_voice_gate.admit(admission_key(request, cart_id)):
+            return await run_in_threadpool(process_recorded_voice, duration)
+    except Overloaded as e:
+        return overloaded_response(e)
+
+def process_recorded_voice(duration):
     global voice_processor
     
     if not VOICE_PROCESSOR_AVAILABLE or not voice_processor:
@@ -674,6 +1298,7 @@ async def configure_llama(config: LlamaConfig):
             llama_model_path=config.model_path,
             ollama_model=config.ollama_model or "llama3:8b"
         )
+        connect_llm_backends()
         
         # Set environment variables for future use
         if config.model_path:
@@ -707,54 +1332,7 @@ def get_response_from_voice_processor(query):
     if VOICE_PROCESSOR_AVAILABLE and voice_processor:
         try:
             # Enhanced prompt with built-in knowledge for shopping context
-            prompt = f"""You are a smart shopping trolley assistant with built-in knowledge of a supermarket.
-Store layout:
-- Aisle 1: Entrance, Bakery, Fresh Produce
-- Aisle 2: Dairy, Eggs, Cheese
-- Aisle 3: Meat, Poultry, Seafood
-- Aisle 4: Canned Goods, Pasta, Rice
-- Aisle 5: Beverages, Snacks
-- Aisle 6: Frozen Foods
-- Aisle 7: Personal Care, Cleaning Supplies
-- Aisle 8: Checkout
-
-Product information:
-- Milk: $3.99, Brand: Happy Cow Dairy, Location: Aisle 2, Shelf B
-- Bread: $2.49, Brand: Golden Grain, Location: Aisle 1, Shelf A
-- Apples: $1.99/lb, Organic available, Location: Aisle 1, Shelf C
-- Eggs: $2.99, Brand: Farm Fresh, Location: Aisle 2, Shelf A
-- Cheese: $4.99, Brand: Alpine Cheese, Location: Aisle 2, Shelf C
-- Chicken: $5.99/lb, Type: Boneless breast, Location: Aisle 3, Shelf B
-- Pasta: $1.49, Brand: Italiano, Location: Aisle 4, Shelf A
-- Cereal: $3.49, Brand: Healthy Start, Location: Aisle 4, Shelf B
-- Soda: $1.29, Brand: Fizz Cola, Location: Aisle 5, Shelf A
-- Chips: $2.99, Brand: Crunchy Snacks, Location: Aisle 5, Shelf C
-- Ice Cream: $4.49, Brand: Creamy Delight, Location: Aisle 6, Shelf A
-- Shampoo: $5.99, Brand: Silky Hair, Location: Aisle 7, Shelf B
-- Toothpaste: $2.49, Brand: Bright Smile, Location: Aisle 7, Shelf A
-- Organic Bananas: $0.69/lb, Location: Aisle 1, Shelf C
-- Whole Wheat Bread: $2.49, Brand: Golden Grain, Location: Aisle 1, Shelf A
-- Farm Fresh Eggs: $3.99 (12 count), Location: Aisle 2, Shelf A
-- Almond Milk: $3.79 (1 gallon), Location: Aisle 2, Shelf B
-- Greek Yogurt: $5.99 (32 oz), Location: Aisle 2, Shelf C
-- Organic Spinach: $3.49 (16 oz), Location: Aisle 1, Shelf B
-- Grass-Fed Ground Beef: $8.99/lb, Location: Aisle 3, Shelf A
-- Atlantic Salmon Fillet: $12.99/lb, Location: Aisle 3, Shelf C
-- Organic Brown Rice: $3.99 (2 lbs), Location: Aisle 4, Shelf B
-- Extra Virgin Olive Oil: $9.99 (16 oz), Location: Aisle 4, Shelf C
-- Organic Coffee Beans: $14.99 (12 oz), Location: Aisle 1, Shelf D
-- Dark Chocolate: $2.99 (85%, 3.5 oz), Location: Aisle 5, Shelf B
-- Organic Quinoa: $4.99 (12 oz), Location: Aisle 4, Shelf A
-- Himalayan Pink Salt: $5.99 (26 oz), Location: Aisle 7, Shelf C
-- Coconut Water: $14.99 (11.2 oz, 12 pack), Location: Aisle 5, Shelf A
-- Organic Green Tea: $4.49 (20 count), Location: Aisle 1, Shelf E
-- Protein Powder: $29.99 (Vanilla, 2 lbs), Location: Aisle 6, Shelf B
-- Natural Peanut Butter: $4.99 (16 oz), Location: Aisle 4, Shelf D
-- Organic Tomato Sauce: $2.99 (24 oz), Location: Aisle 4, Shelf E
-- Gluten-Free Pasta: $2.49 (12 oz), Location: Aisle 4, Shelf F
-
-User: {query}
-Assistant:"""
+            prompt = f"{get_catalog().prompt_context()}\n\nUser: {query}\nAssistant:"
             
             # Try to get response from Ollama
             response_text = voice_processor.generate_response(prompt)
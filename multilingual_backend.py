@@ -3,7 +3,7 @@ Multilingual Voice Integration and Trolley Control Backend
 Supports 10 Indian languages including English
 """
 
-from fastapi import FastAPI, WebSocket, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
@@ -13,6 +13,9 @@ from translate import Translator as TextTranslator
 from langdetect import detect
 import json
 import re
+from intent_classifier import IntentClassifier, build_command_response, intent_from_response
+from command_lexicon import CommandLexicon
+from trolley_control import TrolleyControlHub
 
 # Try to import Hugging Face, but provide fallback if not available
 try:
@@ -42,9 +45,6 @@ SUPPORTED_LANGUAGES = {
     "pa": "Punjabi"
 }
 
-# Shopping cart
-cart = []
-
 # Define command patterns for different actions
 COMMAND_PATTERNS = {
     "movement": {
@@ -63,6 +63,16 @@ COMMAND_PATTERNS = {
     "help": ["help", "assist", "support", "what can you do"]
 }
 
+# Local intent classifier; the LLM is only consulted below this confidence
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.5"))
+intent_classifier = IntentClassifier.from_patterns(
+    COMMAND_PATTERNS,
+    log_path=os.getenv("COMMAND_LOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "command_log.jsonl"))
+)
+
+# Per-language command phrases matched before any translation
+command_lexicon = CommandLexicon.from_patterns(COMMAND_PATTERNS)
+
 class VoiceRequest(BaseModel):
     text: str
     language: str = "en"
@@ -121,17 +131,27 @@ async def process_voice_command(req: VoiceRequest):
         # Normalize the text
         text = req.text.lower().strip()
         
-        # If language is not English, translate to English for processing
+        # Match native-language commands directly so they never wait on a translator
         processed_text = text
-        if req.language != "en":
+        lexicon_intent = command_lexicon.match(text, req.language) if req.language != "en" else None
+        
+        # If language is not English, translate to English for processing
+        if req.language != "en" and not lexicon_intent:
             try:
                 translator = TextTranslator(from_lang=req.language, to_lang="en")
                 processed_text = translator.translate(text).lower().strip()
             except:
                 pass
         
-        # Try to use Hugging Face for command classification if available
-        if HF_AVAILABLE and hf_client:
+        # Classify locally first; only fall back to the LLM for low-confidence commands
+        if lexicon_intent:
+            intent, confidence = lexicon_intent, 1.0
+        else:
+            intent, confidence = intent_classifier.predict(processed_text)
+        if confidence >= INTENT_CONFIDENCE_THRESHOLD:
+            response_data = build_command_response(intent, processed_text)
+            response_data["confidence"] = round(confidence, 3)
+        elif HF_AVAILABLE and hf_client:
             try:
                 # Create a prompt for the Hugging Face model to determine the action
                 prompt = f"""
@@ -183,6 +203,9 @@ async def process_voice_command(req: VoiceRequest):
                     response_data = {"action": "product_info", "product": processed_text, "message": f"Getting information about {processed_text}"}
                 else:
                     response_data = {"action": "unknown", "message": "Sorry, I didn't understand that command. Say 'help' for available commands."}
+                
+                # Remember what the LLM decided so the local classifier learns it
+                intent_classifier.log_command(processed_text, intent_from_response(response_data))
                     
             except Exception as e:
                 # Fallback to pattern matching if Hugging Face fails
@@ -193,11 +216,15 @@ async def process_voice_command(req: VoiceRequest):
         
         # Translate response back to original language if needed
         if req.language != "en":
-            try:
-                translator = TextTranslator(from_lang="en", to_lang=req.language)
-                response_data["message"] = translator.translate(response_data["message"])
-            except:
-                pass
+            localized = command_lexicon.message(intent_from_response(response_data), req.language)
+            if localized:
+                response_data["message"] = localized
+            else:
+                try:
+                    translator = TextTranslator(from_lang="en", to_lang=req.language)
+                    response_data["message"] = translator.translate(response_data["message"])
+                except:
+                    pass
         
         return response_data
     except Exception as e:
@@ -244,19 +271,36 @@ async def trolley_control(cmd: TrolleyCommand):
     except Exception as e:
         return {"action": "error", "message": f"Error controlling trolley: {str(e)}"}
 
+def resolve_command_locally(text, language="en"):
+    """Resolve a control command without translation or LLM calls (None if unsure)"""
+    intent = command_lexicon.match(text, language) if language != "en" else None
+    if intent:
+        return intent
+    intent, confidence = intent_classifier.predict(text.lower().strip())
+    return intent if confidence >= INTENT_CONFIDENCE_THRESHOLD else None
+
+# Persistent control channels, one controller per connection
+trolley_hub = TrolleyControlHub(resolve_text=resolve_command_locally)
+
 # WebSocket endpoint for real-time communication
 @app.websocket("/ws/trolley/{trolley_id}")
 async def trolley_websocket(websocket: WebSocket, trolley_id: int):
     await websocket.accept()
     try:
-        while True:
-            data = await websocket.receive_text()
-            # Process the received data
-            response = {"status": "received", "data": data}
-            await websocket.send_json(response)
+        await trolley_hub.controller(trolley_id).serve(websocket.receive_text, websocket.send_text)
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         await websocket.close()
 
+# Control channel latency per trolley
+@app.get("/api/trolley/{trolley_id}/latency")
+async def trolley_latency(trolley_id: int):
+    stats = trolley_hub.stats(trolley_id)
+    if stats is None:
+        return {"error": "Unknown trolley"}
+    return stats
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
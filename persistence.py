@@ -0,0 +1,209 @@
+"""
+Persistence Module
+Durable cart and order storage on SQLite in WAL mode.
+Writes are queued and committed by a background writer in batched
+transactions, so request handlers never wait on disk syncs. If a batch
+fails, its writes are retried one at a time in queue order; a write that
+keeps failing is retried on later batches and only dropped after several
+attempts. Reads use parameterized statements from SQLite's per-connection
+statement cache.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cart_lines (
+    cart_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    unit_price INTEGER NOT NULL,
+    qty INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (cart_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cart_id TEXT,
+    total INTEGER NOT NULL,
+    payment_method TEXT,
+    email TEXT,
+    items TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_cart ON orders (cart_id);
+"""
+
+UPSERT_LINE = ("INSERT INTO cart_lines (cart_id, name, unit_price, qty, updated_at) VALUES (?, ?, ?, ?, ?) "
+               "ON CONFLICT (cart_id, name) DO UPDATE SET unit_price = excluded.unit_price, "
+               "qty = excluded.qty, updated_at = excluded.updated_at")
+DELETE_LINE = "DELETE FROM cart_lines WHERE cart_id = ? AND name = ?"
+CLEAR_CART = "DELETE FROM cart_lines WHERE cart_id = ?"
+INSERT_ORDER = ("INSERT INTO orders (cart_id, total, payment_method, email, items, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)")
+SELECT_LINES = "SELECT cart_id, name, unit_price, qty FROM cart_lines ORDER BY cart_id, updated_at"
+SELECT_ORDERS = "SELECT id, cart_id, total, payment_method, email, items, created_at FROM orders ORDER BY id DESC LIMIT ?"
+
+
+class Persistence:
+    def __init__(self, path, batch_size=256, flush_interval=0.05, retry_interval=1.0, max_attempts=5):
+        """
+        Open (or create) the database and start the background writer
+
+        Args:
+            path (str): SQLite database file
+            batch_size (int): Max queued writes committed in one transaction
+            flush_interval (float): Seconds the writer waits to fill a batch
+            retry_interval (float): Seconds between retries of failed writes
+            max_attempts (int): Attempts before a failing write is dropped
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.max_attempts = max_attempts
+        self.batches = 0
+        self.writes = 0
+        self.dropped = 0
+        self._pending = []  # [sql, params, attempts] that failed, oldest first
+        self._queue = queue.Queue()
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        # One read connection per thread; WAL lets reads run alongside the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ----- write-behind API (non-blocking) -----
+    def save_line(self, cart_id, name, unit_price, qty):
+        """Upsert a cart line (unit_price in paise); qty <= 0 deletes it"""
+        if qty <= 0:
+            self._queue.put((DELETE_LINE, (str(cart_id), name)))
+        else:
+            self._queue.put((UPSERT_LINE, (str(cart_id), name, unit_price, qty, time.time())))
+
+    def clear_cart(self, cart_id):
+        self._queue.put((CLEAR_CART, (str(cart_id),)))
+
+    def record_order(self, cart_id, total, payment_method, email, items):
+        """
+        Queue a completed order
+
+        Args:
+            total (int): Order total in paise
+            items (list): Line item dicts (name, price, qty)
+        """
+        self._queue.put((INSERT_ORDER, (None if cart_id is None else str(cart_id), total, payment_method,
+                                        email, json.dumps(items, ensure_ascii=False), time.time())))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far has been written; False if some writes are awaiting retry"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout) and not self._pending
+
+    def close(self, timeout=10.0):
+        """Commit everything still queued, then stop the writer"""
+        self._queue.put(None)
+        self._writer.join(timeout)
+        if self._writer.is_alive():
+            print(f"Persistence writer still busy after {timeout}s; {self._queue.qsize()} writes queued")
+        elif self._pending:
+            print(f"Persistence closed with {len(self._pending)} writes that could not be committed")
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            try:
+                # With failed writes pending, wake up to retry them even if nothing new arrives
+                batch = [self._queue.get(timeout=self.retry_interval) if self._pending else self._queue.get()]
+            except queue.Empty:
+                batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while batch and len(batch) < self.batch_size and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = self._pending + [[op[0], op[1], 0] for op in batch if isinstance(op, tuple)]
+            self._pending = self._commit(conn, writes) if writes else []
+            for op in batch:
+                if isinstance(op, threading.Event):
+                    op.set()
+            if batch and batch[-1] is None:
+                conn.close()
+                return
+
+    def _commit(self, conn, writes):
+        """
+        Commit writes in one transaction, falling back to one at a time
+
+        Returns:
+            list: Writes to retry later: the first one that failed and everything after it,
+                so cart lines are never applied out of order
+        """
+        try:
+            with conn:
+                for sql, params, _ in writes:
+                    conn.execute(sql, params)
+            self.batches += 1
+            self.writes += len(writes)
+            return []
+        except sqlite3.Error as e:
+            print(f"Persistence batch failed ({len(writes)} writes), retrying one at a time: {e}")
+        for position, write in enumerate(writes):
+            try:
+                with conn:
+                    conn.execute(write[0], write[1])
+                self.writes += 1
+            except sqlite3.Error as e:
+                write[2] += 1
+                if write[2] < self.max_attempts:
+                    return writes[position:]
+                self.dropped += 1
+                print(f"Persistence dropped a write after {write[2]} attempts: {e}")
+        return []
+
+    # ----- reads -----
+    def load_carts(self):
+        """
+        Read every persisted cart for startup recovery
+
+        Returns:
+            dict: {cart_id: [(name, unit_price, qty), ...]}
+        """
+        carts = {}
+        for cart_id, name, unit_price, qty in self._reader().execute(SELECT_LINES):
+            carts.setdefault(cart_id, []).append((name, unit_price, qty))
+        return carts
+
+    def recent_orders(self, limit=20):
+        rows = self._reader().execute(SELECT_ORDERS, (limit,)).fetchall()
+        return [
+            {"id": row[0], "cartId": row[1], "total": row[2] / 100, "paymentMethod": row[3],
+             "email": row[4], "items": json.loads(row[5]), "createdAt": row[6]}
+            for row in rows
+        ]
+
+    def stats(self):
+        return {"path": self.path, "pending": self._queue.qsize(), "retrying": len(self._pending),
+                "batches": self.batches, "writes": self.writes, "dropped": self.dropped}
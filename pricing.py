@@ -0,0 +1,191 @@
+"""
+Pricing Module
+Cart totals in integer paise using NumPy arrays.
+Shelf prices are GST-inclusive MRPs, so the engine never changes what the
+customer pays. Instead it splits every line into taxable value and GST at the
+line's category rate and applies line and order discounts. All of this runs
+as vectorized int64 passes, with no float arithmetic after the prices are
+converted to paise. Checkout, receipts and order records all read their
+totals from the result.
+"""
+
+import numpy as np
+
+from catalog import get_catalog
+
+# GST rate per category, in basis points (1800 = 18%)
+GST_RATES_BPS = {
+    "fresh": 0,
+    "dairy": 0,
+    "bakery": 500,
+    "beverages": 1200,
+    "packaged food": 1200,
+    "frozen": 1800,
+    "personal care": 1800,
+    "general": 1800,
+}
+
+# Product -> category, from the store catalog
+PRODUCT_CATEGORIES = get_catalog().categories()
+
+
+def to_paise(rupees):
+    """A rupee amount -> int paise, rounded like to_paise_array"""
+    return int(round(float(rupees) * 100))
+
+
+def to_paise_array(prices):
+    """Rupee amounts -> int64 paise, rounded half away from zero"""
+    return np.rint(np.asarray(prices, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _div_round(numerator, denominator):
+    # Integer division rounded half up, for non-negative int64 arrays
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def allocate(amount, weights):
+    """
+    Split an integer amount across lines in proportion to weights
+
+    Uses largest remainders so the parts always add up to the amount exactly.
+    """
+    weights = np.asarray(weights, dtype=np.int64)
+    total = int(weights.sum())
+    if amount <= 0 or total <= 0:
+        return np.zeros(len(weights), dtype=np.int64)
+    amount = min(int(amount), total)
+    scaled = weights * amount
+    parts = scaled // total
+    short = amount - int(parts.sum())
+    if short:
+        order = np.argsort(-(scaled % total), kind="stable")
+        parts[order[:short]] += 1
+    return parts
+
+
+class PricedCart:
+    def __init__(self, names, unit, qty, rate_bps, discount):
+        self.names = names
+        self.unit = unit
+        self.qty = qty
+        self.rate_bps = rate_bps
+        self.gross = unit * qty
+        self.discount = np.minimum(discount, self.gross)
+        self.net = self.gross - self.discount
+        # GST is included in the net amount: taxable = net * 100 / (100 + rate)
+        self.taxable = _div_round(self.net * 10000, 10000 + rate_bps)
+        self.tax = self.net - self.taxable
+
+    @property
+    def total(self):
+        """Amount payable in paise"""
+        return int(self.net.sum())
+
+    @property
+    def gross_total(self):
+        return int(self.gross.sum())
+
+    @property
+    def discount_total(self):
+        return int(self.discount.sum())
+
+    @property
+    def tax_total(self):
+        return int(self.tax.sum())
+
+    def tax_by_rate(self):
+        """GST collected per rate, e.g. {"18%": paise}"""
+        rates, index = np.unique(self.rate_bps, return_inverse=True)
+        sums = np.bincount(index, weights=self.tax, minlength=len(rates)).astype(np.int64)
+        return {f"{rate / 100:g}%": int(amount) for rate, amount in zip(rates, sums) if amount}
+
+    def lines(self):
+        """Per-line breakdown in rupees for receipts and order records"""
+        return [
+            {
+                "name": name,
+                "price": int(unit) / 100,
+                "qty": int(qty),
+                "discount": int(discount) / 100,
+                "total": int(net) / 100,
+                "gst": int(tax) / 100,
+                "gstRate": int(rate) / 100
+            }
+            for name, unit, qty, discount, net, tax, rate in zip(
+                self.names, self.unit, self.qty, self.discount, self.net, self.tax, self.rate_bps)
+        ]
+
+    def summary(self):
+        return {
+            "subtotal": self.gross_total / 100,
+            "discount": self.discount_total / 100,
+            "total": self.total / 100,
+            "gst": self.tax_total / 100,
+            "gstByRate": {rate: paise / 100 for rate, paise in self.tax_by_rate().items()}
+        }
+
+
+class PricingEngine:
+    def __init__(self, gst_rates_bps=None, categories=None, default_category="general"):
+        """
+        Args:
+            gst_rates_bps (dict): Category -> GST rate in basis points
+            categories (dict): Product name -> category
+            default_category (str): Category for products not in the map
+        """
+        self.gst_rates_bps = dict(GST_RATES_BPS if gst_rates_bps is None else gst_rates_bps)
+        self.categories = {k.lower(): v for k, v in (PRODUCT_CATEGORIES if categories is None else categories).items()}
+        self.default_category = default_category
+
+    def category(self, name):
+        return self.categories.get(name.lower(), self.default_category)
+
+    def rate_bps(self, name):
+        return self.gst_rates_bps.get(self.category(name), self.gst_rates_bps.get(self.default_category, 0))
+
+    def price(self, items, line_discounts=None, order_discount=0):
+        """
+        Price a cart
+
+        Args:
+            items (list): Line items with name, price (rupees) and qty, as objects or dicts
+            line_discounts (list): Optional discount per line, in paise
+            order_discount (int): Cart-level discount in paise, spread over lines pro rata
+
+        Returns:
+            PricedCart: Vectorized line and total breakdown
+        """
+        rows = [(i["name"], i["price"], i["qty"]) if isinstance(i, dict) else (i.name, i.price, i.qty) for i in items]
+        names = [row[0] for row in rows]
+        unit = to_paise_array([row[1] for row in rows]) if rows else np.zeros(0, dtype=np.int64)
+        qty = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+        rate = np.fromiter((self.rate_bps(name) for name in names), dtype=np.int64, count=len(rows))
+        discount = np.zeros(len(rows), dtype=np.int64)
+        if line_discounts is not None:
+            discount += np.asarray(line_discounts, dtype=np.int64)
+        if order_discount:
+            discount += allocate(order_discount, np.maximum(unit * qty - discount, 0))
+        return PricedCart(names, unit, qty, rate, discount)
+
+    def reprice(self, cart_ids, unit, qty, rate_bps, discount=None):
+        """
+        Totals for many carts at once (wholesale orders, end-of-day re-pricing)
+
+        Args:
+            cart_ids (ndarray): Dense cart index (0..n-1) per line
+            unit, qty, rate_bps (ndarray): int64 per-line arrays; unit in paise
+            discount (ndarray): Optional int64 per-line discount in paise
+
+        Returns:
+            tuple: (total, gst) int64 arrays indexed by cart
+        """
+        gross = unit * qty
+        net = gross - np.minimum(discount, gross) if discount is not None else gross
+        tax = net - _div_round(net * 10000, 10000 + rate_bps)
+        carts = int(cart_ids.max()) + 1 if len(cart_ids) else 0
+        totals = np.zeros(carts, dtype=np.int64)
+        gst = np.zeros(carts, dtype=np.int64)
+        np.add.at(totals, cart_ids, net)
+        np.add.at(gst, cart_ids, tax)
+        return totals, gst
@@ -0,0 +1,105 @@
+"""
+Product Alias Module
+Resolves product names spoken or typed in any of the supported languages
+(native script or romanized, e.g. "दूध", "doodh", "paal") to catalog SKUs.
+The table is built offline by generate_product_aliases.py and loaded once
+at startup. Resolution is a dictionary lookup over the query's word n-grams,
+so it needs no translation service.
+"""
+
+import json
+import os
+
+from command_lexicon import normalize_command
+
+
+class ProductAliasIndex:
+    def __init__(self, skus=(), aliases=None, version=0):
+        """
+        Args:
+            skus (list): SKU names, referenced by position in the alias table
+            aliases (dict): {language: {normalized alias: sku index}}
+            version (int): Table version written by the generator
+        """
+        self.skus = list(skus)
+        self.version = version
+        self.by_language = {}
+        self.merged = {}  # alias -> SKU across all languages
+        for language, table in (aliases or {}).items():
+            resolved = {alias: self.skus[index] for alias, index in table.items()}
+            self.by_language[language] = resolved
+            for alias, sku in resolved.items():
+                self.merged.setdefault(alias, sku)
+        self.max_words = max((len(alias.split()) for alias in self.merged), default=1)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load the generated table; a missing or invalid file gives an empty index"""
+        path = path or default_aliases_path()
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["skus"], data["aliases"], data.get("version", 0))
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"Product aliases not loaded from {path}: {e}")
+            return cls()
+
+    def _tables(self, language):
+        # With a language: its own table (native and romanized), then English for
+        # code-mixed queries. Other languages' aliases are not consulted, since a
+        # word in one language can be an unrelated word in another ("pal").
+        # Without a (known) language: every language.
+        table = self.by_language.get(language) if language else None
+        if table is None:
+            return [self.merged]
+        return [table, self.by_language.get("en", {})]
+
+    def find_all(self, text, language=None):
+        """
+        All products named in a query, longest alias first
+
+        Args:
+            text (str): Query, e.g. "मुझे दूध और नमक चाहिए"
+            language (str): Language code to prefer, e.g. "hi"
+
+        Returns:
+            list: [(sku, matched alias)] in query order, without repeats
+        """
+        words = normalize_command(text).split()
+        tables = self._tables(language)
+        found = []
+        seen = set()
+        i = 0
+        while i < len(words):
+            for size in range(min(self.max_words, len(words) - i), 0, -1):
+                phrase = " ".join(words[i:i + size])
+                sku = next((t[phrase] for t in tables if phrase in t), None)
+                if sku is not None:
+                    if sku not in seen:
+                        seen.add(sku)
+                        found.append((sku, phrase))
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
+
+    def resolve(self, text, language=None):
+        """First SKU named in the query, or None"""
+        found = self.find_all(text, language)
+        return found[0][0] if found else None
+
+    def aliases_for(self, sku, language):
+        return [alias for alias, name in self.by_language.get(language, {}).items() if name == sku]
+
+    def stats(self):
+        return {
+            "skus": len(self.skus),
+            "languages": len(self.by_language),
+            "aliases": sum(len(table) for table in self.by_language.values()),
+            "version": self.version
+        }
+
+
+def default_aliases_path():
+    return os.getenv("PRODUCT_ALIASES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "product_aliases.json"))
@@ -0,0 +1,200 @@
+"""
+Product Search Module
+Typo-tolerant product search over an in-memory inverted index.
+Product names, brands and categories are split into words. A trigram index
+over the distinct words finds close spellings of each query word, so
+"grease yogurt" still reaches "greek yogurt". Products are then scored by
+how well each query word matches their name, brand or category words.
+Candidates are the union of the products matched by every query word, so
+any word can bring in results; only words matching more than
+MAX_SEED_PRODUCTS products (e.g. a category word) are left to score the
+candidates the others found, which keeps query cost bounded on large
+catalogs. Products can be added, updated or removed one at a time.
+"""
+
+import heapq
+import re
+import threading
+
+FIELD_WEIGHTS = {"name": 3.0, "brand": 2.0, "category": 1.0}
+MIN_SIMILARITY = 0.4  # trigram Dice similarity for a word to count as a typo match
+MAX_TERM_MATCHES = 8
+MAX_SEED_PRODUCTS = 2000  # query words matching more products don't add candidates
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text):
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def trigrams(word):
+    """Padded character trigrams of a word ("milk" -> " mi", "mil", "ilk", "lk ")"""
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ProductSearchIndex:
+    def __init__(self, field_weights=None, min_similarity=MIN_SIMILARITY):
+        """
+        Args:
+            field_weights (dict): Field -> score weight
+            min_similarity (float): Lowest word similarity accepted as a typo match
+        """
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.min_similarity = min_similarity
+        self.terms = {}  # word -> {product_id: field weight}
+        self.term_grams = {}  # trigram -> set of words
+        self.documents = {}  # product_id -> (display dict, {word: field weight}, name word count)
+        self.version = 0
+        self._term_cache = {}
+        self._lock = threading.Lock()
+
+    def add(self, product_id, name, brands=(), category="", **extra):
+        """
+        Index (or re-index) one product
+
+        Args:
+            product_id: Unique key, usually the product name
+            name (str): Product name
+            brands (list): Brand names
+            category (str): Category or aisle section
+            extra: Additional display fields returned with results
+        """
+        words = {}
+        for field, texts in (("name", [name]), ("brand", list(brands)), ("category", [category] if category else [])):
+            weight = self.field_weights[field]
+            for text in texts:
+                for word in normalize(text).split():
+                    if words.get(word, 0) < weight:
+                        words[word] = weight
+        display = {"id": product_id, "name": name, "brands": list(brands), "category": category, **extra}
+        with self._lock:
+            self._remove(product_id)
+            self.documents[product_id] = (display, words, len(normalize(name).split()))
+            for word, weight in words.items():
+                posting = self.terms.get(word)
+                if posting is None:
+                    posting = self.terms[word] = {}
+                    for gram in trigrams(word):
+                        self.term_grams.setdefault(gram, set()).add(word)
+                    self._term_cache.clear()
+                posting[product_id] = weight
+            self.version += 1
+
+    def remove(self, product_id):
+        with self._lock:
+            if self._remove(product_id):
+                self.version += 1
+
+    def _remove(self, product_id):
+        document = self.documents.pop(product_id, None)
+        if document is None:
+            return False
+        for word in document[1]:
+            posting = self.terms.get(word)
+            if posting is None:
+                continue
+            posting.pop(product_id, None)
+            if not posting:
+                del self.terms[word]
+                for gram in trigrams(word):
+                    words = self.term_grams.get(gram)
+                    if words is not None:
+                        words.discard(word)
+                        if not words:
+                            del self.term_grams[gram]
+                self._term_cache.clear()
+        return True
+
+    def _match_terms(self, word):
+        # Indexed words spelled like the query word, as [(word, similarity)]
+        cached = self._term_cache.get(word)
+        if cached is not None:
+            return cached
+        if word in self.terms:
+            matches = [(word, 1.0)]
+        else:
+            grams = trigrams(word)
+            shared = {}
+            for gram in grams:
+                for term in self.term_grams.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            scored = []
+            for term, count in shared.items():
+                similarity = 2.0 * count / (len(grams) + len(term))
+                if similarity >= self.min_similarity:
+                    scored.append((term, similarity))
+            matches = heapq.nlargest(MAX_TERM_MATCHES, scored, key=lambda m: m[1])
+        if len(self._term_cache) > 10000:
+            self._term_cache.clear()
+        self._term_cache[word] = matches
+        return matches
+
+    def search(self, query, limit=10, min_score=0.3):
+        """
+        Ranked, typo-tolerant product search
+
+        Args:
+            query (str): Free text, e.g. "olive oil" or "grease yogurt"
+            limit (int): Max results
+            min_score (float): Drop results below this relevance (0-1)
+
+        Returns:
+            list: Result dicts (product fields plus "score"), best first
+        """
+        words = list(dict.fromkeys(normalize(query).split()))
+        if not words:
+            return []
+        with self._lock:
+            return self._search(words, limit, min_score)
+
+    def _search(self, words, limit, min_score):
+        matches = [self._match_terms(word) for word in words]
+        if not any(matches):
+            return []
+        # Every query word seeds candidates, except very common ones when a rarer word exists
+        sizes = [sum(len(self.terms[term]) for term, _ in m) for m in matches]
+        rarest = min((size, index) for index, size in enumerate(sizes) if matches[index])[1]
+        scores = {}
+        scoring_only = []
+        for index, word_matches in enumerate(matches):
+            if not word_matches:
+                continue
+            if index != rarest and sizes[index] > MAX_SEED_PRODUCTS:
+                scoring_only.append(word_matches)
+                continue
+            best = {}
+            for term, similarity in word_matches:
+                for product_id, weight in self.terms[term].items():
+                    value = similarity * weight
+                    if value > best.get(product_id, 0.0):
+                        best[product_id] = value
+            for product_id, value in best.items():
+                scores[product_id] = scores.get(product_id, 0.0) + value
+
+        # Common words add their best match within each candidate
+        for word_matches in scoring_only:
+            for product_id in scores:
+                product_words = self.documents[product_id][1]
+                best = 0.0
+                for term, similarity in word_matches:
+                    weight = product_words.get(term)
+                    if weight and similarity * weight > best:
+                        best = similarity * weight
+                scores[product_id] += best
+
+        best_field = max(self.field_weights.values())
+        scale = best_field * len(words)
+        results = []
+        for product_id, score in heapq.nlargest(limit * 3, scores.items(), key=lambda item: item[1]):
+            display, _, name_words = self.documents[product_id]
+            # Prefer products whose names have fewer unmatched words
+            relevance = (score / scale) * (0.8 + 0.2 * min(1.0, len(words) / max(1, name_words)))
+            if relevance >= min_score:
+                results.append({**display, "score": round(relevance, 3)})
+        results.sort(key=lambda r: -r["score"])
+        return results[:limit]
+
+    def stats(self):
+        return {"products": len(self.documents), "words": len(self.terms), "version": self.version}
@@ -0,0 +1,280 @@
+"""
+Promotions Module
+Rule-based promotions evaluated at checkout.
+Rules (BOGO, percent off a category, bundle price, spend threshold) are
+loaded from JSON and indexed by SKU and category. A cart only looks at the
+rules indexed under its own SKUs and categories, so evaluation grows with
+cart size rather than with the number of active rules. Threshold rules are
+kept sorted by minimum spend and found by binary search.
+
+Stacking: each line gets its single best line rule (BOGO or category
+percent). Bundles use only units with no line rule, and the bundles with
+the biggest savings claim units first. The threshold discount applies to
+the subtotal left after those discounts. Lines for the same SKU are merged
+before any rule is matched, so two lines of one milk count as two milks.
+"""
+
+import bisect
+import json
+import os
+import threading
+
+from inventory import normalize_sku
+
+
+def _paise(rupees):
+    return int(round(float(rupees) * 100))
+
+
+class Promotion:
+    __slots__ = ("id", "type", "description", "sku", "category", "skus", "buy", "free",
+                 "percent", "price", "min_total", "discount")
+
+    def __init__(self, rule):
+        self.id = rule["id"]
+        self.type = rule["type"]
+        self.description = rule.get("description", self.id)
+        self.sku = rule.get("sku", "").lower()
+        self.category = rule.get("category", "").lower()
+        self.skus = tuple(s.lower() for s in rule.get("skus", ()))
+        self.buy = int(rule.get("buy", 1))
+        self.free = int(rule.get("free", 1))
+        self.percent = float(rule.get("percent", 0))
+        self.price = _paise(rule.get("price", 0))
+        self.min_total = _paise(rule.get("min_total", 0))
+        self.discount = _paise(rule.get("discount", 0))
+
+    def line_discount(self, unit, qty):
+        """Paise off one cart line for BOGO and category rules"""
+        if self.type == "bogo":
+            return (qty // (self.buy + self.free)) * self.free * unit
+        if self.type == "category_percent":
+            return int(unit * qty * self.percent // 100)
+        return 0
+
+    def to_dict(self, discount):
+        return {"id": self.id, "type": self.type, "description": self.description, "discount": discount / 100}
+
+
+class PromotionResult:
+    def __init__(self, line_discounts, order_discount, applied):
+        self.line_discounts = line_discounts  # paise per cart line
+        self.order_discount = order_discount  # paise off the whole order
+        self.applied = applied
+
+    @property
+    def total_discount(self):
+        return sum(self.line_discounts) + self.order_discount
+
+
+class PromotionEngine:
+    RULE_TYPES = ("bogo", "category_percent", "bundle", "threshold")
+
+    def __init__(self, rules=(), categories=None):
+        """
+        Args:
+            rules (list): Rule dicts (see promotions.json)
+            categories (dict): Product name -> category, for category rules
+        """
+        self.categories = {k.lower(): v.lower() for k, v in (categories or {}).items()}
+        self.rules = {}
+        self.by_sku = {}
+        self.by_category = {}
+        self._thresholds = []
+        # (min spend keys, best flat rule, best percent rule), replaced as a whole
+        self._threshold_index = ((), (), ())
+        self._lock = threading.Lock()
+        self.add_all(rules)
+
+    @classmethod
+    def load(cls, path, categories=None):
+        """Load rules from a JSON file; a missing or invalid file gives an empty engine"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                rules = [r for r in json.load(f) if r.get("active", True)]
+        except (OSError, ValueError) as e:
+            print(f"Promotions not loaded from {path}: {e}")
+            rules = []
+        return cls(rules, categories)
+
+    def add(self, rule):
+        return self.add_all([rule])[0]
+
+    def add_all(self, rules):
+        """Index several rules, rebuilding the threshold index once"""
+        promotions = [Promotion(rule) for rule in rules]
+        for promotion in promotions:
+            if promotion.type not in self.RULE_TYPES:
+                raise ValueError(f"Unknown promotion type: {promotion.type}")
+        with self._lock:
+            thresholds = []
+            for promotion in promotions:
+                self.rules[promotion.id] = promotion
+                if promotion.type == "bogo":
+                    self.by_sku.setdefault(promotion.sku, []).append(promotion)
+                elif promotion.type == "bundle":
+                    for sku in set(promotion.skus):
+                        self.by_sku.setdefault(sku, []).append(promotion)
+                elif promotion.type == "category_percent":
+                    self.by_category.setdefault(promotion.category, []).append(promotion)
+                else:
+                    thresholds.append(promotion)
+            if thresholds:
+                self._thresholds = sorted(self._thresholds + thresholds, key=lambda p: p.min_total)
+                self._threshold_index = self._index_thresholds(self._thresholds)
+        return promotions
+
+    @staticmethod
+    def _index_thresholds(thresholds):
+        # Sorted by minimum spend with running best flat / percent discounts,
+        # so the best applicable threshold is one bisect away. Built into new
+        # lists and published in one assignment: checkouts never see a partial index.
+        keys, best_flat, best_percent = [], [], []
+        flat = percent = None
+        for p in thresholds:
+            if p.discount and (flat is None or p.discount > flat.discount):
+                flat = p
+            if p.percent and (percent is None or p.percent > percent.percent):
+                percent = p
+            keys.append(p.min_total)
+            best_flat.append(flat)
+            best_percent.append(percent)
+        return tuple(keys), tuple(best_flat), tuple(best_percent)
+
+    def category(self, sku):
+        return self.categories.get(sku, "")
+
+    def evaluate(self, items):
+        """
+        Work out the discounts for a cart
+
+        Args:
+            items (list): Line items with name, price (rupees) and qty, as objects or dicts
+
+        Returns:
+            PromotionResult: Per-line and order discounts in paise plus the rules applied
+        """
+        # One line per normalized SKU (at its first unit price); cart_lines maps back to
+        # the cart lines as (position, qty)
+        lines = []
+        cart_lines = []
+        merged = {}
+        line_count = 0
+        for position, item in enumerate(items):
+            line_count += 1
+            name, price, qty = (item["name"], item["price"], item["qty"]) if isinstance(item, dict) else (item.name, item.price, item.qty)
+            sku = normalize_sku(name)
+            index = merged.get(sku)
+            if index is None:
+                merged[sku] = len(lines)
+                lines.append((sku, _paise(price), qty))
+                cart_lines.append([(position, qty)])
+            else:
+                lines[index] = (sku, lines[index][1], lines[index][2] + qty)
+                cart_lines[index].append((position, qty))
+
+        discounts = [0] * len(lines)
+        applied = {}
+        bundles = {}
+        positions = {}
+        for index, (sku, unit, qty) in enumerate(lines):
+            positions[sku] = index
+            best, best_rule = 0, None
+            candidates = self.by_sku.get(sku, [])
+            category = self.category(sku)
+            if category:
+                candidates = candidates + self.by_category.get(category, [])
+            for rule in candidates:
+                if rule.type == "bundle":
+                    bundles[rule.id] = rule
+                    continue
+                discount = rule.line_discount(unit, qty)
+                if discount > best:
+                    best, best_rule = discount, rule
+            if best_rule is not None:
+                discounts[index] = best
+                applied[best_rule.id] = applied.get(best_rule.id, 0) + best
+
+        # Bundles only use units from lines with no line promotion
+        free_units = {sku: qty for index, (sku, unit, qty) in enumerate(lines) if not discounts[index]}
+        for rule in sorted(bundles.values(), key=lambda r: -self._bundle_saving(r, lines, positions)):
+            if any(sku not in positions for sku in rule.skus):
+                continue
+            need = {sku: rule.skus.count(sku) for sku in set(rule.skus)}
+            count = min(free_units.get(sku, 0) // n for sku, n in need.items())
+            saving = self._bundle_saving(rule, lines, positions)
+            if count <= 0 or saving <= 0:
+                continue
+            # Credit the saving to member lines in proportion to their price
+            regular = sum(lines[positions[sku]][1] * n for sku, n in need.items())
+            credited = 0
+            members = list(need.items())
+            for position, (sku, n) in enumerate(members):
+                free_units[sku] -= n * count
+                share = saving * count - credited if position == len(members) - 1 else \
+                    saving * count * lines[positions[sku]][1] * n // regular
+                discounts[positions[sku]] += share
+                credited += share
+            applied[rule.id] = applied.get(rule.id, 0) + saving * count
+
+        order_discount = 0
+        threshold_keys, best_flat, best_percent = self._threshold_index
+        if threshold_keys:
+            subtotal = sum(unit * qty for _, unit, qty in lines) - sum(discounts)
+            reach = bisect.bisect_right(threshold_keys, subtotal)
+            if reach:
+                flat, percent = best_flat[reach - 1], best_percent[reach - 1]
+                options = []
+                if flat is not None:
+                    options.append((min(flat.discount, subtotal), flat))
+                if percent is not None:
+                    options.append((int(subtotal * percent.percent // 100), percent))
+                if options:
+                    order_discount, rule = max(options, key=lambda o: o[0])
+                    if order_discount:
+                        applied[rule.id] = order_discount
+
+        return PromotionResult(self._split_merged(discounts, cart_lines, line_count), order_discount,
+                               [self.rules[rule_id].to_dict(amount) for rule_id, amount in applied.items()])
+
+    @staticmethod
+    def _split_merged(discounts, cart_lines, count):
+        # Spread each merged line's discount over its cart lines by quantity
+        line_discounts = [0] * count
+        for discount, positions in zip(discounts, cart_lines):
+            total_qty, credited = sum(qty for _, qty in positions), 0
+            for n, (position, qty) in enumerate(positions):
+                share = discount - credited if n == len(positions) - 1 else discount * qty // max(1, total_qty)
+                line_discounts[position] = share
+                credited += share
+        return line_discounts
+
+    @staticmethod
+    def _bundle_saving(rule, lines, positions):
+        if any(sku not in positions for sku in rule.skus):
+            return 0
+        return sum(lines[positions[sku]][1] for sku in rule.skus) - rule.price
+
+    def suggest(self, query):
+        """Description of a promotion relevant to a product or category name, if any"""
+        text = query.lower().strip()
+        for sku, rules in self.by_sku.items():
+            if sku and sku in text:
+                return rules[0].description
+        category = self.category(text)
+        for key in ([category] if category else []) + [c for c in self.by_category if c and c in text]:
+            if self.by_category.get(key):
+                return self.by_category[key][0].description
+        return None
+
+    def stats(self):
+        return {
+            "rules": len(self.rules),
+            "skus_indexed": len(self.by_sku),
+            "categories_indexed": len(self.by_category),
+            "thresholds": len(self._thresholds)
+        }
+
+
+def default_promotions_path():
+    return os.getenv("PROMOTIONS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "promotions.json"))
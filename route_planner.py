@@ -0,0 +1,161 @@
+"""
+Route Planner Module
+Visit order for a whole shopping list.
+Walking distances come from the StoreGraph tables, so the distance matrix
+costs one lookup per pair. Short lists are solved exactly with Held-Karp
+dynamic programming; longer ones use nearest-neighbour construction
+improved by 2-opt until no move helps or the time budget runs out.
+"""
+
+import time
+
+EXACT_LIMIT = 10
+TIME_BUDGET = 0.05  # seconds of 2-opt improvement for long lists
+
+
+def _held_karp(matrix, end):
+    # matrix[0] is the start; stops are 1..n. Open path unless end is given
+    # (end is then matrix index n + 1, which must be visited last)
+    n = len(matrix) - (2 if end else 1)
+    full = (1 << n) - 1
+    INF = float("inf")
+    cost = [[INF] * n for _ in range(1 << n)]
+    parent = [[-1] * n for _ in range(1 << n)]
+    for i in range(n):
+        cost[1 << i][i] = matrix[0][i + 1]
+    for mask in range(1, 1 << n):
+        row = cost[mask]
+        for last in range(n):
+            base = row[last]
+            if base == INF or not mask & (1 << last):
+                continue
+            distances = matrix[last + 1]
+            for nxt in range(n):
+                bit = 1 << nxt
+                if mask & bit:
+                    continue
+                candidate = base + distances[nxt + 1]
+                if candidate < cost[mask | bit][nxt]:
+                    cost[mask | bit][nxt] = candidate
+                    parent[mask | bit][nxt] = last
+    tail = [matrix[i + 1][n + 1] if end else 0 for i in range(n)]
+    last = min(range(n), key=lambda i: cost[full][i] + tail[i])
+    order, mask = [], full
+    while last != -1:
+        order.append(last + 1)
+        last, mask = parent[mask][last], mask ^ (1 << last)
+    order.reverse()
+    return order
+
+
+def _path_length(matrix, order, end):
+    total = matrix[0][order[0]]
+    for a, b in zip(order, order[1:]):
+        total += matrix[a][b]
+    if end:
+        total += matrix[order[-1]][len(matrix) - 1]
+    return total
+
+
+def _nearest_neighbour(matrix, n):
+    order, current = [], 0
+    remaining = set(range(1, n + 1))
+    while remaining:
+        current = min(remaining, key=lambda j: (matrix[current][j], j))
+        remaining.discard(current)
+        order.append(current)
+    return order
+
+
+def _two_opt(matrix, order, end, deadline):
+    # Reverse order[i..j] whenever that shortens the walk; the start is fixed
+    # and, for open paths, the segment after the last stop costs nothing
+    tour = [0] + order + ([len(matrix) - 1] if end else [])
+    last = len(tour) - 1 if end else len(tour)
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(1, last - 1):
+            a, b = tour[i - 1], tour[i]
+            for j in range(i + 1, last):
+                c = tour[j]
+                d = tour[j + 1] if j + 1 < len(tour) else None
+                before = matrix[a][b] + (matrix[c][d] if d is not None else 0)
+                after = matrix[a][c] + (matrix[b][d] if d is not None else 0)
+                if after < before:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    b = tour[i]
+                    improved = True
+            if time.perf_counter() >= deadline:
+                break
+    return tour[1:len(tour) - 1] if end else tour[1:]
+
+
+def plan_route(graph, start, stops, end=None, exact_limit=EXACT_LIMIT, time_budget=TIME_BUDGET):
+    """
+    Plan the order to visit every stop on a shopping list
+
+    Args:
+        graph (StoreGraph): Store graph with the stops registered as locations
+        start (str): Starting location name (e.g. "entrance")
+        stops (list): Item names to visit
+        end (str): Optional location to finish at (e.g. "checkout")
+        exact_limit (int): Largest number of distinct shelves solved exactly
+        time_budget (float): Seconds allowed for 2-opt improvement
+
+    Returns:
+        dict: order (item names), legs (item, path), steps, method, unknown items
+
+    Raises:
+        ValueError: If start or end is not a known location, or end can't be reached
+    """
+    started = time.perf_counter()
+    if start not in graph.locations:
+        raise ValueError(f"Unknown start location: {start}")
+    if end is not None:
+        if end not in graph.locations:
+            raise ValueError(f"Unknown end location: {end}")
+        # The store graph is undirected: every stop reachable from start can also reach end
+        if graph.steps(start, end) is None:
+            raise ValueError(f"End location {end} can't be reached from {start}")
+    # Items sharing a shelf cell are one stop
+    shelves, unknown = {}, []
+    for item in stops:
+        name = item.lower()
+        loc = graph.locations.get(name)
+        if loc is None or graph.steps(start, name) is None:
+            unknown.append(item)
+        else:
+            shelves.setdefault(loc, []).append(item)
+    cells = list(shelves)
+    if not cells:
+        return {"order": [], "legs": [], "steps": 0, "method": "none", "unknown": unknown}
+
+    points = [graph.locations[start]] + cells + ([graph.locations[end]] if end else [])
+    matrix = [[graph.steps(a, b) for b in points] for a in points]
+
+    if len(cells) <= exact_limit:
+        order, method = _held_karp(matrix, end), "exact"
+    else:
+        order = _nearest_neighbour(matrix, len(cells))
+        order = _two_opt(matrix, order, end, started + time_budget)
+        method = "heuristic"
+
+    legs, position = [], points[0]
+    for index in order:
+        cell = points[index]
+        path = graph.route(position, cell)
+        for offset, item in enumerate(shelves[cell]):
+            legs.append({"item": item, "path": path if offset == 0 else []})
+        position = cell
+    if end:
+        legs.append({"item": end, "path": graph.route(position, end)})
+
+    return {
+        "order": [leg["item"] for leg in legs],
+        "legs": legs,
+        "steps": _path_length(matrix, order, end),
+        "method": method,
+        "unknown": unknown,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
@@ -0,0 +1,127 @@
+"""
+Single Flight Module
+Coalesces identical in-flight calls. When many shoppers ask the same
+question at once (e.g. after a store announcement), only the first request
+runs the translation or LLM call; concurrent duplicates wait for that call
+and share its result or its exception. Nothing is cached: once the call
+finishes, the next identical request runs again.
+
+Keys are built from the normalized (operation, language, text, model), so
+"Where is the SALE item?" and "where is the sale item" share one call.
+"""
+
+import asyncio
+import threading
+
+from command_lexicon import normalize_command
+
+
+def flight_key(operation, language, text, model=None):
+    """Key for a call: operation name, language, normalized text and model"""
+    return (operation, language or "", normalize_command(text or ""), model or "")
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}  # key -> _Flight (threads)
+        self._tasks = {}  # (event loop, key) -> asyncio.Future
+        self._lock = threading.Lock()
+        self.counters = {}
+
+    def _count(self, operation, key):
+        with self._lock:
+            counters = self.counters.setdefault(operation, {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0})
+            counters[key] += 1
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless an identical call is already running, then share its result
+
+        Args:
+            key (tuple): Call key, usually from flight_key()
+            fn (callable): Blocking function
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        operation = key[0]
+        self._count(operation, "calls")
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self._count(operation, "coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        self._count(operation, "executed")
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            self._count(operation, "errors")
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def do_async(self, key, fn, *args, **kwargs):
+        """
+        Await fn(*args, **kwargs) unless an identical call is already running on this event loop
+
+        Args:
+            key (tuple): Call key, usually from flight_key()
+            fn (callable): Coroutine function
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        operation = key[0]
+        self._count(operation, "calls")
+        loop_key = (id(asyncio.get_running_loop()), key)
+        future = self._tasks.get(loop_key)
+        if future is not None:
+            self._count(operation, "coalesced")
+            # shield: a cancelled duplicate must not cancel the shared call
+            return await asyncio.shield(future)
+        self._count(operation, "executed")
+        future = self._tasks[loop_key] = asyncio.ensure_future(fn(*args, **kwargs))
+
+        def finished(done):
+            self._tasks.pop(loop_key, None)
+            # Mark a failure as retrieved: if every waiter was cancelled, nobody else will
+            if not done.cancelled():
+                done.exception()
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._count(operation, "errors")
+            raise
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights) + len(self._tasks)
+
+    def stats(self):
+        with self._lock:
+            stats = {operation: dict(counters) for operation, counters in self.counters.items()}
+        for counters in stats.values():
+            counters["coalesce_rate"] = round(counters["coalesced"] / counters["calls"], 3) if counters["calls"] else 0.0
+        return {"in_flight": self.in_flight(), "operations": stats}
@@ -0,0 +1,166 @@
+"""
+Store Routing Module
+Shortest-path guidance over the store floor grid.
+The graph is built once; for every shelf location a reverse BFS stores the
+next step towards that shelf and the distance to it for every cell, in
+compact byte/int arrays. A route query then just follows next-step
+pointers, so it costs O(path length) with no per-query search.
+"""
+
+from array import array
+
+MOVES = ((0, 1, "right"), (0, -1, "left"), (1, 0, "down"), (-1, 0, "up"))
+UNREACHABLE = 0xFF
+NO_DISTANCE = 0xFFFFFFFF
+
+
+class StoreGraph:
+    def __init__(self, rows, cols, blocked=(), locations=None):
+        """
+        Args:
+            rows (int): Grid rows
+            cols (int): Grid columns
+            blocked (iterable): (row, col) cells that can't be walked (shelving, walls)
+            locations (dict): Name -> (row, col) shelf or landmark cells to precompute
+        """
+        self.rows = rows
+        self.cols = cols
+        self.open = bytearray([1]) * (rows * cols)
+        for r, c in blocked:
+            self.open[r * cols + c] = 0
+        self._adjacency = None
+        self.locations = {}
+        self.next_step = {}  # target cell -> bytearray of MOVES index per cell
+        self.distance = {}  # target cell -> array('I') of steps per cell
+        for name, loc in (locations or {}).items():
+            self.add_location(name, loc)
+
+    @classmethod
+    def from_floorplan(cls, text, locations=None):
+        """
+        Build a graph from a text floorplan: '#' is blocked, anything else walkable
+
+        Args:
+            text (str): One line per grid row
+            locations (dict): Name -> (row, col)
+        """
+        lines = [line.rstrip("\r") for line in text.split("\n") if line.strip()]
+        cols = max(len(line) for line in lines)
+        blocked = [(r, c) for r, line in enumerate(lines) for c, ch in enumerate(line) if ch == "#"]
+        return cls(len(lines), cols, blocked, locations)
+
+    def _cell(self, loc):
+        r, c = loc
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise ValueError(f"{loc} is outside the {self.rows}x{self.cols} floor")
+        return r * self.cols + c
+
+    def add_location(self, name, loc):
+        """Register a named location and precompute its routing table"""
+        cell = self._cell(loc)
+        self.locations[name] = tuple(loc)
+        if cell not in self.next_step:
+            self._precompute(cell)
+        return cell
+
+    def _neighbours(self):
+        # Walkable neighbours per cell with the move that leads back from them,
+        # built once and shared by every table
+        if self._adjacency is None:
+            rows, cols, open_cells = self.rows, self.cols, self.open
+            adjacency = []
+            for cell in range(rows * cols):
+                r, c = divmod(cell, cols)
+                links = []
+                for index, (dr, dc, _) in enumerate(MOVES):
+                    nr, nc = r - dr, c - dc
+                    if 0 <= nr < rows and 0 <= nc < cols and open_cells[nr * cols + nc]:
+                        links.append((nr * cols + nc, index))
+                adjacency.append(links)
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def _precompute(self, target):
+        # Reverse BFS from the target: when a neighbour is discovered, the step
+        # it must take is the move back towards the cell that discovered it
+        adjacency = self._neighbours()
+        cells = self.rows * self.cols
+        step = bytearray([UNREACHABLE]) * cells
+        dist = array("I", [NO_DISTANCE]) * cells
+        dist[target] = 0
+        frontier = [target]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbour, index in adjacency[cell]:
+                    if dist[neighbour] == NO_DISTANCE:
+                        dist[neighbour] = d
+                        step[neighbour] = index
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        self.next_step[target] = step
+        self.distance[target] = dist
+
+    def _target(self, goal):
+        if isinstance(goal, str):
+            if goal not in self.locations:
+                return None
+            goal = self.locations[goal]
+        cell = self._cell(goal)
+        if cell not in self.next_step:
+            self._precompute(cell)
+        return cell
+
+    def route(self, start, goal):
+        """
+        Directions from start to goal
+
+        Args:
+            start: Location name or (row, col)
+            goal: Location name or (row, col)
+
+        Returns:
+            list: Moves such as ["right", "down"], or None if unknown/unreachable
+        """
+        target = self._target(goal)
+        if target is None:
+            return None
+        if isinstance(start, str):
+            if start not in self.locations:
+                return None
+            start = self.locations[start]
+        cell = self._cell(start)
+        if self.distance[target][cell] == NO_DISTANCE:
+            return None
+        step = self.next_step[target]
+        path = []
+        while cell != target:
+            dr, dc, direction = MOVES[step[cell]]
+            path.append(direction)
+            cell += dr * self.cols + dc
+        return path
+
+    def steps(self, start, goal):
+        """Walking distance in cells, or None if unknown/unreachable"""
+        target = self._target(goal)
+        if target is None:
+            return None
+        if isinstance(start, str):
+            if start not in self.locations:
+                return None
+            start = self.locations[start]
+        d = self.distance[target][self._cell(start)]
+        return None if d == NO_DISTANCE else d
+
+    def stats(self):
+        cells = self.rows * self.cols
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "walkable": sum(self.open),
+            "locations": len(self.locations),
+            "tables": len(self.next_step),
+            "table_bytes": len(self.next_step) * cells * 5
+        }
@@ -0,0 +1,99 @@
+"""
+Test script for admission control
+Fills a gate's slots and wait queue and checks which requests are admitted,
+queued or shed, and that a shed request gives its queue place back.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from admission import AdmissionGate, Overloaded
+
+
+async def hold(gate, release, key=None, log=None, label=None):
+    async with gate.admit(key):
+        if log is not None:
+            log.append(label)
+        await release.wait()
+
+
+def test_queue_full_is_rejected():
+    async def scenario():
+        gate = AdmissionGate("llm", limit=1, queue_size=2, max_wait=5, per_key=10)
+        release = asyncio.Event()
+        log = []
+        tasks = [asyncio.create_task(hold(gate, release, log=log, label=i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert gate.stats()["active"] == 1 and gate.stats()["waiting"] == 2
+        try:
+            async with gate.admit():
+                raise AssertionError("the fourth request should be shed")
+        except Overloaded as e:
+            print(f"  shed: {e} (retry after {e.retry_after}s)")
+            assert e.gate == "llm" and e.reason == "queue full"
+        release.set()
+        await asyncio.gather(*tasks)
+        stats = gate.stats()
+        print(f"  stats: {stats}")
+        assert log == [0, 1, 2], "queued requests get slots oldest first"
+        assert stats["shed_queue_full"] == 1 and stats["admitted"] == 3 and stats["queued"] == 2
+        assert stats["active"] == 0 and stats["waiting"] == 0
+
+    asyncio.run(scenario())
+    print("PASS: a full queue sheds new requests immediately")
+
+
+def test_wait_deadline_sheds():
+    async def scenario():
+        gate = AdmissionGate("whisper", limit=1, queue_size=4, max_wait=5)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(gate, release, key="cart-1"))
+        await asyncio.sleep(0.01)
+        try:
+            async with gate.admit("cart-2", max_wait=0.05):
+                raise AssertionError("no slot should free up in time")
+        except Overloaded as e:
+            print(f"  shed: {e}")
+            assert "no slot within" in e.reason
+        stats = gate.stats()
+        assert stats["shed_timeout"] == 1 and stats["waiting"] == 0
+        assert gate.by_key == {"cart-1": 1}, "the shed request leaves no per-key count behind"
+        release.set()
+        await holder
+        # The slot is free again
+        async with gate.admit("cart-2", max_wait=0.05):
+            assert gate.stats()["active"] == 1
+        assert gate.stats()["active"] == 0 and gate.by_key == {}
+
+    asyncio.run(scenario())
+    print("PASS: requests that wait past their deadline are shed and cleaned up")
+
+
+def test_per_key_cap():
+    async def scenario():
+        gate = AdmissionGate("voice", limit=4, queue_size=4, per_key=2)
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(hold(gate, release, key="noisy")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        try:
+            async with gate.admit("noisy"):
+                raise AssertionError("a third request from one cart should be shed")
+        except Overloaded as e:
+            print(f"  shed: {e}")
+        async with gate.admit("quiet"):
+            pass
+        release.set()
+        await asyncio.gather(*tasks)
+        assert gate.stats()["shed_per_key"] == 1 and gate.by_key == {}
+
+    asyncio.run(scenario())
+    print("PASS: one cart can't take more than its share of the gate")
+
+
+if __name__ == "__main__":
+    test_queue_full_is_rejected()
+    test_wait_deadline_sheds()
+    test_per_key_cap()
@@ -0,0 +1,100 @@
+"""
+Responsiveness test for the async AI endpoints
+Starts the server in-process with a deliberately slow Hugging Face client,
+keeps several /api/ai-assist-multilingual requests in flight and checks that
+other endpoints still answer quickly. Before the async clients, every slow
+LLM call froze the event loop and these requests queued behind it.
+"""
+
+import os
+import socket
+import threading
+import time
+
+import requests
+import uvicorn
+
+os.environ.setdefault("HEALTH_PROBE_INTERVAL", "0")
+os.environ.setdefault("CATALOG_WATCH_INTERVAL", "0")
+import main
+
+LLM_DELAY = 3.0
+SLOW_REQUESTS = 8
+MAX_LATENCY = 0.5
+
+
+class SlowInferenceClient:
+    """Stands in for InferenceClient: blocks like a slow remote model"""
+
+    def text_generation(self, prompt, **kwargs):
+        time.sleep(LLM_DELAY)
+        return "Milk is in Aisle 1."
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def test_endpoints_stay_responsive():
+    main.HF_AVAILABLE = True
+    main.hf_client = SlowInferenceClient()
+    main.hf_async_client = None
+    main.health.register("huggingface")  # fresh, closed breaker without a probe
+    main.health.register("googletrans").disable("not used in this test")
+
+    port = free_port()
+    server, thread = start_server(port)
+    base = f"http://127.0.0.1:{port}"
+
+    slow_results = []
+    calls_before = main.async_backends.stats().get("huggingface", {}).get("calls", 0)
+
+    def ask(shopper):
+        # Distinct questions, so single-flight cannot merge them into one LLM call
+        start = time.perf_counter()
+        response = requests.post(f"{base}/api/ai-assist-multilingual",
+                                 json={"query": f"where is milk for shopper {shopper}", "language": "en"}, timeout=60)
+        slow_results.append((response.json().get("response"), time.perf_counter() - start))
+
+    askers = [threading.Thread(target=ask, args=(shopper,)) for shopper in range(SLOW_REQUESTS)]
+    for asker in askers:
+        asker.start()
+    time.sleep(0.5)  # let the LLM calls get in flight
+
+    latencies = []
+    for path in ["/api/health/backends", "/api/products/search?q=milk", "/api/inventory", "/"] * 5:
+        start = time.perf_counter()
+        requests.get(f"{base}{path}", timeout=10)
+        latencies.append(time.perf_counter() - start)
+
+    for asker in askers:
+        asker.join()
+    server.should_exit = True
+    thread.join()
+
+    worst = max(latencies)
+    llm_calls = main.async_backends.stats().get("huggingface", {}).get("calls", 0) - calls_before
+    print(f"{SLOW_REQUESTS} LLM requests of {LLM_DELAY}s in flight")
+    print(f"  other endpoints: {len(latencies)} requests, worst {worst * 1000:.0f}ms")
+    print(f"  LLM requests: {sorted(round(t, 1) for _, t in slow_results)}")
+    print(f"  answers: {set(answer for answer, _ in slow_results)}")
+    print(f"  async backends: {main.async_backends.stats()}")
+    assert len(slow_results) == SLOW_REQUESTS, f"only {len(slow_results)} LLM requests finished"
+    assert llm_calls == SLOW_REQUESTS, f"expected {SLOW_REQUESTS} concurrent LLM calls, made {llm_calls}"
+    assert worst < MAX_LATENCY, f"an endpoint took {worst:.2f}s while LLM calls were running"
+    print("PASS: event loop stayed responsive")
+
+
+if __name__ == "__main__":
+    test_endpoints_stay_responsive()
@@ -0,0 +1,36 @@
+"""
+Test script for the barcode index
+Saves an index holding GTINs and store-internal codes, memory-maps it back
+and checks that every code still resolves.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from barcode_index import BarcodeIndex
+
+
+def test_save_load_round_trip():
+    index = BarcodeIndex.from_pairs([
+        ("8901030865278", "milk"),   # EAN-13
+        ("1234567", "bread"),         # 7-digit store code
+        ("000123", "loose bananas"),  # shelf label
+    ])
+    path = os.path.join(tempfile.mkdtemp(), "barcodes.idx")
+    index.save(path)
+    loaded = BarcodeIndex.load(path)
+
+    print(f"codes before save: {len(index)}, after load: {len(loaded)}")
+    assert len(loaded) == len(index) == 3
+    for code, product in [("8901030865278", "milk"), ("1234567", "bread"), ("000123", "loose bananas")]:
+        print(f"  {code} -> {loaded.lookup(code)}")
+        assert loaded.lookup(code) == product
+    assert loaded.lookup("9999999") is None
+    print("PASS: GTIN and store-internal codes survive save/load")
+
+
+if __name__ == "__main__":
+    test_save_load_round_trip()
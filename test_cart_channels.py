@@ -0,0 +1,45 @@
+"""
+Test script for the cart channel hub
+Publishes to subscribed sockets and checks that a socket whose send fails
+is unsubscribed without leaving an unretrieved task exception behind.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cart_channels import CartChannelHub
+
+
+async def _broken_socket_is_unsubscribed():
+    hub = CartChannelHub(heartbeat_interval=5)
+    healthy, broken = hub.subscribe(1), hub.subscribe(1)
+    received = []
+
+    async def send_ok(text):
+        received.append(text)
+
+    async def send_broken(text):
+        raise ConnectionResetError("client went away")
+
+    pumps = [asyncio.create_task(hub.pump(healthy, send_ok)), asyncio.create_task(hub.pump(broken, send_broken))]
+    hub.publish(1, "checkout_ready", "Payment successful. Total: Rs. 50.00", total=50.0)
+    await asyncio.sleep(0.01)
+
+    print(f"  received: {received}  stats: {hub.stats()}")
+    assert len(received) == 1 and '"checkout_ready"' in received[0]
+    assert pumps[1].done() and pumps[1].exception() is None
+    assert hub.stats()["connections"] == 1
+    pumps[0].cancel()
+    await asyncio.gather(*pumps, return_exceptions=True)
+
+
+def test_broken_socket_is_unsubscribed():
+    asyncio.run(_broken_socket_is_unsubscribed())
+    print("PASS: a failing send unsubscribes the socket and ends its pump cleanly")
+
+
+if __name__ == "__main__":
+    test_broken_socket_is_unsubscribed()
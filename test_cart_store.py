@@ -0,0 +1,91 @@
+"""
+Test script for the server-side cart store
+Covers TTL eviction of abandoned carts and checkout validation that leaves
+the cart untouched when it fails.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cart_store import CartStore
+
+
+class RecordingJournal:
+    """Stands in for Persistence and records what the store writes"""
+
+    def __init__(self):
+        self.lines = []
+        self.cleared = []
+
+    def save_line(self, cart_id, name, unit_price, qty):
+        self.lines.append((cart_id, name, unit_price, qty))
+
+    def clear_cart(self, cart_id):
+        self.cleared.append(cart_id)
+
+
+def test_idle_carts_expire():
+    journal = RecordingJournal()
+    store = CartStore(ttl_seconds=0.2, journal=journal)
+    store.add_item("abandoned", "milk", 50, 2)
+    store.add_item("active", "bread", 40)
+    time.sleep(0.12)
+    store.get("active")  # touching a cart keeps it alive
+    time.sleep(0.12)
+    store.add_item("new", "eggs", 6)  # any access sweeps expired carts
+
+    print(f"  carts={list(store.carts)} stats={store.stats()}")
+    assert store.get("abandoned") is None
+    assert store.get("active")["itemCount"] == 1
+    assert store.stats()["evicted"] == 1
+    assert journal.cleared == ["abandoned"]
+    print("PASS: carts idle past the TTL are evicted and cleared from the journal")
+
+
+def test_checkout_validation_rolls_back():
+    journal = RecordingJournal()
+    store = CartStore(journal=journal)
+    store.add_item(7, "milk", 50, 2)
+    store.add_item(7, "bread", 39.99)
+    seen = []
+
+    def out_of_stock(snapshot):
+        seen.append(snapshot)
+        return {"error": "Not enough stock", "shortages": {"milk": 1}}
+
+    result = store.checkout(7, validate=out_of_stock)
+    print(f"  failed checkout: {result['problems']}")
+    assert result["problems"]["shortages"] == {"milk": 1}
+    assert seen[0]["total"] == 139.99
+    cart = store.get(7)
+    assert cart["itemCount"] == 3 and cart["total"] == 139.99, "a failed checkout must leave the cart intact"
+    assert journal.cleared == []
+
+    result = store.checkout(7, validate=lambda snapshot: None)
+    print(f"  checkout: {result['items']}")
+    assert "problems" not in result and result["total"] == 139.99
+    assert store.get(7)["itemCount"] == 0
+    assert journal.cleared == ["7"]
+    assert store.checkout(7) is None, "an empty cart has nothing to check out"
+    print("PASS: a failing validate leaves the cart intact; a passing one empties it")
+
+
+def test_reserve_hook_rolls_back():
+    store = CartStore()
+    store.add_item(3, "milk", 50)
+    result = store.add_item(3, "milk", 50, 5, reserve=lambda: {"error": "Not enough stock"})
+    assert result["problems"] == {"error": "Not enough stock"}
+    assert store.get(3)["itemCount"] == 1
+    result = store.update_item(3, "milk", 4, reserve=lambda: {"error": "Not enough stock"})
+    assert result["problems"] and store.get(3)["itemCount"] == 1
+    assert store.update_item(3, "milk", 4, reserve=lambda: None)["itemCount"] == 4
+    print("PASS: a failing reserve hook leaves the cart unchanged")
+
+
+if __name__ == "__main__":
+    test_idle_carts_expire()
+    test_checkout_validation_rolls_back()
+    test_reserve_hook_rolls_back()
@@ -0,0 +1,85 @@
+"""
+Test script for catalog reloads
+Checks that a failing reload listener leaves the old snapshot live, with
+no listener installs and no commit step run.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import catalog as catalog_module
+from catalog import Catalog, get_catalog, on_catalog_reload, swap_catalog
+
+
+def small_catalog(*names):
+    return Catalog({"version": 2, "products": [{"name": name, "price": 10, "stock": 5} for name in names]})
+
+
+def test_failing_listener_rolls_back():
+    before = get_catalog()
+    installed, committed = [], []
+
+    def good_listener(catalog):
+        names = sorted(catalog.products)
+        return lambda: installed.append(names)
+
+    def bad_listener(catalog):
+        raise RuntimeError("index build failed")
+
+    on_catalog_reload(good_listener)
+    on_catalog_reload(bad_listener)
+    try:
+        try:
+            swap_catalog(small_catalog("milk"), commit=lambda: committed.append(True))
+        except ValueError as e:
+            print(f"  rejected: {e}")
+            assert "bad_listener" in str(e)
+        else:
+            raise AssertionError("a failing listener should abort the swap")
+        assert get_catalog() is before, "the old snapshot stays live"
+        assert installed == [] and committed == [], "nothing is installed or committed"
+
+        # Once the listener is fixed the next swap goes through, one generation on
+        catalog_module._listeners.remove(bad_listener)
+        after = swap_catalog(small_catalog("milk", "bread"), commit=lambda: committed.append(True))
+        print(f"  generation {before.generation} -> {after.generation}")
+        assert get_catalog() is after
+        assert after.generation == before.generation + 1
+        assert installed == [["bread", "milk"]] and committed == [True]
+    finally:
+        for listener in (good_listener, bad_listener):
+            if listener in catalog_module._listeners:
+                catalog_module._listeners.remove(listener)
+        swap_catalog(before)
+    print("PASS: a failing listener keeps the old catalog and skips every install")
+
+
+def test_failing_commit_rolls_back():
+    before = get_catalog()
+    installed = []
+
+    def listener(catalog):
+        return lambda: installed.append(catalog.generation)
+
+    def commit():
+        raise OSError("disk full")
+
+    on_catalog_reload(listener)
+    try:
+        try:
+            swap_catalog(small_catalog("milk"), commit=commit)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("a failing commit should abort the swap")
+        assert get_catalog() is before and installed == []
+    finally:
+        catalog_module._listeners.remove(listener)
+    print("PASS: a failing commit step publishes nothing")
+
+
+if __name__ == "__main__":
+    test_failing_listener_rolls_back()
+    test_failing_commit_rolls_back()
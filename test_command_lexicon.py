@@ -0,0 +1,76 @@
+"""
+Test script for the command lexicon
+Checks that a stop in either table wins, that the native table takes
+precedence over English, and that commands only match as whole utterances,
+not as words inside a question.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from command_lexicon import CommandLexicon
+
+# Same shape as COMMAND_PATTERNS in the backends
+PATTERNS = {
+    "movement": {
+        "forward": ["forward", "go forward", "ahead"],
+        "stop": ["stop", "halt", "pause"]
+    },
+    "cart": ["show cart", "cart", "my items"],
+    "checkout": ["checkout", "pay", "bill", "check out"]
+}
+
+
+def check(lexicon, cases):
+    for text, language, expected in cases:
+        intent = lexicon.match(text, language)
+        print(f"  [{language}] {text!r} -> {intent}")
+        assert intent == expected, f"{text!r} ({language}): expected {expected}, got {intent}"
+
+
+def test_stop_wins():
+    lexicon = CommandLexicon.from_patterns(PATTERNS)
+    check(lexicon, [
+        ("aage chalo stop", "hi", "movement.stop"),
+        ("रुको", "hi", "movement.stop"),
+        ("munne po, nillu", "ta", "movement.stop"),
+        # English stop inside native or mixed speech
+        ("please stop", "hi", "movement.stop"),
+        ("stop the trolley", "ta", "movement.stop"),
+        ("vandi pay stop", "ta", "movement.stop"),
+    ])
+    assert lexicon.match("stop", "ta", fallback=None) is None
+    print("PASS: stop in either table wins over every other command")
+
+
+def test_native_before_english():
+    lexicon = CommandLexicon.from_patterns(PATTERNS)
+    check(lexicon, [
+        ("பில்", "ta", "checkout"),
+        ("munne po", "ta", "movement.forward"),
+        ("aage chalo please", "hi", "movement.forward"),
+        # Native match wins over an English command word in the same utterance
+        ("vandi pay", "ta", "cart"),
+        # English commands are the fallback
+        ("checkout", "hi", "checkout"),
+        ("show cart please", "hi", "cart"),
+    ])
+    print("PASS: native table first, English as the fallback")
+
+
+def test_questions_are_not_commands():
+    lexicon = CommandLexicon.from_patterns(PATTERNS)
+    check(lexicon, [
+        ("where is the bill counter", "ta", None),
+        ("can you show cart prices", "hi", None),
+        ("मुझे मदद चाहिए बिल कहाँ है", "hi", None),
+    ])
+    print("PASS: command words inside questions are left to the classifier")
+
+
+if __name__ == "__main__":
+    test_stop_wins()
+    test_native_before_english()
+    test_questions_are_not_commands()
@@ -2,7 +2,7 @@
 Test script to verify email functionality
 """
 
-from main import send_receipt_email
+from main import send_receipt_email, pricing
 
 # Test data
 test_cart = [
@@ -10,7 +10,7 @@ test_cart = [
     {"name": "Samsung Galaxy S24", "price": 699.99, "qty": 1}
 ]
 
-test_total = sum(item["price"] * item["qty"] for item in test_cart)
+priced_cart = pricing.price(test_cart)
 
 # Test sending email
 print("Testing email functionality...")
@@ -19,7 +19,7 @@ email = input("> ")
 
 if email:
     print(f"Sending test receipt to {email}...")
-    success = send_receipt_email(email, test_cart, test_total, "Test Payment")
+    success = send_receipt_email(email, priced_cart, "Test Payment")
     if success:
         print("Email sent successfully!")
     else:
@@ -0,0 +1,88 @@
+"""
+Test script for the stock ledger
+Covers reservations, all-or-nothing checkout commits, shortages and hold
+expiry.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from inventory import StockLedger
+
+
+def test_reserve_and_commit():
+    ledger = StockLedger({"Milk": 5, "bread": 2})
+    assert ledger.reserve("a", "milk", 3)
+    assert not ledger.reserve("b", "MILK", 3), "only 2 milk left to hold"
+    assert ledger.reserve("b", " milk ", 2)
+    assert not ledger.reserve("a", "caviar", 1), "untracked SKUs can't be held"
+    assert ledger.available("milk") == 0
+
+    assert ledger.commit("a", {"Milk": 3, "caviar": 1}) == {}
+    snapshot = ledger.snapshot()["milk"]
+    print(f"  after commit: {snapshot}")
+    assert snapshot == {"onHand": 2, "reserved": 2, "available": 0}
+    assert ledger.stats()["committed"] == 1
+    print("PASS: holds are checked atomically and commits turn them into stock decrements")
+
+
+def test_shortage_commits_nothing():
+    ledger = StockLedger({"milk": 5, "bread": 2})
+    ledger.reserve("a", "milk", 2)
+    ledger.reserve("a", "bread", 1)
+    ledger.reserve("b", "bread", 1)
+    # Cart a wants more bread than it holds and none is free
+    shortages = ledger.commit("a", {"milk": 2, "bread": 2})
+    print(f"  shortages: {shortages}")
+    assert shortages == {"bread": 1}
+    snapshot = ledger.snapshot()
+    assert snapshot["milk"]["onHand"] == 5 and snapshot["bread"]["onHand"] == 2, "nothing is committed"
+    assert snapshot["milk"]["reserved"] == 2, "the failed cart keeps its holds"
+    # Without a hold, a commit falls back to free stock
+    assert ledger.commit("c", {"milk": 3}) == {}
+    assert ledger.commit("d", {"milk": 1}) == {"milk": 1}
+    print("PASS: a short commit changes nothing and reports the missing units")
+
+
+def test_expired_holds_free_stock():
+    ledger = StockLedger({"milk": 2}, reservation_ttl=0.2)
+    ledger.reserve("idle", "milk", 2)
+    assert not ledger.reserve("other", "milk", 1)
+    time.sleep(0.25)
+    assert ledger.reserve("other", "milk", 2), "the idle cart's hold expired"
+    time.sleep(0.12)
+    assert ledger.touch("other", ["Milk"]) == 1
+    time.sleep(0.12)
+    assert ledger.available("milk") == 0, "touching a cart restarts its hold's TTL"
+    assert ledger.stats()["expired"] == 1
+    print("PASS: expired holds release stock and touch keeps active holds")
+
+
+def test_concurrent_reservations_never_oversell():
+    ledger = StockLedger({"milk": 100})
+    granted = []
+
+    def shopper(cart_id):
+        for _ in range(20):
+            if ledger.reserve(cart_id, "milk", 1):
+                granted.append(cart_id)
+
+    threads = [threading.Thread(target=shopper, args=(n,)) for n in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"  granted={len(granted)} available={ledger.available('milk')}")
+    assert len(granted) == 100 and ledger.available("milk") == 0
+    print("PASS: concurrent reservations never hold more than is on hand")
+
+
+if __name__ == "__main__":
+    test_reserve_and_commit()
+    test_shortage_commits_nothing()
+    test_expired_holds_free_stock()
+    test_concurrent_reservations_never_oversell()
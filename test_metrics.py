@@ -0,0 +1,70 @@
+"""
+Test script for the metrics module
+Checks the Prometheus text output of histograms (cumulative buckets, +Inf,
+_count and _sum, label escaping) and of counters and callback gauges.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import MetricsRegistry
+
+
+def test_histogram_output():
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency", ("stage",), buckets=(0.1, 0.5, 1.0))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        latency.observe(value, "llm")
+    latency.observe(0.2, 'say "hi"\n')
+    text = registry.render()
+    print(text)
+    lines = text.splitlines()
+    assert lines[:2] == ["# HELP trolley_stage_seconds Stage latency", "# TYPE trolley_stage_seconds histogram"]
+    assert lines[2:8] == [
+        # A value on a bucket bound counts in that bucket (le is inclusive)
+        'trolley_stage_seconds_bucket{stage="llm",le="0.1"} 2',
+        'trolley_stage_seconds_bucket{stage="llm",le="0.5"} 3',
+        'trolley_stage_seconds_bucket{stage="llm",le="1.0"} 3',
+        'trolley_stage_seconds_bucket{stage="llm",le="+Inf"} 4',
+        'trolley_stage_seconds_count{stage="llm"} 4',
+        'trolley_stage_seconds_sum{stage="llm"} 2.45',
+    ]
+    assert 'trolley_stage_seconds_count{stage="say \\"hi\\"\\n"} 1' in lines
+    assert text.endswith("\n")
+    print("PASS: histograms render cumulative buckets, count and sum per label set")
+
+
+def test_time_records_failures():
+    registry = MetricsRegistry(prefix="")
+    latency = registry.histogram("op_seconds", "Op latency", buckets=(60.0,))
+    try:
+        with latency.time():
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert "op_seconds_count 1" in registry.render().splitlines()
+    print("PASS: time() observes blocks that raise")
+
+
+def test_counters_and_callbacks():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("method", "status"))
+    requests.inc("GET", "200")
+    requests.inc("GET", "200", amount=2)
+    registry.gauge_callback("queue_depth", "Queue depth", lambda: {("llm",): 3, ("whisper",): None}, ("gate",))
+    registry.gauge_callback("broken", "Broken gauge", lambda: 1 / 0)
+    lines = registry.render().splitlines()
+    assert 'trolley_requests_total{method="GET",status="200"} 3' in lines
+    assert 'trolley_queue_depth{gate="llm"} 3' in lines
+    assert not any(line.startswith("trolley_queue_depth{gate=\"whisper\"") for line in lines)
+    # A failing callback renders its header only and doesn't break the scrape
+    assert lines[-2:] == ["# HELP trolley_broken Broken gauge", "# TYPE trolley_broken gauge"]
+    print("PASS: counters and callback gauges render, None and failing values are skipped")
+
+
+if __name__ == "__main__":
+    test_histogram_output()
+    test_time_records_failures()
+    test_counters_and_callbacks()
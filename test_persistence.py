@@ -0,0 +1,86 @@
+"""
+Test script for the write-behind persistence layer
+Checks that a write that keeps failing is retried, then dropped without
+losing or reordering the writes queued behind it, and that flush() and
+close() wait for queued writes.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from persistence import INSERT_ORDER, Persistence
+
+
+def temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def cleanup(path):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def test_failing_write_is_dropped():
+    path = temp_db()
+    store = Persistence(path, flush_interval=0.01, retry_interval=0.05, max_attempts=3)
+    try:
+        store.save_line("c1", "milk", 5000, 1)
+        # total is NOT NULL: this write can never succeed
+        store._queue.put((INSERT_ORDER, ("c1", None, "cash", None, "[]", time.time())))
+        store.save_line("c1", "bread", 4000, 2)
+        assert store.flush() is False, "flush reports writes awaiting retry"
+        print(f"  after the first batch: {store.stats()}")
+        assert store.load_carts() == {"c1": [("milk", 5000, 1)]}, "writes after the failing one wait, in order"
+
+        deadline = time.monotonic() + 5
+        while store.dropped == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert store.flush() is True
+        print(f"  after the drop: {store.stats()}")
+        assert store.dropped == 1
+        assert store.load_carts() == {"c1": [("milk", 5000, 1), ("bread", 4000, 2)]}
+        assert store.recent_orders() == []
+    finally:
+        store.close()
+        cleanup(path)
+    print("PASS: a poison write is dropped after max_attempts and the rest are kept")
+
+
+def test_flush_and_close():
+    path = temp_db()
+    store = Persistence(path, flush_interval=0.5)
+    try:
+        store.save_line("c2", "eggs", 700, 12)
+        store.record_order("c2", 8400, "upi", None, [{"name": "eggs", "price": 7.0, "qty": 12}])
+        started = time.monotonic()
+        assert store.flush() is True
+        assert store.load_carts() == {"c2": [("eggs", 700, 12)]}
+        assert store.recent_orders()[0]["total"] == 84.0
+        print(f"  flush waited {time.monotonic() - started:.2f}s")
+
+        store.save_line("c2", "eggs", 700, 0)
+        store.clear_cart("c3")
+    finally:
+        store.close()
+    assert not store._writer.is_alive()
+    # close() committed the delete still in the queue
+    reopened = Persistence(path)
+    try:
+        assert reopened.load_carts() == {}
+        assert len(reopened.recent_orders()) == 1
+    finally:
+        reopened.close()
+        cleanup(path)
+    print("PASS: flush waits for queued writes and close commits the rest")
+
+
+if __name__ == "__main__":
+    test_failing_write_is_dropped()
+    test_flush_and_close()
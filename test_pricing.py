@@ -0,0 +1,73 @@
+"""
+Test script for the pricing engine
+Checks paise rounding, the GST split of GST-inclusive prices and how
+discounts are spread over lines.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pricing import PricingEngine, allocate, to_paise, to_paise_array
+
+CATEGORIES = {"milk": "dairy", "bread": "bakery", "shampoo": "personal care", "juice": "beverages"}
+
+
+def test_paise_rounding():
+    assert to_paise(19.99) == 1999
+    assert to_paise("12.50") == 1250
+    assert to_paise(0.1 + 0.2) == 30, "float noise must not lose a paisa"
+    assert list(to_paise_array([19.99, 0.29, 1099.95])) == [1999, 29, 109995]
+    engine = PricingEngine(categories=CATEGORIES)
+    priced = engine.price([{"name": "milk", "price": 0.1, "qty": 3}, {"name": "bread", "price": 0.2, "qty": 1}])
+    print(f"  0.1 x 3 + 0.2 -> {priced.total} paise")
+    assert priced.total == 50
+    print("PASS: rupee prices become exact integer paise")
+
+
+def test_gst_is_split_out_of_inclusive_prices():
+    engine = PricingEngine(categories=CATEGORIES)
+    priced = engine.price([
+        {"name": "shampoo", "price": 118, "qty": 1},  # 18%: Rs. 100 + Rs. 18 GST
+        {"name": "bread", "price": 105, "qty": 2},    # 5%: 2 x (Rs. 100 + Rs. 5)
+        {"name": "milk", "price": 50, "qty": 1},      # exempt
+        {"name": "juice", "price": 100, "qty": 1},    # 12%: 89.29 + 10.71
+    ])
+    lines = {line["name"]: line for line in priced.lines()}
+    print(f"  gst by rate: {priced.tax_by_rate()}")
+    assert priced.total == 11800 + 21000 + 5000 + 10000, "GST never changes what the customer pays"
+    assert lines["shampoo"]["gst"] == 18.0 and lines["shampoo"]["gstRate"] == 18.0
+    assert lines["bread"]["gst"] == 10.0
+    assert lines["milk"]["gst"] == 0.0
+    assert lines["juice"]["gst"] == 10.71, "100 * 12 / 112 = 10.714, rounded to the paisa"
+    assert priced.tax_by_rate() == {"5%": 1000, "12%": 1071, "18%": 1800}
+    assert priced.tax_total == 3871
+    # Products not in the category map use the default (general, 18%)
+    assert engine.rate_bps("unknown product") == 1800
+    print("PASS: GST is split out of inclusive prices at each line's rate")
+
+
+def test_discounts_add_up_exactly():
+    assert list(allocate(100, [1000, 1000, 1000])) == [34, 33, 33]
+    assert sum(allocate(999, [3000, 5000, 7])) == 999
+    assert list(allocate(500, [100, 200])) == [100, 200], "never more than the lines are worth"
+    engine = PricingEngine(categories=CATEGORIES)
+    priced = engine.price(
+        [{"name": "milk", "price": 50, "qty": 2}, {"name": "shampoo", "price": 118, "qty": 1}],
+        line_discounts=[5000, 0],
+        order_discount=1000,
+    )
+    print(f"  summary: {priced.summary()}")
+    assert priced.discount_total == 6000
+    assert priced.total == 10000 + 11800 - 6000
+    # A line discount never takes a line below zero
+    capped = engine.price([{"name": "milk", "price": 50, "qty": 1}], line_discounts=[9999])
+    assert capped.total == 0 and capped.discount_total == 5000
+    print("PASS: line and order discounts add up to the paisa and are capped per line")
+
+
+if __name__ == "__main__":
+    test_paise_rounding()
+    test_gst_is_split_out_of_inclusive_prices()
+    test_discounts_add_up_exactly()
@@ -0,0 +1,51 @@
+"""
+Test script for the product search index
+Checks that every word of a multi-word query can bring in results, not just
+the rarest one.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from product_search import ProductSearchIndex
+
+
+def build_index():
+    index = ProductSearchIndex()
+    index.add("organic brown rice", "organic brown rice", category="grains")
+    index.add("bread", "bread", category="bakery")
+    index.add("whole wheat bread", "whole wheat bread", category="bakery")
+    index.add("bread rolls", "bread rolls", category="bakery")
+    index.add("milk", "milk", ["amul"], "dairy")
+    return index
+
+
+def test_multi_word_query_reaches_every_word():
+    index = build_index()
+    # "brown" is the rarest word, but the shopper wants bread
+    results = [r["name"] for r in index.search("brown bread")]
+    print(f"  'brown bread' -> {results}")
+    assert results[0] == "bread"
+    assert {"bread", "whole wheat bread", "organic brown rice"} <= set(results)
+
+    # A typo in the rare word must not hide the common one either
+    results = [r["name"] for r in index.search("bred rolls")]
+    print(f"  'bred rolls' -> {results}")
+    assert results[0] == "bread rolls"
+    print("PASS: multi-word queries score candidates from every query word")
+
+
+def test_all_words_rank_above_partial_matches():
+    index = build_index()
+    results = index.search("whole wheat bread")
+    print(f"  'whole wheat bread' -> {[(r['name'], r['score']) for r in results]}")
+    assert results[0]["name"] == "whole wheat bread"
+    assert results[0]["score"] > results[1]["score"]
+    print("PASS: products matching every query word rank first")
+
+
+if __name__ == "__main__":
+    test_multi_word_query_reaches_every_word()
+    test_all_words_rank_above_partial_matches()
@@ -0,0 +1,130 @@
+"""
+Test script for the promotion engine
+Evaluates small carts against hand-written rules (BOGO, category percent,
+bundles, spend thresholds) and checks the discounts in paise.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from promotions import PromotionEngine
+
+CATEGORIES = {"milk": "dairy", "shampoo": "personal care", "bread": "bakery", "butter": "dairy"}
+
+
+def test_bogo():
+    engine = PromotionEngine([{"id": "milk-b2g1", "type": "bogo", "sku": "milk", "buy": 2, "free": 1}], CATEGORIES)
+    result = engine.evaluate([{"name": "milk", "price": 50, "qty": 5}])
+    print(f"  5 milk, buy 2 get 1: {result.line_discounts}")
+    # Only one complete group of three in five units
+    assert result.line_discounts == [5000]
+    assert engine.evaluate([{"name": "milk", "price": 50, "qty": 2}]).line_discounts == [0]
+    print("PASS: BOGO frees one unit per complete group")
+
+
+def test_best_line_rule_wins():
+    engine = PromotionEngine([
+        {"id": "dairy-10", "type": "category_percent", "category": "dairy", "percent": 10},
+        {"id": "milk-bogo", "type": "bogo", "sku": "milk", "buy": 1, "free": 1},
+    ], CATEGORIES)
+    result = engine.evaluate([
+        {"name": "milk", "price": 50, "qty": 2},
+        {"name": "butter", "price": 55.55, "qty": 1},
+        {"name": "bread", "price": 40, "qty": 1},
+    ])
+    print(f"  line discounts: {result.line_discounts}, applied: {result.applied}")
+    # Milk: BOGO (Rs. 50) beats 10% (Rs. 10); rules never stack on one line
+    assert result.line_discounts[0] == 5000
+    # Butter: 10% of 5555 paise, rounded down
+    assert result.line_discounts[1] == 555
+    assert result.line_discounts[2] == 0, "bakery has no rule"
+    assert {a["id"]: a["discount"] for a in result.applied} == {"milk-bogo": 50.0, "dairy-10": 5.55}
+    print("PASS: each line gets its single best line rule")
+
+
+def test_bundle_skips_promoted_units():
+    engine = PromotionEngine([
+        {"id": "breakfast", "type": "bundle", "skus": ["bread", "butter"], "price": 80},
+        {"id": "butter-bogo", "type": "bogo", "sku": "butter", "buy": 1, "free": 1},
+    ], CATEGORIES)
+    result = engine.evaluate([{"name": "bread", "price": 40, "qty": 1}, {"name": "butter", "price": 60, "qty": 2}])
+    print(f"  butter on BOGO: {result.line_discounts}")
+    assert result.line_discounts == [0, 6000], "butter units already on BOGO can't join a bundle"
+
+    result = engine.evaluate([{"name": "bread", "price": 40, "qty": 1}, {"name": "butter", "price": 60, "qty": 1}])
+    print(f"  one bundle: {result.line_discounts}")
+    # Rs. 20 saving split by price: bread 40/100, butter the rest
+    assert result.line_discounts == [800, 1200]
+    assert result.total_discount == 2000
+    print("PASS: bundles only use units with no line rule")
+
+
+def test_threshold():
+    engine = PromotionEngine([
+        {"id": "flat-50", "type": "threshold", "min_total": 500, "discount": 50},
+        {"id": "pct-5", "type": "threshold", "min_total": 1500, "percent": 5},
+    ], CATEGORIES)
+    assert engine.evaluate([{"name": "bread", "price": 499.99, "qty": 1}]).order_discount == 0
+    result = engine.evaluate([{"name": "bread", "price": 500, "qty": 1}])
+    assert result.order_discount == 5000 and result.applied[0]["id"] == "flat-50"
+    # At Rs. 1500 both apply; 5% (Rs. 75) beats the flat Rs. 50
+    result = engine.evaluate([{"name": "shampoo", "price": 750, "qty": 2}])
+    print(f"  Rs. 1500 cart: {result.order_discount} paise via {result.applied}")
+    assert result.order_discount == 7500 and result.applied[0]["id"] == "pct-5"
+    print("PASS: the best threshold reached by the subtotal applies")
+
+
+def test_threshold_after_line_discounts():
+    engine = PromotionEngine([
+        {"id": "milk-bogo", "type": "bogo", "sku": "milk", "buy": 1, "free": 1},
+        {"id": "flat-50", "type": "threshold", "min_total": 500, "discount": 50},
+    ], CATEGORIES)
+    # Rs. 600 of milk, Rs. 300 after BOGO: below the threshold
+    result = engine.evaluate([{"name": "milk", "price": 50, "qty": 12}])
+    assert result.line_discounts == [30000] and result.order_discount == 0
+    print("PASS: thresholds look at the subtotal after line discounts")
+
+
+def test_duplicate_lines_are_merged():
+    engine = PromotionEngine([{"id": "milk-bogo", "type": "bogo", "sku": "milk", "buy": 1, "free": 1}], CATEGORIES)
+    cart = [
+        {"name": "milk", "price": 50, "qty": 1},
+        {"name": "bread", "price": 40, "qty": 1},
+        {"name": " Milk", "price": 50, "qty": 1},
+    ]
+    result = engine.evaluate(cart)
+    print(f"  line discounts: {result.line_discounts}")
+    assert sum(result.line_discounts) == 5000, "two single-milk lines make one BOGO"
+    assert result.line_discounts[1] == 0
+    assert len(result.line_discounts) == len(cart)
+    assert [a["id"] for a in result.applied] == ["milk-bogo"]
+    print("PASS: lines for the same SKU are merged before rules are matched")
+
+
+def test_duplicate_lines_with_bundle():
+    engine = PromotionEngine([
+        {"id": "breakfast", "type": "bundle", "skus": ["bread", "butter"], "price": 80},
+    ], CATEGORIES)
+    cart = [
+        {"name": "bread", "price": 40, "qty": 1},
+        {"name": "butter", "price": 60, "qty": 2},
+        {"name": "bread", "price": 40, "qty": 1},
+    ]
+    result = engine.evaluate(cart)
+    print(f"  line discounts: {result.line_discounts}")
+    # Two bread + two butter make two bundles, Rs. 20 off each
+    assert sum(result.line_discounts) == 4000
+    assert len(result.line_discounts) == len(cart)
+    print("PASS: merged lines count towards bundles")
+
+
+if __name__ == "__main__":
+    test_bogo()
+    test_best_line_rule_wins()
+    test_bundle_skips_promoted_units()
+    test_threshold()
+    test_threshold_after_line_discounts()
+    test_duplicate_lines_are_merged()
+    test_duplicate_lines_with_bundle()
@@ -0,0 +1,114 @@
+"""
+Test script for the shopping-list route planner
+Plans routes on small hand-drawn floors and checks them against brute force.
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from route_planner import plan_route
+from store_routing import StoreGraph
+
+# The storeroom (bottom right) is walled off from the shop floor
+WALLED_FLOOR = """
+.....
+.....
+...##
+...#.
+"""
+
+
+# An open floor with one shelf row in the middle
+OPEN_FLOOR = """
+.......
+.......
+.###...
+.......
+.......
+"""
+
+OPEN_LOCATIONS = {
+    "entrance": (0, 0), "checkout": (4, 0),
+    "milk": (0, 6), "bread": (4, 6), "eggs": (1, 3), "rice": (3, 3), "tea": (2, 5), "soap": (2, 0)
+}
+
+
+def brute_force(graph, start, stops, end=None):
+    """Shortest walk over every visiting order"""
+    best = None
+    for order in itertools.permutations(stops):
+        walk = [start, *order] + ([end] if end else [])
+        steps = sum(graph.steps(a, b) for a, b in zip(walk, walk[1:]))
+        best = steps if best is None else min(best, steps)
+    return best
+
+
+def test_exact_matches_brute_force():
+    graph = StoreGraph.from_floorplan(OPEN_FLOOR, OPEN_LOCATIONS)
+    items = ["milk", "bread", "eggs", "rice", "tea", "soap"]
+    for size in range(1, len(items) + 1):
+        stops = items[:size]
+        for end in (None, "checkout"):
+            route = plan_route(graph, "entrance", stops, end=end)
+            expected = brute_force(graph, "entrance", stops, end)
+            print(f"  {stops} end={end}: {route['order']} in {route['steps']} steps")
+            assert route["method"] == "exact"
+            assert route["steps"] == expected, f"expected {expected}, got {route['steps']}"
+            assert sorted(route["order"][:size]) == sorted(stops)
+            if end:
+                assert route["order"][-1] == end
+            # The legs really are that long
+            walked = sum(len(leg["path"]) for leg in route["legs"])
+            assert walked == route["steps"]
+    print("PASS: exact plans match brute force, with and without an end location")
+
+
+def test_heuristic_matches_exact_on_small_lists():
+    graph = StoreGraph.from_floorplan(OPEN_FLOOR, OPEN_LOCATIONS)
+    stops = ["milk", "bread", "eggs", "rice", "tea"]
+    exact = plan_route(graph, "entrance", stops, end="checkout")
+    heuristic = plan_route(graph, "entrance", stops, end="checkout", exact_limit=0)
+    print(f"  exact {exact['steps']}, heuristic {heuristic['steps']}")
+    assert heuristic["method"] == "heuristic"
+    assert heuristic["steps"] >= exact["steps"]
+    assert sorted(heuristic["order"][:-1]) == sorted(stops) and heuristic["order"][-1] == "checkout"
+    print("PASS: the heuristic visits every stop and never beats the exact plan")
+
+
+def test_shared_shelves_and_unknown_items():
+    graph = StoreGraph.from_floorplan(OPEN_FLOOR, {**OPEN_LOCATIONS, "butter": (0, 6)})
+    route = plan_route(graph, "entrance", ["Milk", "butter", "caviar", "soap"])
+    print(f"  order {route['order']}, unknown {route['unknown']}")
+    assert route["unknown"] == ["caviar"]
+    assert route["order"] == ["soap", "Milk", "butter"]
+    assert route["steps"] == brute_force(graph, "entrance", ["soap", "milk"])
+    # The second item on a shelf needs no walking
+    assert route["legs"][2]["path"] == []
+    empty = plan_route(graph, "entrance", ["caviar"])
+    assert empty["order"] == [] and empty["method"] == "none"
+    print("PASS: items on one shelf are a single stop and unknown items are reported")
+
+
+def test_unreachable_end_is_rejected():
+    graph = StoreGraph.from_floorplan(WALLED_FLOOR, {
+        "entrance": (0, 0), "milk": (1, 2), "storeroom": (3, 4)
+    })
+    for end, message in (("storeroom", "can't be reached"), ("loading bay", "Unknown end")):
+        try:
+            plan_route(graph, "entrance", ["milk"], end=end)
+        except ValueError as e:
+            print(f"  end={end!r}: {e}")
+            assert message in str(e)
+        else:
+            raise AssertionError(f"end={end!r} should be rejected")
+    print("PASS: unknown or unreachable end locations raise ValueError")
+
+
+if __name__ == "__main__":
+    test_exact_matches_brute_force()
+    test_heuristic_matches_exact_on_small_lists()
+    test_shared_shelves_and_unknown_items()
+    test_unreachable_end_is_rejected()
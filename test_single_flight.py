@@ -0,0 +1,104 @@
+"""
+Test script for single-flight call coalescing
+Checks that concurrent duplicates share one call and its exception, and
+that a failed call nobody is waiting for doesn't leave an unretrieved
+exception behind.
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import SingleFlight, flight_key
+
+
+def test_threads_share_the_error():
+    flights = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.05)
+        raise RuntimeError("translator down")
+
+    errors = []
+
+    def caller():
+        try:
+            flights.do(flight_key("translate", "hi", "Where is milk?"), failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"  calls={len(calls)} errors={len(errors)} stats={flights.stats()['operations']['translate']}")
+    assert len(calls) == 1 and len(errors) == 5
+    assert flights.in_flight() == 0
+    # Nothing is cached: the next call runs again
+    try:
+        flights.do(flight_key("translate", "hi", "where is milk"), failing)
+    except RuntimeError:
+        pass
+    assert len(calls) == 2
+    print("PASS: concurrent thread callers share one call and its exception")
+
+
+async def _async_callers_share_the_error():
+    flights = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise TimeoutError("llm timed out")
+
+    key = flight_key("llm", "en", "where is the sale")
+    results = await asyncio.gather(*(flights.do_async(key, failing) for _ in range(4)), return_exceptions=True)
+    print(f"  calls={len(calls)} results={[type(r).__name__ for r in results]}")
+    assert len(calls) == 1
+    assert all(isinstance(r, TimeoutError) for r in results)
+    assert flights.stats()["operations"]["llm"]["errors"] == 1
+
+
+async def _abandoned_failure_is_retrieved(unretrieved):
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context["message"]))
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend error")
+
+    waiter = asyncio.create_task(flights.do_async(flight_key("llm", "en", "hello"), failing))
+    await asyncio.sleep(0)
+    waiter.cancel()  # the only caller gives up; the shared call keeps running and fails
+    await asyncio.gather(waiter, return_exceptions=True)
+    await asyncio.sleep(0.05)
+    assert flights.in_flight() == 0
+
+
+def test_async_callers_share_the_error():
+    asyncio.run(_async_callers_share_the_error())
+    print("PASS: concurrent coroutines share one call and its exception")
+
+
+def test_abandoned_failure_is_retrieved():
+    unretrieved = []
+    asyncio.run(_abandoned_failure_is_retrieved(unretrieved))
+    gc.collect()
+    print(f"  loop errors: {unretrieved}")
+    assert not any("never retrieved" in message for message in unretrieved)
+    print("PASS: a failed call with no waiters leaves no unretrieved exception")
+
+
+if __name__ == "__main__":
+    test_threads_share_the_error()
+    test_async_callers_share_the_error()
+    test_abandoned_failure_is_retrieved()
@@ -0,0 +1,118 @@
+"""
+Test script for the trolley control channel
+Runs two connections to one trolley and checks that a stop on either one
+cancels motion still queued on the other, that speed survives a reconnect,
+and that a failing command is reported without killing the connection.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trolley_control import TrolleyControlHub, encode_frame
+
+
+class Connection:
+    """One simulated socket: frames go in through a queue, replies are collected"""
+
+    def __init__(self, controller):
+        self.inbox = asyncio.Queue()
+        self.replies = []
+        self.task = asyncio.create_task(controller.serve(self.inbox.get, self.send))
+
+    async def send(self, frame):
+        self.replies.append(frame)
+
+    async def frame(self, *fields):
+        await self.inbox.put(encode_frame(*fields))
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def reply(self, seq):
+        return next((r for r in self.replies if r.startswith(f"[{seq},")), None)
+
+    async def close(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+async def _stop_preempts_other_connection():
+    gate = asyncio.Event()
+
+    async def drive(trolley_id, intent):
+        if intent == "movement.forward":
+            await gate.wait()  # the motor write for "forward" is still in progress
+
+    hub = TrolleyControlHub(on_command=drive)
+    a, b = Connection(hub.controller(1)), Connection(hub.controller(1))
+    await b.frame(1, "m", "f")  # applying, blocked on the motor
+    await b.frame(2, "m", "l")  # queued behind it on connection b
+    await a.frame(1, "s")       # stop from another device
+    gate.set()
+    await b.frame(3, "p")
+    await asyncio.sleep(0.01)
+
+    print(f"  a: {a.replies}  b: {b.replies}")
+    assert a.reply(1).startswith('[1,"a","movement","stop"')
+    assert b.reply(2) == '[2,"x"]', "queued turn must not run after the stop"
+    assert hub.stats(1)["direction"] == "stop"
+    await a.close()
+    await b.close()
+
+
+async def _speed_survives_reconnect():
+    hub = TrolleyControlHub()
+    first = Connection(hub.controller(7))
+    await first.frame(1, "v", "+")
+    await first.frame(2, "v", "+")
+    await asyncio.sleep(0.01)
+    await first.close()
+
+    second = Connection(hub.controller(7))
+    await second.frame(1, "v", "+")  # a new connection starts its own sequence
+    await asyncio.sleep(0.01)
+    print(f"  speed after reconnect: {hub.stats(7)['speed']}")
+    assert second.reply(1).startswith('[1,"a","speed","increase"')
+    assert hub.stats(7)["speed"] == 4
+    await second.close()
+
+
+async def _failed_command_keeps_dispatcher():
+    async def drive(trolley_id, intent):
+        if intent == "movement.left":
+            raise RuntimeError("motor controller offline")
+
+    hub = TrolleyControlHub(on_command=drive)
+    conn = Connection(hub.controller(3))
+    await conn.frame(1, "m", "l")
+    await asyncio.sleep(0.01)
+    await conn.frame(2, "m", "r")
+    await asyncio.sleep(0.01)
+    print(f"  replies: {conn.replies}")
+    assert conn.reply(1) == '[1,"e","command failed"]'
+    assert conn.reply(2).startswith('[2,"a","movement","right"')
+    assert hub.stats(3)["failed"] == 1
+    await conn.close()
+
+
+def test_stop_preempts_other_connection():
+    asyncio.run(_stop_preempts_other_connection())
+    print("PASS: a stop on one connection cancels motion queued on another")
+
+
+def test_speed_survives_reconnect():
+    asyncio.run(_speed_survives_reconnect())
+    print("PASS: speed belongs to the trolley, not the connection")
+
+
+def test_failed_command_keeps_dispatcher():
+    asyncio.run(_failed_command_keeps_dispatcher())
+    print("PASS: a failing command is reported and later commands still run")
+
+
+if __name__ == "__main__":
+    test_stop_preempts_other_connection()
+    test_speed_survives_reconnect()
+    test_failed_command_keeps_dispatcher()
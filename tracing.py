@@ -0,0 +1,273 @@
+"""
+Tracing Module
+Spans around the stages of the voice and ask pipelines (recording, WAV
+write, Whisper, each LLM backend, translation, TTS) and checkout, so a slow
+request shows which stage it spent its time in.
+
+Spans follow the current context through async code, through Starlette's
+threadpool and, via wrap_context(), through our own thread pools. Each
+HTTP request gets a root span that continues an incoming W3C traceparent
+header. The trace id is returned in the X-Trace-Id response header.
+
+Set TRACE_EXPORTER:
+- none (default): spans cost almost nothing.
+- console: spans are printed as JSON lines.
+- file: spans are appended to TRACE_FILE (default traces.jsonl) for
+  offline inspection.
+- otel: spans go to whatever OpenTelemetry provider the process has
+  configured, e.g. an OTLP exporter under opentelemetry-instrument.
+
+When the OpenTelemetry SDK is installed, console and file also use it,
+through its ConsoleSpanExporter. Without the SDK, a built-in tracer writes
+spans in a similar JSON layout.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.propagate import extract as otel_extract
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+    OTEL_SDK_AVAILABLE = True
+except ImportError:
+    OTEL_SDK_AVAILABLE = False
+
+_current_span = contextvars.ContextVar("trolley_span", default=None)
+_tracer = None  # set by configure_tracing()
+
+
+def _attribute(value):
+    # Span attributes must be primitives
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "end_ns", "status", "events")
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = {k: _attribute(v) for k, v in (attributes or {}).items()}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "UNSET"
+        self.events = []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = _attribute(value)
+
+    def update_name(self, name):
+        self.name = name
+
+    def record_exception(self, error):
+        self.status = "ERROR"
+        self.events.append({"name": "exception", "timestamp": time.time_ns(),
+                            "attributes": {"exception.type": type(error).__name__, "exception.message": str(error)}})
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "context": {"trace_id": f"0x{self.trace_id}", "span_id": f"0x{self.span_id}"},
+            "parent_id": f"0x{self.parent_id}" if self.parent_id else None,
+            "start_time": self.start_ns,
+            "end_time": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "status": {"status_code": self.status},
+            "attributes": self.attributes,
+            "events": self.events
+        }
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def update_name(self, name):
+        pass
+
+    def record_exception(self, error):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter:
+    """Writes each finished span as one JSON line"""
+
+    def __init__(self, out):
+        self.out = out
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+
+class Tracer:
+    """Built-in tracer used when the OpenTelemetry SDK is not installed"""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.enabled = exporter is not None
+
+    @contextmanager
+    def span(self, name, traceparent=None, **attributes):
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = parse_traceparent(traceparent) or (secrets.token_hex(16), None)
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.exporter.export(span)
+
+
+class OpenTelemetryTracer:
+    """Spans through the OpenTelemetry API and the process's tracer provider"""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name, traceparent=None, **attributes):
+        context = otel_extract({"traceparent": traceparent}) if traceparent else None
+        with self.tracer.start_as_current_span(name, context=context,
+                                               attributes={k: _attribute(v) for k, v in attributes.items()}) as span:
+            yield span
+
+
+def trace_id_of(span):
+    """Hex trace id of a built-in or OpenTelemetry span"""
+    if isinstance(span, Span):
+        return span.trace_id
+    if span is NOOP_SPAN:
+        return None
+    return format(span.get_span_context().trace_id, "032x")
+
+
+def parse_traceparent(header):
+    """(trace id, parent span id) from a W3C traceparent header, or None"""
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == "0" * 32:
+        return None
+    return parts[1], parts[2]
+
+
+def configure_tracing(exporter=None, path=None, service="trolley"):
+    """
+    Choose where spans go
+
+    Args:
+        exporter (str): none, console, file or otel (defaults to TRACE_EXPORTER)
+        path (str): File for the file exporter (defaults to TRACE_FILE or traces.jsonl)
+        service (str): service.name resource attribute for OpenTelemetry
+
+    Returns:
+        Tracer or OpenTelemetryTracer: The tracer now used by span()
+    """
+    global _tracer
+    exporter = (exporter or os.getenv("TRACE_EXPORTER", "none")).lower()
+    if exporter == "otel" and OTEL_AVAILABLE:
+        _tracer = OpenTelemetryTracer(otel_trace.get_tracer(service))
+        return _tracer
+    if exporter not in ("console", "file"):
+        _tracer = Tracer()
+        return _tracer
+    if exporter == "file":
+        path = path or os.getenv("TRACE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces.jsonl"))
+        out = open(path, "a", encoding="utf-8")
+    else:
+        out = sys.stdout
+    if OTEL_SDK_AVAILABLE:
+        provider = TracerProvider(resource=Resource.create({"service.name": service}))
+        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter(out=out)))
+        _tracer = OpenTelemetryTracer(provider.get_tracer(service))
+    else:
+        _tracer = Tracer(JsonLinesExporter(out))
+    print(f"Tracing enabled: {exporter}{f' ({path})' if exporter == 'file' else ''}")
+    return _tracer
+
+
+def span(name, **attributes):
+    """Context manager for a span, child of the current one"""
+    return _tracer.span(name, **attributes)
+
+
+def traced(name):
+    """Decorator wrapping every call in a span"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def wrap_context(fn):
+    """Run fn in the caller's context (current span) when a thread pool calls it"""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1") or None
+        method = scope.get("method", "")
+        with _tracer.span(f"{method} {scope.get('path', '')}", traceparent=traceparent,
+                          **{"http.method": method, "http.target": scope.get("path", "")}) as root:
+            async def send_with_trace(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"x-trace-id", trace_id_of(root).encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                root.update_name(f"{method} {route}")
+                root.set_attribute("http.route", route)
+
+
+configure_tracing()
@@ -0,0 +1,286 @@
+"""
+Trolley Control Module
+Persistent low-latency control channel for trolleys.
+
+Frames are compact JSON arrays: [seq, op, arg?, lang?]
+  ops from the client:  "m" move (arg f/b/l/r), "s" stop, "v" speed (arg +/-),
+                        "t" text command (arg text, optional language), "p" ping
+  ops from the server:  [seq, "a", action, detail, latency_us]  applied
+                        [seq, "x"]                              superseded (coalesced)
+                        [seq, "e", message]                     error
+                        [seq, "p"]                              pong
+
+Movement and speed commands are coalesced per connection (latest wins) and
+stop is applied immediately, ahead of anything still pending. Each
+connection gets its own controller with its own sequence numbers and
+pending commands. Motion state, the stop fence and statistics belong to the
+trolley, so a stop sent on any connection cancels motion still queued on
+the others.
+"""
+
+import asyncio
+import bisect
+import json
+import time
+
+MOTION_CODES = {"f": "forward", "b": "backward", "l": "left", "r": "right"}
+SPEED_CODES = {"+": "increase", "-": "decrease"}
+
+
+def encode_frame(*fields):
+    """Encode a control frame as a compact JSON array"""
+    return json.dumps(fields, separators=(",", ":"), ensure_ascii=False)
+
+
+class LatencyHistogram:
+    """Fixed log-scale latency histogram (microseconds)"""
+
+    BOUNDS_US = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, latency_us):
+        self.counts[bisect.bisect_left(self.BOUNDS_US, latency_us)] += 1
+        self.count += 1
+        self.total_us += latency_us
+        if latency_us > self.max_us:
+            self.max_us = latency_us
+
+    def percentile(self, p):
+        """Upper bound of the bucket containing the p-th percentile"""
+        if not self.count:
+            return 0
+        target = self.count * p / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.BOUNDS_US[index], self.max_us) if index < len(self.BOUNDS_US) else self.max_us
+        return self.max_us
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_us / self.count, 1) if self.count else 0,
+            "p50_us": self.percentile(50),
+            "p95_us": self.percentile(95),
+            "p99_us": self.percentile(99),
+            "max_us": self.max_us,
+            "buckets": {f"le_{bound}": count for bound, count in zip(self.BOUNDS_US + ["inf"], self.counts)}
+        }
+
+
+class TrolleyState:
+    """Motion state, stop fence and statistics of one trolley, shared by its connections"""
+
+    def __init__(self):
+        self.direction = "stop"
+        self.speed = 1
+        self.last_stop_ns = 0  # commands received before this are never applied
+        self.histogram = LatencyHistogram()
+        self.stop_histogram = LatencyHistogram()
+        self.received = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.connections = 0
+
+
+class TrolleyController:
+    def __init__(self, trolley_id, resolve_text=None, on_command=None, state=None):
+        """
+        Command pipeline for one connection to a trolley
+
+        Args:
+            trolley_id (int): Trolley identifier
+            resolve_text (callable): (text, language) -> intent label or None, for "t" frames
+            on_command (coroutine function): (trolley_id, intent) hook that drives the hardware
+            state (TrolleyState): The trolley's shared state
+        """
+        self.trolley_id = trolley_id
+        self.resolve_text = resolve_text
+        self.on_command = on_command
+        self.state = state or TrolleyState()
+        self.last_seq = 0
+        self._pending_motion = None  # (seq, intent, received_ns)
+        self._pending_speed = None
+        self._wakeup = None
+
+    def _intent_for(self, op, arg, language):
+        if op == "s":
+            return "movement.stop"
+        if op == "m" and arg in MOTION_CODES:
+            return f"movement.{MOTION_CODES[arg]}"
+        if op == "v" and arg in SPEED_CODES:
+            return f"speed.{SPEED_CODES[arg]}"
+        if op == "t" and isinstance(arg, str) and self.resolve_text:
+            return self.resolve_text(arg, language or "en")
+        return None
+
+    async def handle_frame(self, frame, send):
+        """
+        Handle one client frame
+
+        Args:
+            frame (str): Raw frame text
+            send (coroutine function): Sends a frame back to the client
+        """
+        received_ns = time.perf_counter_ns()
+        try:
+            message = json.loads(frame)
+            seq, op = int(message[0]), message[1]
+            arg = message[2] if len(message) > 2 else None
+            language = message[3] if len(message) > 3 else None
+        except (ValueError, TypeError, IndexError, KeyError):
+            await send(encode_frame(0, "e", "bad frame"))
+            return
+
+        if op == "p":
+            await send(encode_frame(seq, "p"))
+            return
+        if seq <= self.last_seq:
+            # Duplicate or replayed frame
+            await send(encode_frame(seq, "x"))
+            return
+        self.last_seq = seq
+        self.state.received += 1
+
+        intent = self._intent_for(op, arg, language)
+        if intent is None:
+            await send(encode_frame(seq, "e", "unknown command"))
+            return
+
+        if intent == "movement.stop":
+            # Stop fast path: cancel pending motion and apply right away
+            superseded = self._pending_motion
+            self._pending_motion = None
+            await self._apply_safely(seq, intent, received_ns, send)
+            if superseded:
+                self._count_coalesced()
+                await send(encode_frame(superseded[0], "x"))
+            return
+
+        slot = "_pending_motion" if intent.startswith("movement.") else "_pending_speed" if intent.startswith("speed.") else None
+        if slot is None:
+            # Cart, checkout and help are UI actions; acknowledge them directly
+            await self._apply_safely(seq, intent, received_ns, send)
+            return
+
+        superseded = getattr(self, slot)
+        setattr(self, slot, (seq, intent, received_ns))
+        if superseded:
+            self._count_coalesced()
+            await send(encode_frame(superseded[0], "x"))
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _count_coalesced(self):
+        self.state.coalesced += 1
+
+    async def _apply(self, seq, intent, received_ns, send):
+        state = self.state
+        action, _, detail = intent.partition(".")
+        if intent == "movement.stop":
+            state.last_stop_ns = max(state.last_stop_ns, received_ns)
+            state.direction = "stop"
+        elif received_ns <= state.last_stop_ns:
+            # A stop arrived, on this or another connection, after this command was queued
+            self._count_coalesced()
+            await send(encode_frame(seq, "x"))
+            return
+        elif action == "movement":
+            state.direction = detail
+        elif action == "speed":
+            state.speed = min(5, state.speed + 1) if detail == "increase" else max(1, state.speed - 1)
+
+        if self.on_command:
+            await self.on_command(self.trolley_id, intent)
+        latency_us = (time.perf_counter_ns() - received_ns) // 1000
+        state.histogram.record(latency_us)
+        if intent == "movement.stop":
+            state.stop_histogram.record(latency_us)
+        state.applied += 1
+        await send(encode_frame(seq, "a", action, detail, latency_us))
+
+    async def _apply_safely(self, seq, intent, received_ns, send):
+        # A failing hardware hook or socket must not kill the dispatcher silently
+        try:
+            await self._apply(seq, intent, received_ns, send)
+        except Exception as e:
+            self.state.failed += 1
+            print(f"Trolley {self.trolley_id} command {intent} (seq {seq}) failed: {e!r}")
+            try:
+                await send(encode_frame(seq, "e", "command failed"))
+            except Exception:
+                pass
+
+    async def _dispatch(self, send):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            for slot in ("_pending_motion", "_pending_speed"):
+                pending = getattr(self, slot)
+                if pending:
+                    setattr(self, slot, None)
+                    await self._apply_safely(*pending, send)
+
+    async def serve(self, receive, send):
+        """
+        Run the control loop for one connection
+
+        Args:
+            receive (coroutine function): Returns the next frame text
+            send (coroutine function): Sends a frame to the client
+        """
+        self._wakeup = asyncio.Event()
+        self.state.connections += 1
+        dispatcher = asyncio.create_task(self._dispatch(send))
+        try:
+            while True:
+                await self.handle_frame(await receive(), send)
+        finally:
+            dispatcher.cancel()
+            self.state.connections -= 1
+            self._pending_motion = self._pending_speed = None
+
+
+class TrolleyControlHub:
+    def __init__(self, resolve_text=None, on_command=None):
+        """
+        Hands out a fresh controller per connection; per-trolley state
+        outlives reconnects, so speed is kept and histograms keep accumulating
+        """
+        self.resolve_text = resolve_text
+        self.on_command = on_command
+        self.trolleys = {}  # trolley_id -> TrolleyState
+
+    def controller(self, trolley_id):
+        """A new controller for one connection to the trolley"""
+        state = self.trolleys.get(trolley_id)
+        if state is None:
+            state = self.trolleys[trolley_id] = TrolleyState()
+        return TrolleyController(trolley_id, self.resolve_text, self.on_command, state)
+
+    def _stats(self, trolley_id, state):
+        return {
+            "trolley_id": trolley_id,
+            "direction": state.direction,
+            "speed": state.speed,
+            "connections": state.connections,
+            "received": state.received,
+            "applied": state.applied,
+            "coalesced": state.coalesced,
+            "failed": state.failed,
+            "latency": state.histogram.summary(),
+            "stop_latency": state.stop_histogram.summary()
+        }
+
+    def stats(self, trolley_id=None):
+        if trolley_id is not None:
+            state = self.trolleys.get(trolley_id)
+            return self._stats(trolley_id, state) if state else None
+        return {tid: self._stats(tid, state) for tid, state in self.trolleys.items()}
@@ -13,6 +13,10 @@ import threading
 import queue
 import requests
 import json
+import time
+
+from catalog import get_catalog
+from tracing import span, traced
 
 # Try to import libraries, with fallbacks
 try:
@@ -51,69 +55,16 @@ class VoiceProcessor:
         self.ollama_model = ollama_model
         self.ollama_url = "http://localhost:11434/api/generate"
         self.sample_rate = 16000  # Add sample rate for audio recording
-        
-        # Built-in knowledge base for the smart trolley
-        self.store_layout = {
-            "entrance": "Aisle 1",
-            "bakery": "Aisle 1",
-            "fresh produce": "Aisle 1",
-            "dairy": "Aisle 2",
-            "eggs": "Aisle 2",
-            "cheese": "Aisle 2",
-            "meat": "Aisle 3",
-            "poultry": "Aisle 3",
-            "seafood": "Aisle 3",
-            "canned goods": "Aisle 4",
-            "pasta": "Aisle 4",
-            "rice": "Aisle 4",
-            "beverages": "Aisle 5",
-            "snacks": "Aisle 5",
-            "frozen foods": "Aisle 6",
-            "personal care": "Aisle 7",
-            "cleaning supplies": "Aisle 7",
-            "checkout": "Aisle 8"
-        }
-        
-        self.products = {
-            "milk": {"price": "$3.99", "brand": "Happy Cow Dairy", "location": "Aisle 2, Shelf B"},
-            "bread": {"price": "$2.49", "brand": "Golden Grain", "location": "Aisle 1, Shelf A"},
-            "apples": {"price": "$1.99/lb", "organic": "available", "location": "Aisle 1, Shelf C"},
-            "eggs": {"price": "$2.99", "brand": "Farm Fresh", "location": "Aisle 2, Shelf A"},
-            "cheese": {"price": "$4.99", "brand": "Alpine Cheese", "location": "Aisle 2, Shelf C"},
-            "chicken": {"price": "$5.99/lb", "type": "boneless breast", "location": "Aisle 3, Shelf B"},
-            "pasta": {"price": "$1.49", "brand": "Italiano", "location": "Aisle 4, Shelf A"},
-            "cereal": {"price": "$3.49", "brand": "Healthy Start", "location": "Aisle 4, Shelf B"},
-            "soda": {"price": "$1.29", "brand": "Fizz Cola", "location": "Aisle 5, Shelf A"},
-            "chips": {"price": "$2.99", "brand": "Crunchy Snacks", "location": "Aisle 5, Shelf C"},
-            "ice cream": {"price": "$4.49", "brand": "Creamy Delight", "location": "Aisle 6, Shelf A"},
-            "shampoo": {"price": "$5.99", "brand": "Silky Hair", "location": "Aisle 7, Shelf B"},
-            "toothpaste": {"price": "$2.49", "brand": "Bright Smile", "location": "Aisle 7, Shelf A"},
-            "organic bananas": {"price": "$0.69/lb", "location": "Aisle 1, Shelf C"},
-            "whole wheat bread": {"price": "$2.49", "brand": "Golden Grain", "location": "Aisle 1, Shelf A"},
-            "farm fresh eggs": {"price": "$3.99", "count": "12", "location": "Aisle 2, Shelf A"},
-            "almond milk": {"price": "$3.79", "size": "1 gallon", "location": "Aisle 2, Shelf B"},
-            "greek yogurt": {"price": "$5.99", "size": "32 oz", "location": "Aisle 2, Shelf C"},
-            "organic spinach": {"price": "$3.49", "size": "16 oz", "location": "Aisle 1, Shelf B"},
-            "grass-fed ground beef": {"price": "$8.99/lb", "location": "Aisle 3, Shelf A"},
-            "atlantic salmon fillet": {"price": "$12.99/lb", "location": "Aisle 3, Shelf C"},
-            "organic brown rice": {"price": "$3.99", "size": "2 lbs", "location": "Aisle 4, Shelf B"},
-            "extra virgin olive oil": {"price": "$9.99", "size": "16 oz", "location": "Aisle 4, Shelf C"},
-            "organic coffee beans": {"price": "$14.99", "size": "12 oz", "location": "Aisle 1, Shelf D"},
-            "dark chocolate": {"price": "$2.99", "percentage": "85%", "size": "3.5 oz", "location": "Aisle 5, Shelf B"},
-            "organic quinoa": {"price": "$4.99", "size": "12 oz", "location": "Aisle 4, Shelf A"},
-            "himalayan pink salt": {"price": "$5.99", "size": "26 oz", "location": "Aisle 7, Shelf C"},
-            "coconut water": {"price": "$14.99", "size": "11.2 oz", "pack": "12 pack", "location": "Aisle 5, Shelf A"},
-            "organic green tea": {"price": "$4.49", "count": "20", "location": "Aisle 1, Shelf E"},
-            "protein powder": {"price": "$29.99", "flavor": "Vanilla", "size": "2 lbs", "location": "Aisle 6, Shelf B"},
-            "natural peanut butter": {"price": "$4.99", "size": "16 oz", "location": "Aisle 4, Shelf D"},
-            "organic tomato sauce": {"price": "$2.99", "size": "24 oz", "location": "Aisle 4, Shelf E"},
-            "gluten-free pasta": {"price": "$2.49", "size": "12 oz", "location": "Aisle 4, Shelf F"}
-        }
+        self.health = None  # Optional HealthMonitor; its "ollama" breaker replaces the startup check
+        self.router = None  # Optional LLMRouter that races the available backends
+        self.load_times = {}  # model -> seconds taken to load
         
         # Initialize Whisper
         if WHISPER_AVAILABLE:
             try:
+                start = time.perf_counter()
                 self.whisper_model = whisper.load_model(whisper_model)
+                self.load_times[f"whisper-{whisper_model}"] = time.perf_counter() - start
                 print(f"Whisper {whisper_model} model loaded successfully")
             except Exception as e:
                 print(f"Failed to load Whisper model: {e}")
@@ -125,12 +76,14 @@ class VoiceProcessor:
         self.llama_model = None
         if LLAMA_LOCAL_AVAILABLE and llama_model_path and os.path.exists(llama_model_path):
             try:
+                start = time.perf_counter()
                 self.llama_model = Llama(
                     model_path=llama_model_path,
                     n_ctx=2048,
                     n_threads=8,
                     n_gpu_layers=0  # Set to >0 if you have GPU acceleration
                 )
+                self.load_times["llama-local"] = time.perf_counter() - start
                 print("Local LLaMA model loaded successfully")
             except Exception as e:
                 print(f"Failed to load local LLaMA model: {e}")
@@ -144,6 +97,22 @@ class VoiceProcessor:
         else:
             print("Ollama API not available, using fallback responses")
             
+    # Built-in knowledge base for the smart trolley: the live catalog snapshot,
+    # shared by every instance and replaced on catalog reloads
+    @property
+    def store_layout(self):
+        return get_catalog().sections
+
+    @property
+    def products(self):
+        return get_catalog().product_info()
+
+    def _ollama_usable(self):
+        # With a health monitor, skip Ollama for free while its breaker is open
+        if self.health is not None and self.health.breaker("ollama") is not None:
+            return self.health.available("ollama")
+        return self.ollama_available
+
     def _check_ollama_available(self):
         """Check if Ollama API is available"""
         try:
@@ -152,6 +121,7 @@ class VoiceProcessor:
         except:
             return False
     
+    @traced("voice.record")
     def record_audio(self, duration=5):
         """
         Record audio from microphone
@@ -178,6 +148,7 @@ class VoiceProcessor:
             print(f"Error recording audio: {e}")
             return None
     
+    @traced("voice.save_wav")
     def save_audio_to_temp_file(self, audio_data):
         """
         Save audio data to a temporary WAV file
@@ -209,6 +180,7 @@ class VoiceProcessor:
             print(f"Error saving audio to file: {e}")
             return None
     
+    @traced("voice.whisper")
     def speech_to_text(self, audio_file):
         """
         Convert speech to text using Whisper
@@ -230,12 +202,14 @@ class VoiceProcessor:
             print(f"Error in speech-to-text: {e}")
             return "Error in transcription"
     
-    def generate_response_with_ollama(self, prompt):
+    def generate_response_with_ollama(self, prompt, cancel=None):
         """
         Generate response using Ollama API
         
         Args:
             prompt (str): Input prompt
+            cancel (threading.Event): If given, stream the reply and stop (closing the
+                connection, which stops generation) as soon as the event is set
             
         Returns:
             str: Generated response
@@ -244,9 +218,25 @@ class VoiceProcessor:
             payload = {
                 "model": self.ollama_model,
                 "prompt": prompt,
-                "stream": False
+                "stream": cancel is not None
             }
             
+            if cancel is not None:
+                with requests.post(self.ollama_url, json=payload, timeout=30, stream=True) as response:
+                    if response.status_code != 200:
+                        print(f"Ollama API error: {response.status_code}")
+                        return None
+                    parts = []
+                    for line in response.iter_lines():
+                        if cancel.is_set():
+                            return None
+                        if line:
+                            chunk = json.loads(line)
+                            parts.append(chunk.get("response", ""))
+                            if chunk.get("done"):
+                                break
+                    return "".join(parts).strip()
+
             response = requests.post(self.ollama_url, json=payload, timeout=30)
             if response.status_code == 200:
                 data = response.json()
@@ -292,9 +282,10 @@ class VoiceProcessor:
             print(f"Error in local LLaMA text generation: {e}")
             return None
 
+    @traced("llm.generate")
     def generate_response(self, prompt):
         """
-        Generate response using the best available method (Ollama > Local LLaMA > Fallback)
+        Generate response using the best available method (router, or Ollama > Local LLaMA > Fallback)
         
         Args:
             prompt (str): Input prompt
@@ -302,17 +293,29 @@ class VoiceProcessor:
         Returns:
             str: Generated response
         """
-        # Try Ollama first
-        if self.ollama_available:
-            response = self.generate_response_with_ollama(prompt)
-            if response and "Error" not in response:
-                return response
-        
-        # Try local LLaMA
-        if self.llama_model:
-            response = self.generate_response_with_local_llama(prompt)
+        if self.router is not None:
+            # Race the healthy backends, fastest first, hedging slow ones
+            response = self.router.generate(prompt)
             if response:
                 return response
+        else:
+            # Try Ollama first
+            if self._ollama_usable():
+                start = time.perf_counter()
+                with span("llm.backend", backend="ollama"):
+                    response = self.generate_response_with_ollama(prompt)
+                ok = bool(response) and "Error" not in response
+                if self.health is not None:
+                    self.health.record("ollama", ok, time.perf_counter() - start, None if ok else "no response")
+                if ok:
+                    return response
+            
+            # Try local LLaMA
+            if self.llama_model:
+                with span("llm.backend", backend="llama_local"):
+                    response = self.generate_response_with_local_llama(prompt)
+                if response:
+                    return response
         
         # Fallback response for shopping assistant with built-in knowledge
         # Extract the user query from the prompt
@@ -383,6 +386,7 @@ class VoiceProcessor:
         import random
         return random.choice(responses)
     
+    @traced("voice.tts")
     def text_to_speech(self, text, language="en"):
         """
         Convert text to speech using Indic-TTS
@@ -404,6 +408,7 @@ class VoiceProcessor:
         except Exception as e:
             print(f"Error in text-to-speech: {e}")
     
+    @traced("voice.pipeline")
     def process_voice_command(self, duration=5):
         """
         Complete voice processing pipeline: